@@ -15,6 +15,7 @@ setup(
         "console_scripts": [
             "platform-metrics-pipeline=prmdata.pipeline.platform_metrics_calculator.main:main",
             "ods-portal-pipeline=prmdata.pipeline.ods_downloader.main:main",
+            "spine-compaction-pipeline=prmdata.pipeline.spine_compaction.main:main",
         ]
     },
 )
@@ -0,0 +1,25 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from dateutil.tz import tzutc
+
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
+
+
+@dataclass
+class DataQualityPresentation:
+    generated_on: datetime
+    year: int
+    month: int
+    conversations_missing_start: int
+    duplicate_messages: int
+    negative_sla_durations: int
+    unexpected_asids: int
+
+
+def construct_data_quality_report(
+    counters: DataQualityCounters, year: int, month: int
+) -> DataQualityPresentation:
+    return DataQualityPresentation(
+        generated_on=datetime.now(tzutc()), year=year, month=month, **asdict(counters)
+    )
@@ -0,0 +1,71 @@
+from collections import Counter
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+import pyarrow as pa
+from pyarrow import Table
+
+from prmdata.domain.gp2gp.sla import SlaBand
+from prmdata.domain.gp2gp.transfer import Transfer, TransferStatus
+from prmdata.utils.io.parquet import ParquetWriterProfile
+
+ASID_COUNTS_TABLE_SCHEMA = pa.schema(
+    [
+        ("requesting_practice_asid", pa.string()),
+        ("status", pa.string()),
+        ("sla_band", pa.string()),
+        ("transfer_count", pa.int64()),
+    ]
+)
+
+ASID_COUNTS_WRITER_PROFILE = ParquetWriterProfile(
+    sort_keys=(
+        ("requesting_practice_asid", "ascending"),
+        ("status", "ascending"),
+        ("sla_band", "ascending"),
+    ),
+    dictionary_columns=["status", "sla_band"],
+)
+
+
+class AsidTransferCount(NamedTuple):
+    requesting_practice_asid: str
+    status: TransferStatus
+    sla_band: Optional[SlaBand]
+    transfer_count: int
+
+
+def count_transfers_by_asid(transfers: Iterable[Transfer]) -> List[AsidTransferCount]:
+    counts = Counter(
+        (transfer.requesting_practice_asid, transfer.status, transfer.sla_band)
+        for transfer in transfers
+    )
+    return [
+        AsidTransferCount(asid, status, sla_band, count)
+        for (asid, status, sla_band), count in counts.items()
+    ]
+
+
+def _band_name(sla_band: Optional[SlaBand]) -> Optional[str]:
+    return sla_band.name if sla_band is not None else None
+
+
+def _band_from_name(name: Optional[str]) -> Optional[SlaBand]:
+    return SlaBand[name] if name is not None else None
+
+
+def convert_asid_counts_to_table(asid_counts: List[AsidTransferCount]) -> Table:
+    return pa.table(
+        {
+            "requesting_practice_asid": [c.requesting_practice_asid for c in asid_counts],
+            "status": [c.status.value for c in asid_counts],
+            "sla_band": [_band_name(c.sla_band) for c in asid_counts],
+            "transfer_count": [c.transfer_count for c in asid_counts],
+        },
+        schema=ASID_COUNTS_TABLE_SCHEMA,
+    )
+
+
+def convert_table_to_asid_counts(table: Table) -> Iterator[AsidTransferCount]:
+    columns = [table.column(name).to_pylist() for name in ASID_COUNTS_TABLE_SCHEMA.names]
+    for asid, status, sla_band, count in zip(*columns):
+        yield AsidTransferCount(asid, TransferStatus(status), _band_from_name(sla_band), count)
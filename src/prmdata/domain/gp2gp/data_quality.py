@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class DataQualityCounters:
+    conversations_missing_start: int = 0
+    duplicate_messages: int = 0
+    negative_sla_durations: int = 0
+    unexpected_asids: int = 0
@@ -0,0 +1,80 @@
+from datetime import datetime
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from dateutil.relativedelta import relativedelta
+from pyarrow import Table
+from pyarrow.fs import FileSystem
+
+from prmdata.domain.gp2gp.transfer import (
+    TRANSFER_WRITER_PROFILE,
+    TransferStatus,
+    select_transfer_columns,
+)
+from prmdata.utils.date.range import DateTimeRange
+from prmdata.utils.io.parquet import (
+    PART_FILE_NAME,
+    ParquetWriterProfile,
+    read_partitioned_table,
+    replace_directory,
+)
+
+PARTITION_SCHEMA = pa.schema([("year", pa.int16()), ("month", pa.int8()), ("status", pa.string())])
+
+
+def _split_by_status(table: Table) -> Dict[str, Table]:
+    return {
+        f"status={status}/{PART_FILE_NAME}": table.filter(pc.equal(table["status"], status))
+        for status in pc.unique(table["status"]).to_pylist()
+    }
+
+
+def write_transfer_dataset(
+    table: Table,
+    filesystem: FileSystem,
+    root_path: str,
+    year: int,
+    month: int,
+    partition_by_status: bool = False,
+    profile: ParquetWriterProfile = TRANSFER_WRITER_PROFILE,
+):
+    files = _split_by_status(table) if partition_by_status else {PART_FILE_NAME: table}
+    replace_directory(filesystem, f"{root_path}/year={year}/month={month}", files, profile)
+
+
+def _months_in(time_range: DateTimeRange) -> Iterator[Tuple[int, int]]:
+    month = datetime(
+        time_range.start.year, time_range.start.month, 1, tzinfo=time_range.start.tzinfo
+    )
+    while month < time_range.end:
+        yield month.year, month.month
+        month += relativedelta(months=1)
+
+
+def _partition_filter(time_range: DateTimeRange, statuses: Optional[List[TransferStatus]]):
+    expression = reduce(
+        or_,
+        [
+            (ds.field("year") == year) & (ds.field("month") == month)
+            for year, month in _months_in(time_range)
+        ],
+    )
+    if statuses is None:
+        return expression
+    return expression & ds.field("status").isin([status.value for status in statuses])
+
+
+def read_transfer_dataset(
+    filesystem: FileSystem,
+    root_path: str,
+    time_range: DateTimeRange,
+    statuses: Optional[List[TransferStatus]] = None,
+) -> Table:
+    table = read_partitioned_table(
+        filesystem, root_path, PARTITION_SCHEMA, _partition_filter(time_range, statuses)
+    )
+    return select_transfer_columns(table)
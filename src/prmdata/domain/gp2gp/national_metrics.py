@@ -1,6 +1,8 @@
+from collections import Counter
 from dataclasses import dataclass
-from typing import Iterable, List, Set
-from prmdata.domain.gp2gp.sla import SlaBand, assign_to_sla_band
+from typing import Iterable, List
+from prmdata.domain.gp2gp.asid_counts import AsidTransferCount, count_transfers_by_asid
+from prmdata.domain.gp2gp.sla import SlaBand, DEFAULT_SLA_BANDS
 from prmdata.domain.gp2gp.transfer import Transfer, TransferStatus
 
 
@@ -24,18 +26,23 @@ class NationalMetrics:
         return self.initiated_transfer_count - integrated_within_sla
 
 
-def calculate_national_metrics(transfers: List[Transfer]) -> NationalMetrics:
-    integrated_transfers = _filter_for_integrated_transfers(transfers)
-    sla_band_counts = _calculate_sla_band_counts(integrated_transfers)
+def calculate_national_metrics_from_asid_counts(
+    asid_counts: Iterable[AsidTransferCount],
+) -> NationalMetrics:
+    status_counts: Counter = Counter()
+    sla_band_counts = {threshold.band: 0 for threshold in DEFAULT_SLA_BANDS}
+    for asid_count in asid_counts:
+        status_counts[asid_count.status] += asid_count.transfer_count
+        if asid_count.status == TransferStatus.INTEGRATED:
+            sla_band_counts[asid_count.sla_band] += asid_count.transfer_count
 
     return NationalMetrics(
-        initiated_transfer_count=len(transfers),
-        pending_transfer_count=_count_transfers_with_statuses(
-            transfers, {TransferStatus.PENDING, TransferStatus.PENDING_WITH_ERROR}
-        ),
-        failed_transfer_count=_count_transfers_with_statuses(transfers, {TransferStatus.FAILED}),
+        initiated_transfer_count=sum(status_counts.values()),
+        pending_transfer_count=status_counts[TransferStatus.PENDING]
+        + status_counts[TransferStatus.PENDING_WITH_ERROR],
+        failed_transfer_count=status_counts[TransferStatus.FAILED],
         integrated=IntegratedMetrics(
-            transfer_count=len(integrated_transfers),
+            transfer_count=status_counts[TransferStatus.INTEGRATED],
             within_3_days=sla_band_counts[SlaBand.WITHIN_3_DAYS],
             within_8_days=sla_band_counts[SlaBand.WITHIN_8_DAYS],
             beyond_8_days=sla_band_counts[SlaBand.BEYOND_8_DAYS],
@@ -43,19 +50,5 @@ def calculate_national_metrics(transfers: List[Transfer]) -> NationalMetrics:
     )
 
 
-def _count_transfers_with_statuses(
-    transfers: Iterable[Transfer], statuses: Set[TransferStatus]
-) -> int:
-    return len([t for t in transfers if t.status in statuses])
-
-
-def _filter_for_integrated_transfers(transfers: Iterable[Transfer]) -> List[Transfer]:
-    return [t for t in transfers if t.status == TransferStatus.INTEGRATED]
-
-
-def _calculate_sla_band_counts(integrated_transfers: List[Transfer]):
-    sla_band_counts = {SlaBand.WITHIN_3_DAYS: 0, SlaBand.WITHIN_8_DAYS: 0, SlaBand.BEYOND_8_DAYS: 0}
-    for transfer in integrated_transfers:
-        sla_band = assign_to_sla_band(transfer.sla_duration)
-        sla_band_counts[sla_band] += 1
-    return sla_band_counts
+def calculate_national_metrics(transfers: List[Transfer]) -> NationalMetrics:
+    return calculate_national_metrics_from_asid_counts(count_transfers_by_asid(transfers))
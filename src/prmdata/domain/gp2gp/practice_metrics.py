@@ -1,9 +1,16 @@
-from warnings import warn
-from typing import NamedTuple, Iterable, Iterator
+from datetime import datetime
+from typing import NamedTuple, Iterable, Iterator, Optional, Tuple
 
+from prmdata.domain.ods_portal.asid_mapping import (
+    LATEST_TIME,
+    TemporalAsidMapping,
+    construct_temporal_asid_mapping,
+)
 from prmdata.domain.ods_portal.models import PracticeDetails
-from prmdata.domain.gp2gp.transfer import Transfer
-from prmdata.domain.gp2gp.sla import assign_to_sla_band, SlaBand
+from prmdata.domain.gp2gp.asid_counts import AsidTransferCount
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
+from prmdata.domain.gp2gp.transfer import Transfer, TransferStatus
+from prmdata.domain.gp2gp.sla import SlaBand, DEFAULT_SLA_BANDS
 
 
 class IntegratedPracticeMetrics(NamedTuple):
@@ -34,17 +41,17 @@ def _derive_practice_sla_metrics(practice, sla_metrics):
     )
 
 
-def calculate_sla_by_practice(
-    practice_list: Iterable[PracticeDetails], transfers: Iterable[Transfer]
+def _calculate_sla_by_practice(
+    practice_list: Iterable[PracticeDetails],
+    attributed_counts: Iterable[Tuple[Optional[str], str, SlaBand, int]],
+    quality: Optional[DataQualityCounters],
 ) -> Iterator[PracticeMetrics]:
-    default_sla = {SlaBand.WITHIN_3_DAYS: 0, SlaBand.WITHIN_8_DAYS: 0, SlaBand.BEYOND_8_DAYS: 0}
+    default_sla = {threshold.band: 0 for threshold in DEFAULT_SLA_BANDS}
     practice_counts = {practice.ods_code: default_sla.copy() for practice in practice_list}
 
-    asid_to_ods_mapping = {
-        asid: practice.ods_code for practice in practice_list for asid in practice.asids
-    }
-
-    _process_asid(asid_to_ods_mapping, practice_counts, transfers)
+    unexpected_asids = _process_asid(practice_counts, attributed_counts)
+    if quality is not None:
+        quality.unexpected_asids += len(unexpected_asids)
 
     return (
         _derive_practice_sla_metrics(practice, practice_counts[practice.ods_code])
@@ -52,16 +59,57 @@ def calculate_sla_by_practice(
     )
 
 
-def _process_asid(asid_to_ods_mapping, practice_counts, transfers):
-    unexpected_asids = set()
-    for transfer in transfers:
-        asid = transfer.requesting_practice_asid
+def _mapping_or_snapshot(
+    practice_list: Iterable[PracticeDetails], asid_mapping: Optional[TemporalAsidMapping]
+) -> TemporalAsidMapping:
+    if asid_mapping is not None:
+        return asid_mapping
+    return construct_temporal_asid_mapping(practice_list)
+
 
-        if asid in asid_to_ods_mapping:
-            ods_code = asid_to_ods_mapping[asid]
-            sla_band = assign_to_sla_band(transfer.sla_duration)
-            practice_counts[ods_code][sla_band] += 1
+def calculate_sla_by_practice(
+    practice_list: Iterable[PracticeDetails],
+    transfers: Iterable[Transfer],
+    asid_mapping: Optional[TemporalAsidMapping] = None,
+    quality: Optional[DataQualityCounters] = None,
+) -> Iterator[PracticeMetrics]:
+    transfers = list(transfers)
+    ods_codes = _mapping_or_snapshot(practice_list, asid_mapping).lookup_many(
+        [t.requesting_practice_asid for t in transfers], [t.date_requested for t in transfers]
+    )
+    attributed_counts = (
+        (ods_code, t.requesting_practice_asid, t.sla_band, 1)
+        for ods_code, t in zip(ods_codes, transfers)
+    )
+    return _calculate_sla_by_practice(practice_list, attributed_counts, quality)
+
+
+def calculate_sla_by_practice_from_asid_counts(
+    practice_list: Iterable[PracticeDetails],
+    asid_counts: Iterable[AsidTransferCount],
+    asid_mapping: Optional[TemporalAsidMapping] = None,
+    attributed_at: datetime = LATEST_TIME,
+    quality: Optional[DataQualityCounters] = None,
+) -> Iterator[PracticeMetrics]:
+    mapping = _mapping_or_snapshot(practice_list, asid_mapping)
+    attributed_counts = (
+        (
+            mapping.lookup(c.requesting_practice_asid, attributed_at),
+            c.requesting_practice_asid,
+            c.sla_band,
+            c.transfer_count,
+        )
+        for c in asid_counts
+        if c.status == TransferStatus.INTEGRATED and c.sla_band is not None
+    )
+    return _calculate_sla_by_practice(practice_list, attributed_counts, quality)
+
+
+def _process_asid(practice_counts, attributed_counts):
+    unexpected_asids = set()
+    for ods_code, asid, sla_band, count in attributed_counts:
+        if ods_code in practice_counts:
+            practice_counts[ods_code][sla_band] += count
         else:
             unexpected_asids.add(asid)
-    if len(unexpected_asids) > 0:
-        warn(f"Unexpected ASID count: {len(unexpected_asids)}", RuntimeWarning)
+    return unexpected_asids
@@ -1,5 +1,7 @@
 from datetime import timedelta
 from enum import Enum, auto
+from math import ceil
+from typing import NamedTuple, Optional, List
 
 THREE_DAYS_IN_SECONDS = 259200
 EIGHT_DAYS_IN_SECONDS = 691200
@@ -11,11 +13,28 @@ class SlaBand(Enum):
     BEYOND_8_DAYS = auto()
 
 
-def assign_to_sla_band(sla_duration: timedelta) -> SlaBand:
-    sla_duration_in_seconds = sla_duration.total_seconds()
-    if sla_duration_in_seconds <= THREE_DAYS_IN_SECONDS:
-        return SlaBand.WITHIN_3_DAYS
-    elif sla_duration_in_seconds <= EIGHT_DAYS_IN_SECONDS:
-        return SlaBand.WITHIN_8_DAYS
-    else:
-        return SlaBand.BEYOND_8_DAYS
+class SlaBandThreshold(NamedTuple):
+    band: SlaBand
+    max_duration_in_seconds: Optional[int]
+
+
+DEFAULT_SLA_BANDS = [
+    SlaBandThreshold(SlaBand.WITHIN_3_DAYS, THREE_DAYS_IN_SECONDS),
+    SlaBandThreshold(SlaBand.WITHIN_8_DAYS, EIGHT_DAYS_IN_SECONDS),
+    SlaBandThreshold(SlaBand.BEYOND_8_DAYS, None),
+]
+
+
+def to_whole_seconds(sla_duration: timedelta) -> int:
+    return ceil(sla_duration.total_seconds())
+
+
+def assign_to_sla_band(
+    sla_duration: timedelta, sla_bands: List[SlaBandThreshold] = DEFAULT_SLA_BANDS
+) -> SlaBand:
+    sla_duration_in_seconds = to_whole_seconds(sla_duration)
+    for threshold in sla_bands:
+        max_duration = threshold.max_duration_in_seconds
+        if max_duration is None or sla_duration_in_seconds <= max_duration:
+            return threshold.band
+    raise ValueError(f"No SLA band for duration of {sla_duration_in_seconds} seconds")
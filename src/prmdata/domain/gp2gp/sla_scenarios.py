@@ -0,0 +1,162 @@
+import re
+from dataclasses import replace
+from functools import reduce
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from prmdata.domain.gp2gp.national_metrics import (
+    IntegratedMetrics,
+    NationalMetrics,
+    calculate_national_metrics,
+)
+from prmdata.domain.gp2gp.practice_metrics import IntegratedPracticeMetrics, PracticeMetrics
+from prmdata.domain.gp2gp.sla import SlaBand, SlaBandThreshold, to_whole_seconds
+from prmdata.domain.gp2gp.transfer import Transfer, filter_for_successful_transfers
+from prmdata.domain.ods_portal.asid_mapping import (
+    TemporalAsidMapping,
+    construct_temporal_asid_mapping,
+)
+from prmdata.domain.ods_portal.models import PracticeDetails
+
+SCENARIO_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+BAND_COUNT = 3
+
+
+class SlaScenario(NamedTuple):
+    name: str
+    sla_bands: List[SlaBandThreshold]
+
+
+class SlaScenarioMetrics(NamedTuple):
+    scenario: SlaScenario
+    practice_metrics: List[PracticeMetrics]
+    national_metrics: NationalMetrics
+
+
+def _construct_sla_scenario(data: dict) -> SlaScenario:
+    name = data["name"]
+    within_3_days, within_8_days = data["thresholds_in_seconds"]
+    if not SCENARIO_NAME_PATTERN.match(name):
+        raise ValueError(f"SLA scenario name must only contain letters, digits, - and _: {name}")
+    if not 0 <= within_3_days <= within_8_days:
+        raise ValueError(f"SLA scenario thresholds must be ascending: {name}")
+    return SlaScenario(
+        name=name,
+        sla_bands=[
+            SlaBandThreshold(SlaBand.WITHIN_3_DAYS, within_3_days),
+            SlaBandThreshold(SlaBand.WITHIN_8_DAYS, within_8_days),
+            SlaBandThreshold(SlaBand.BEYOND_8_DAYS, None),
+        ],
+    )
+
+
+def construct_sla_scenarios_from_dict(data: dict) -> List[SlaScenario]:
+    return [_construct_sla_scenario(scenario) for scenario in data["scenarios"]]
+
+
+def _band_indices(durations: pa.Array, scenario: SlaScenario) -> pa.Array:
+    exceeded_thresholds = [
+        pc.cast(pc.greater(durations, threshold.max_duration_in_seconds), pa.int64())
+        for threshold in scenario.sla_bands
+        if threshold.max_duration_in_seconds is not None
+    ]
+    return reduce(pc.add, exceeded_thresholds)
+
+
+def _group_keys(group_indices: pa.Array, band_indices: pa.Array, offset: int) -> pa.Array:
+    return pc.add(pc.multiply(pc.add(group_indices, offset), BAND_COUNT), band_indices)
+
+
+def _count_keys(keys: List[pa.Array]) -> Dict[int, int]:
+    counts = pc.value_counts(pa.chunked_array(keys, pa.int64()))
+    return dict(zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist()))
+
+
+def _band_counts(counts: Dict[int, int], group: int) -> List[int]:
+    return [counts.get(group * BAND_COUNT + band, 0) for band in range(BAND_COUNT)]
+
+
+def _practice_metrics(
+    practice_list: List[PracticeDetails], counts: Dict[int, int], offset: int
+) -> Iterator[PracticeMetrics]:
+    for practice_index, practice in enumerate(practice_list):
+        within_3_days, within_8_days, beyond_8_days = _band_counts(counts, offset + practice_index)
+        yield PracticeMetrics(
+            practice.ods_code,
+            practice.name,
+            integrated=IntegratedPracticeMetrics(
+                transfer_count=within_3_days + within_8_days + beyond_8_days,
+                within_3_days=within_3_days,
+                within_8_days=within_8_days,
+                beyond_8_days=beyond_8_days,
+            ),
+        )
+
+
+def _national_metrics(
+    national_metrics: NationalMetrics, counts: Dict[int, int], scenario_index: int
+) -> NationalMetrics:
+    within_3_days, within_8_days, beyond_8_days = _band_counts(counts, scenario_index)
+    return replace(
+        national_metrics,
+        integrated=IntegratedMetrics(
+            transfer_count=national_metrics.integrated.transfer_count,
+            within_3_days=within_3_days,
+            within_8_days=within_8_days,
+            beyond_8_days=beyond_8_days,
+        ),
+    )
+
+
+def calculate_sla_scenario_metrics(
+    transfers: List[Transfer],
+    practice_list: List[PracticeDetails],
+    scenarios: List[SlaScenario],
+    asid_mapping: Optional[TemporalAsidMapping] = None,
+) -> List[SlaScenarioMetrics]:
+    successful_transfers = list(filter_for_successful_transfers(transfers))
+    if asid_mapping is None:
+        asid_mapping = construct_temporal_asid_mapping(practice_list)
+    ods_to_practice_index = {
+        practice.ods_code: index for index, practice in enumerate(practice_list)
+    }
+    ods_codes = asid_mapping.lookup_many(
+        [t.requesting_practice_asid for t in successful_transfers],
+        [t.date_requested for t in successful_transfers],
+    )
+    durations = pa.array(
+        [to_whole_seconds(transfer.sla_duration) for transfer in successful_transfers], pa.int64()
+    )
+    practice_indices = pa.array(
+        [ods_to_practice_index.get(ods_code) for ods_code in ods_codes], pa.int64()
+    )
+    national_indices = pa.array([0] * len(successful_transfers), pa.int64())
+    band_indices = [_band_indices(durations, scenario) for scenario in scenarios]
+
+    practice_count = len(practice_list)
+    practice_counts = _count_keys(
+        [
+            _group_keys(practice_indices, bands, offset=index * practice_count)
+            for index, bands in enumerate(band_indices)
+        ]
+    )
+    national_counts = _count_keys(
+        [
+            _group_keys(national_indices, bands, offset=index)
+            for index, bands in enumerate(band_indices)
+        ]
+    )
+    national_metrics = calculate_national_metrics(transfers)
+
+    return [
+        SlaScenarioMetrics(
+            scenario=scenario,
+            practice_metrics=list(
+                _practice_metrics(practice_list, practice_counts, index * practice_count)
+            ),
+            national_metrics=_national_metrics(national_metrics, national_counts, index),
+        )
+        for index, scenario in enumerate(scenarios)
+    ]
@@ -1,15 +1,52 @@
-from warnings import warn
 from datetime import timedelta, datetime
 from typing import NamedTuple, Optional, List, Iterable, Iterator
 from enum import Enum
 
 import pyarrow as pa
 import pyarrow as Table
+from dateutil.tz import tzutc
 
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
+from prmdata.domain.gp2gp.sla import SlaBand, assign_to_sla_band
+from prmdata.domain.spine.message import Message
 from prmdata.domain.spine.parsed_conversation import ParsedConversation
+from prmdata.utils.io.parquet import ParquetWriterProfile
 
 ERROR_SUPPRESSED = 15
 
+TRANSFER_TABLE_SCHEMA = pa.schema(
+    [
+        ("conversation_id", pa.string()),
+        ("sla_duration", pa.uint64()),
+        ("sla_duration_microseconds", pa.uint64()),
+        ("requesting_practice_asid", pa.string()),
+        ("sending_practice_asid", pa.string()),
+        ("requesting_supplier", pa.string()),
+        ("sending_supplier", pa.string()),
+        ("sender_error_code", pa.int64()),
+        ("final_error_code", pa.int64()),
+        ("intermediate_error_codes", pa.list_(pa.int64())),
+        ("status", pa.string()),
+        ("date_requested", pa.timestamp("us")),
+        ("date_completed", pa.timestamp("us")),
+    ]
+)
+
+TRANSFER_DICTIONARY_COLUMNS = [
+    "requesting_practice_asid",
+    "sending_practice_asid",
+    "requesting_supplier",
+    "sending_supplier",
+    "status",
+]
+
+TRANSFER_WRITER_PROFILE = ParquetWriterProfile(
+    compression="snappy",
+    row_group_size=65536,
+    sort_keys=(("date_requested", "ascending"),),
+    dictionary_columns=TRANSFER_DICTIONARY_COLUMNS,
+)
+
 
 class TransferStatus(Enum):
     INTEGRATED = "INTEGRATED"
@@ -21,6 +58,7 @@ class TransferStatus(Enum):
 class Transfer(NamedTuple):
     conversation_id: str
     sla_duration: Optional[timedelta]
+    sla_band: Optional[SlaBand]
     requesting_practice_asid: str
     sending_practice_asid: str
     requesting_supplier: str
@@ -33,111 +71,80 @@ class Transfer(NamedTuple):
     date_completed: Optional[datetime]
 
 
-def _calculate_sla(conversation: ParsedConversation):
+def _calculate_sla(conversation: ParsedConversation, quality: Optional[DataQualityCounters]):
     if conversation.request_completed is None or conversation.request_completed_ack is None:
         return None
 
     sla_duration = conversation.request_completed_ack.time - conversation.request_completed.time
-    if sla_duration.total_seconds() < 0:
-        warn(f"Negative SLA duration for conversation: {conversation.id}", RuntimeWarning)
+    if quality is not None and sla_duration.total_seconds() < 0:
+        quality.negative_sla_durations += 1
 
     return max(timedelta(0), sla_duration)
 
 
-def _extract_requesting_practice_asid(conversation: ParsedConversation) -> str:
-    return conversation.request_started.from_party_asid
-
-
-def _extract_sending_practice_asid(conversation: ParsedConversation) -> str:
-    return conversation.request_started.to_party_asid
-
-
-def _extract_requesting_supplier(conversation: ParsedConversation) -> str:
-    return conversation.request_started.from_system
-
-
-def _extract_sending_supplier(conversation: ParsedConversation) -> str:
-    return conversation.request_started.to_system
-
-
-def _extract_sender_error(conversation: ParsedConversation) -> Optional[int]:
-    if conversation.request_started_ack:
-        return conversation.request_started_ack.error_code
-    return None
-
-
-def _extract_final_error_code(conversation: ParsedConversation) -> Optional[int]:
-    if conversation.request_completed_ack:
-        return conversation.request_completed_ack.error_code
-    return None
-
-
-def _extract_intermediate_error_code(conversation: ParsedConversation) -> List[int]:
-    return [
-        message.error_code
-        for message in conversation.intermediate_messages
-        if message.error_code is not None
-    ]
+def _assign_sla_band(sla_duration: Optional[timedelta]) -> Optional[SlaBand]:
+    if sla_duration is None:
+        return None
+    return assign_to_sla_band(sla_duration)
 
 
-def _extract_date_requested(conversation: ParsedConversation) -> datetime:
-    return conversation.request_started.time
+def _extract_error_code(message: Optional[Message]) -> Optional[int]:
+    if message is None:
+        return None
+    return message.error_code
 
 
-def _extract_date_completed(conversation: ParsedConversation) -> Optional[datetime]:
-    if conversation.request_completed_ack:
-        return conversation.request_completed_ack.time
-    return None
+def _extract_time(message: Optional[Message]) -> Optional[datetime]:
+    if message is None:
+        return None
+    return message.time
 
 
-def _assign_status(conversation: ParsedConversation) -> TransferStatus:
-    if _is_integrated(conversation):
+def _assign_status(
+    final_ack: Optional[Message], final_error_code: Optional[int], has_error: bool
+) -> TransferStatus:
+    if final_ack is None:
+        return TransferStatus.PENDING_WITH_ERROR if has_error else TransferStatus.PENDING
+    elif final_error_code is None or final_error_code == ERROR_SUPPRESSED:
         return TransferStatus.INTEGRATED
-    elif _has_final_ack_error(conversation):
+    elif final_error_code:
         return TransferStatus.FAILED
-    elif _has_intermediate_error_and_no_final_ack(conversation):
-        return TransferStatus.PENDING_WITH_ERROR
     else:
         return TransferStatus.PENDING
 
 
-def _is_integrated(conversation: ParsedConversation) -> bool:
-    final_ack = conversation.request_completed_ack
-    return final_ack and (final_ack.error_code is None or final_ack.error_code == ERROR_SUPPRESSED)
-
-
-def _has_final_ack_error(conversation: ParsedConversation) -> bool:
+def _derive_transfer(
+    conversation: ParsedConversation, quality: Optional[DataQualityCounters]
+) -> Transfer:
+    request_started = conversation.request_started
     final_ack = conversation.request_completed_ack
-    return final_ack and final_ack.error_code and final_ack.error_code != ERROR_SUPPRESSED
-
+    sender_error_code = _extract_error_code(conversation.request_started_ack)
+    final_error_code = _extract_error_code(final_ack)
+    intermediate_error_codes = conversation.intermediate_error_codes
+    has_error = sender_error_code is not None or len(intermediate_error_codes) > 0
+    sla_duration = _calculate_sla(conversation, quality)
 
-def _has_intermediate_error_and_no_final_ack(conversation: ParsedConversation) -> bool:
-    intermediate_errors = _extract_intermediate_error_code(conversation)
-    sender_error = _extract_sender_error(conversation)
-    has_intermediate_error = len(intermediate_errors) > 0 or sender_error is not None
-    lacking_final_ack = conversation.request_completed_ack is None
-    return lacking_final_ack and has_intermediate_error
-
-
-def _derive_transfer(conversation: ParsedConversation) -> Transfer:
     return Transfer(
         conversation_id=conversation.id,
-        sla_duration=_calculate_sla(conversation),
-        requesting_practice_asid=_extract_requesting_practice_asid(conversation),
-        sending_practice_asid=_extract_sending_practice_asid(conversation),
-        requesting_supplier=_extract_requesting_supplier(conversation),
-        sending_supplier=_extract_sending_supplier(conversation),
-        sender_error_code=_extract_sender_error(conversation),
-        final_error_code=_extract_final_error_code(conversation),
-        intermediate_error_codes=_extract_intermediate_error_code(conversation),
-        status=_assign_status(conversation),
-        date_requested=_extract_date_requested(conversation),
-        date_completed=_extract_date_completed(conversation),
+        sla_duration=sla_duration,
+        sla_band=_assign_sla_band(sla_duration),
+        requesting_practice_asid=request_started.from_party_asid,
+        sending_practice_asid=request_started.to_party_asid,
+        requesting_supplier=request_started.from_system,
+        sending_supplier=request_started.to_system,
+        sender_error_code=sender_error_code,
+        final_error_code=final_error_code,
+        intermediate_error_codes=intermediate_error_codes,
+        status=_assign_status(final_ack, final_error_code, has_error),
+        date_requested=request_started.time,
+        date_completed=_extract_time(final_ack),
     )
 
 
-def derive_transfers(conversations: Iterable[ParsedConversation]) -> Iterator[Transfer]:
-    return (_derive_transfer(conversation) for conversation in conversations)
+def derive_transfers(
+    conversations: Iterable[ParsedConversation], quality: Optional[DataQualityCounters] = None
+) -> Iterator[Transfer]:
+    return (_derive_transfer(conversation, quality) for conversation in conversations)
 
 
 def filter_for_successful_transfers(transfers: List[Transfer]) -> Iterator[Transfer]:
@@ -155,11 +162,20 @@ def _convert_to_seconds(duration: Optional[timedelta]) -> Optional[int]:
         return None
 
 
+def _convert_to_microseconds(duration: Optional[timedelta]) -> Optional[int]:
+    if duration is None:
+        return None
+    return duration // timedelta(microseconds=1)
+
+
 def convert_transfers_to_table(transfers: Iterable[Transfer]) -> Table:
     return pa.table(
         {
             "conversation_id": [t.conversation_id for t in transfers],
             "sla_duration": [_convert_to_seconds(t.sla_duration) for t in transfers],
+            "sla_duration_microseconds": [
+                _convert_to_microseconds(t.sla_duration) for t in transfers
+            ],
             "requesting_practice_asid": [t.requesting_practice_asid for t in transfers],
             "sending_practice_asid": [t.sending_practice_asid for t in transfers],
             "requesting_supplier": [t.requesting_supplier for t in transfers],
@@ -171,20 +187,63 @@ def convert_transfers_to_table(transfers: Iterable[Transfer]) -> Table:
             "date_requested": [t.date_requested for t in transfers],
             "date_completed": [t.date_completed for t in transfers],
         },
-        schema=pa.schema(
-            [
-                ("conversation_id", pa.string()),
-                ("sla_duration", pa.uint64()),
-                ("requesting_practice_asid", pa.string()),
-                ("sending_practice_asid", pa.string()),
-                ("requesting_supplier", pa.string()),
-                ("sending_supplier", pa.string()),
-                ("sender_error_code", pa.int64()),
-                ("final_error_code", pa.int64()),
-                ("intermediate_error_codes", pa.list_(pa.int64())),
-                ("status", pa.string()),
-                ("date_requested", pa.timestamp("us")),
-                ("date_completed", pa.timestamp("us")),
-            ]
-        ),
+        schema=TRANSFER_TABLE_SCHEMA,
+    )
+
+
+def _convert_from_stored_duration(row: dict) -> Optional[timedelta]:
+    microseconds = row.get("sla_duration_microseconds")
+    if microseconds is not None:
+        return timedelta(microseconds=microseconds)
+    seconds = row["sla_duration"]
+    if seconds is None:
+        return None
+    return timedelta(seconds=seconds)
+
+
+def _as_utc(time: datetime) -> datetime:
+    return time.replace(tzinfo=tzutc())
+
+
+def _as_optional_utc(time: Optional[datetime]) -> Optional[datetime]:
+    if time is None:
+        return None
+    return _as_utc(time)
+
+
+def _require_value(row: dict, column: str):
+    value = row[column]
+    if value is None:
+        raise ValueError(f"Transfer {row['conversation_id']} has no {column}")
+    return value
+
+
+def _construct_transfer_from_row(row: dict) -> Transfer:
+    sla_duration = _convert_from_stored_duration(row)
+    return Transfer(
+        conversation_id=row["conversation_id"],
+        sla_duration=sla_duration,
+        sla_band=_assign_sla_band(sla_duration),
+        requesting_practice_asid=row["requesting_practice_asid"],
+        sending_practice_asid=row["sending_practice_asid"],
+        requesting_supplier=row["requesting_supplier"],
+        sending_supplier=row["sending_supplier"],
+        sender_error_code=row["sender_error_code"],
+        final_error_code=row["final_error_code"],
+        intermediate_error_codes=row["intermediate_error_codes"],
+        status=TransferStatus(row["status"]),
+        date_requested=_as_utc(_require_value(row, "date_requested")),
+        date_completed=_as_optional_utc(row["date_completed"]),
+    )
+
+
+def select_transfer_columns(table: Table) -> Table:
+    return table.select(
+        [name for name in TRANSFER_TABLE_SCHEMA.names if name in table.column_names]
     )
+
+
+def convert_table_to_transfers(table: Table) -> Iterator[Transfer]:
+    columns = select_transfer_columns(table).to_pydict()
+    for values in zip(*columns.values()):
+        yield _construct_transfer_from_row(dict(zip(columns.keys(), values)))
@@ -0,0 +1,94 @@
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from dateutil import parser
+from dateutil.tz import tzutc
+
+from prmdata.domain.ods_portal.models import PracticeDetails
+
+EARLIEST_TIME = datetime.min.replace(tzinfo=tzutc())
+LATEST_TIME = datetime.max.replace(tzinfo=tzutc())
+
+
+class AsidAssignment(NamedTuple):
+    asid: str
+    ods_code: str
+    valid_from: Optional[datetime]
+    valid_to: Optional[datetime]
+
+
+class _AsidIntervals(NamedTuple):
+    starts: List[datetime]
+    ends: List[datetime]
+    ods_codes: List[str]
+
+
+def _build_intervals(asid: str, intervals: List[Tuple[datetime, datetime, str]]) -> _AsidIntervals:
+    starts, ends, ods_codes = (list(values) for values in zip(*sorted(intervals)))
+    for previous_end, start in zip(ends, starts[1:]):
+        if start < previous_end:
+            raise ValueError(f"Overlapping ODS code assignments for ASID: {asid}")
+    return _AsidIntervals(starts, ends, ods_codes)
+
+
+class TemporalAsidMapping:
+    def __init__(
+        self, assignments: Iterable[AsidAssignment], fallback: Optional[Dict[str, str]] = None
+    ):
+        grouped = defaultdict(list)
+        for assignment in assignments:
+            grouped[assignment.asid].append(
+                (
+                    assignment.valid_from or EARLIEST_TIME,
+                    assignment.valid_to or LATEST_TIME,
+                    assignment.ods_code,
+                )
+            )
+        self._intervals = {
+            asid: _build_intervals(asid, intervals) for asid, intervals in grouped.items()
+        }
+        self._fallback = fallback if fallback is not None else {}
+
+    def lookup(self, asid: str, time: datetime) -> Optional[str]:
+        intervals = self._intervals.get(asid)
+        if intervals is None:
+            return self._fallback.get(asid)
+        index = bisect_right(intervals.starts, time) - 1
+        if index < 0 or time >= intervals.ends[index]:
+            return None
+        return intervals.ods_codes[index]
+
+    def lookup_many(self, asids: Sequence[str], times: Sequence[datetime]) -> List[Optional[str]]:
+        lookup = self.lookup
+        return [lookup(asid, time) for asid, time in zip(asids, times)]
+
+
+def construct_asid_to_ods_mapping(practice_list: Iterable[PracticeDetails]) -> Dict[str, str]:
+    return {asid: practice.ods_code for practice in practice_list for asid in practice.asids}
+
+
+def construct_temporal_asid_mapping(
+    practice_list: Iterable[PracticeDetails], assignments: Iterable[AsidAssignment] = ()
+) -> TemporalAsidMapping:
+    return TemporalAsidMapping(assignments, fallback=construct_asid_to_ods_mapping(practice_list))
+
+
+def _parse_optional_time(value: str) -> Optional[datetime]:
+    if value == "":
+        return None
+    time = parser.isoparse(value)
+    return time if time.tzinfo is not None else time.replace(tzinfo=tzutc())
+
+
+def construct_asid_assignments_from_rows(rows: Iterable[dict]) -> List[AsidAssignment]:
+    return [
+        AsidAssignment(
+            asid=row["ASID"],
+            ods_code=row["NACS"],
+            valid_from=_parse_optional_time(row["ValidFrom"]),
+            valid_to=_parse_optional_time(row["ValidTo"]),
+        )
+        for row in rows
+    ]
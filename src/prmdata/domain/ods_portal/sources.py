@@ -0,0 +1,124 @@
+import json
+from collections import defaultdict
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from requests import Session
+
+from prmdata.domain.ods_portal.models import CcgDetails, PracticeDetails
+from prmdata.utils.io.http import (
+    CachedResponse,
+    HttpResponse,
+    HttpResponseCache,
+    RateLimiter,
+    build_request_url,
+)
+
+ODS_PORTAL_SEARCH_URL = "https://directory.spineservices.nhs.uk/ORD/2-0-0/organisations"
+ODS_PORTAL_PAGE_SIZE = 1000
+
+PRACTICE_SEARCH_PARAMS = {
+    "PrimaryRoleId": "RO177",
+    "NonPrimaryRoleId": "RO76",
+    "Status": "Active",
+}
+
+CCG_SEARCH_PARAMS = {
+    "PrimaryRoleId": "RO98",
+    "Status": "Active",
+}
+
+
+class OdsPortalException(Exception):
+    def __init__(self, message, status_code, content):
+        super().__init__(message, status_code, content)
+        self.status_code = status_code
+        self.content = content
+
+
+class _Page(NamedTuple):
+    organisations: List[dict]
+    total_count: int
+    fetched_at: Optional[float]
+
+
+class OdsPortalClient:
+    def __init__(
+        self,
+        session: Session,
+        executor: Executor,
+        rate_limiter: RateLimiter,
+        search_url: str = ODS_PORTAL_SEARCH_URL,
+        page_size: int = ODS_PORTAL_PAGE_SIZE,
+        cache: Optional[HttpResponseCache] = None,
+    ):
+        self._session = session
+        self._executor = executor
+        self._rate_limiter = rate_limiter
+        self._search_url = search_url
+        self._page_size = page_size
+        self._cache = cache
+
+    def _send(self, params: dict, headers: dict):
+        self._rate_limiter.wait()
+        return self._session.get(self._search_url, params=params, headers=headers)
+
+    def _get(self, params: dict, listed_at: Optional[float]) -> HttpResponse:
+        if self._cache is None:
+            return self._send(params, headers={})
+        return self._cache.get(
+            build_request_url(self._search_url, params),
+            lambda headers: self._send(params, headers),
+            not_before=listed_at,
+        )
+
+    def _fetch_page(self, search_params: dict, offset: int, listed_at: Optional[float]) -> _Page:
+        params = {**search_params, "Limit": self._page_size, "Offset": offset}
+        response = self._get(params, listed_at)
+        if response.status_code != 200:
+            raise OdsPortalException(
+                "Unable to fetch organisation data", response.status_code, response.content
+            )
+        organisations = json.loads(response.content)["Organisations"]
+        total_count = int(response.headers.get("X-Total-Count", len(organisations)))
+        fetched_at = response.fetched_at if isinstance(response, CachedResponse) else None
+        return _Page(organisations, total_count, fetched_at)
+
+    def fetch_organisations(self, search_params: dict) -> List[dict]:
+        first_page = self._fetch_page(search_params, offset=0, listed_at=None)
+        remaining_offsets = range(self._page_size, first_page.total_count, self._page_size)
+        pages = self._executor.map(
+            lambda offset: self._fetch_page(search_params, offset, first_page.fetched_at),
+            remaining_offsets,
+        )
+        organisations = first_page.organisations
+        for page in pages:
+            organisations.extend(page.organisations)
+        return organisations
+
+
+def construct_asid_to_ods_mappings(asid_lookup: Iterable[dict]) -> Dict[str, List[str]]:
+    mappings: Dict[str, List[str]] = defaultdict(list)
+    for row in asid_lookup:
+        mappings[row["NACS"]].append(row["ASID"])
+    return mappings
+
+
+def construct_practice_list_from_ods_portal_response(
+    organisations: Iterable[dict], asid_mappings: Dict[str, List[str]]
+) -> List[PracticeDetails]:
+    return [
+        PracticeDetails(
+            ods_code=organisation["OrgId"],
+            name=organisation["Name"],
+            asids=asid_mappings.get(organisation["OrgId"], []),
+        )
+        for organisation in organisations
+    ]
+
+
+def construct_ccg_list_from_ods_portal_response(organisations: Iterable[dict]) -> List[CcgDetails]:
+    return [
+        CcgDetails(ods_code=organisation["OrgId"], name=organisation["Name"])
+        for organisation in organisations
+    ]
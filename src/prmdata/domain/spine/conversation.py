@@ -1,21 +1,54 @@
 from collections import defaultdict
-from typing import NamedTuple, List, Iterable, Iterator, Dict
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import NamedTuple, List, Iterable, Iterator, Dict, Optional, Set
 
 from prmdata.domain.spine.message import Message
 
+_message_time = attrgetter("time")
+
 
 class Conversation(NamedTuple):
     id: str
     messages: List[Message]
 
 
-def group_into_conversations(messages: Iterable[Message]) -> Iterator[Conversation]:
+@dataclass
+class ConversationGroupingCounters:
+    conversation_count: int = 0
+    sorted_conversation_count: int = 0
+    peak_open_conversation_count: int = 0
+    finished_emitted_count: int = 0
+    idle_emitted_count: int = 0
+    late_message_count: int = 0
+
+
+def group_into_conversations(
+    messages: Iterable[Message],
+    counters: Optional[ConversationGroupingCounters] = None,
+    sort_messages: bool = True,
+) -> Iterator[Conversation]:
     conversations: Dict[str, List[Message]] = defaultdict(list)
+    out_of_order_conversation_ids: Set[str] = set()
 
     for message in messages:
-        conversations[message.conversation_id].append(message)
+        conversation_messages = conversations[message.conversation_id]
+        if conversation_messages and message.time < conversation_messages[-1].time:
+            out_of_order_conversation_ids.add(message.conversation_id)
+        conversation_messages.append(message)
+
+    sorted_conversation_ids = out_of_order_conversation_ids if sort_messages else set()
+    for conversation_id in sorted_conversation_ids:
+        conversations[conversation_id].sort(key=_message_time)
+
+    if counters is not None:
+        counters.conversation_count += len(conversations)
+        counters.sorted_conversation_count += len(sorted_conversation_ids)
+        counters.peak_open_conversation_count = max(
+            counters.peak_open_conversation_count, len(conversations)
+        )
 
     return (
-        Conversation(conversation_id, sorted(messages, key=lambda m: m.time))
+        Conversation(conversation_id, messages)
         for conversation_id, messages in conversations.items()
     )
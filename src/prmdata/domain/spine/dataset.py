@@ -0,0 +1,57 @@
+from typing import Iterator, List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow.fs import FileSystem
+
+from prmdata.domain.spine.message import (
+    MESSAGE_DICTIONARY_COLUMNS,
+    Message,
+    construct_messages_from_table,
+    convert_messages_to_table,
+)
+from prmdata.utils.date.range import DateTimeRange
+from prmdata.utils.io.parquet import read_partitioned_table, write_partitioned_table
+
+PARTITION_COLUMN = "date"
+PARTITION_SCHEMA = pa.schema([(PARTITION_COLUMN, pa.date32())])
+UNIQUE_COLUMN = "guid"
+SORT_KEYS = [("conversation_id", "ascending"), ("time", "ascending")]
+
+
+def write_message_dataset(messages: List[Message], filesystem: FileSystem, root_path: str):
+    table = convert_messages_to_table(messages)
+    table = table.append_column(PARTITION_COLUMN, pc.cast(table["time"], pa.date32()))
+    write_partitioned_table(
+        table,
+        filesystem,
+        root_path,
+        partition_column=PARTITION_COLUMN,
+        unique_column=UNIQUE_COLUMN,
+        sort_keys=SORT_KEYS,
+        dictionary_columns=MESSAGE_DICTIONARY_COLUMNS,
+    )
+
+
+def _time_range_filter(time_range: DateTimeRange):
+    timestamp_type = pa.timestamp("us", tz="UTC")
+    start = pa.scalar(time_range.start, type=timestamp_type)
+    end = pa.scalar(time_range.end, type=timestamp_type)
+    partition = ds.field(PARTITION_COLUMN)
+    time = ds.field("time")
+    return (
+        (partition >= pa.scalar(time_range.start.date(), type=pa.date32()))
+        & (partition <= pa.scalar(time_range.end.date(), type=pa.date32()))
+        & (time >= start)
+        & (time < end)
+    )
+
+
+def read_message_dataset(
+    filesystem: FileSystem, root_path: str, time_range: DateTimeRange
+) -> Iterator[Message]:
+    table = read_partitioned_table(
+        filesystem, root_path, PARTITION_SCHEMA, _time_range_filter(time_range)
+    )
+    return construct_messages_from_table(table)
@@ -1,7 +1,55 @@
+import re
 from datetime import datetime
-from typing import NamedTuple, Optional, Iterable, Iterator
+from heapq import merge
+from operator import attrgetter
+from typing import NamedTuple, Optional, Iterable, Iterator, List
 
+import pyarrow as pa
 from dateutil import parser
+from dateutil.tz import tzutc
+from pyarrow import Table
+
+SPLUNK_COLUMNS = [
+    "_time",
+    "conversationID",
+    "GUID",
+    "interactionID",
+    "messageSender",
+    "messageRecipient",
+    "messageRef",
+    "jdiEvent",
+    "fromSystem",
+    "toSystem",
+]
+
+_UTC = tzutc()
+
+_UTC_TIME_PATTERN = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?(?:\+0000|\+00:00|Z)"
+)
+
+MESSAGE_TABLE_SCHEMA = pa.schema(
+    [
+        ("time", pa.timestamp("us", tz="UTC")),
+        ("conversation_id", pa.string()),
+        ("guid", pa.string()),
+        ("interaction_id", pa.string()),
+        ("from_party_asid", pa.string()),
+        ("to_party_asid", pa.string()),
+        ("message_ref", pa.string()),
+        ("error_code", pa.int32()),
+        ("from_system", pa.string()),
+        ("to_system", pa.string()),
+    ]
+)
+
+MESSAGE_DICTIONARY_COLUMNS = [
+    "interaction_id",
+    "from_party_asid",
+    "to_party_asid",
+    "from_system",
+    "to_system",
+]
 
 
 class Message(NamedTuple):
@@ -17,6 +65,23 @@ class Message(NamedTuple):
     to_system: Optional[str]
 
 
+def _parse_time(value: str) -> datetime:
+    match = _UTC_TIME_PATTERN.fullmatch(value)
+    if match is None:
+        return parser.isoparse(value)
+    year, month, day, hour, minute, second, fraction = match.groups()
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour),
+        int(minute),
+        int(second),
+        int(fraction.ljust(6, "0")) if fraction else 0,
+        tzinfo=_UTC,
+    )
+
+
 def _parse_error_code(error):
     return None if error == "NONE" else int(error)
 
@@ -35,7 +100,7 @@ def _get_attribute(item, attr):
 def construct_messages_from_splunk_items(items: Iterable[dict]) -> Iterator[Message]:
     for item in items:
         yield Message(
-            time=parser.isoparse(item["_time"]),
+            time=_parse_time(item["_time"]),
             conversation_id=item["conversationID"],
             guid=item["GUID"],
             interaction_id=item["interactionID"],
@@ -46,3 +111,21 @@ def construct_messages_from_splunk_items(items: Iterable[dict]) -> Iterator[Mess
             from_system=_get_attribute(item, "fromSystem"),
             to_system=_get_attribute(item, "toSystem"),
         )
+
+
+def merge_messages_by_time(message_streams: Iterable[Iterable[Message]]) -> Iterator[Message]:
+    return merge(*message_streams, key=attrgetter("time"))
+
+
+def convert_messages_to_table(messages: List[Message]) -> Table:
+    return pa.table(
+        {field: [getattr(m, field) for m in messages] for field in Message._fields},
+        schema=MESSAGE_TABLE_SCHEMA,
+    )
+
+
+def construct_messages_from_table(table: Table) -> Iterator[Message]:
+    columns = [table.column(field).to_pylist() for field in Message._fields]
+    for values in zip(*columns):
+        message = Message(*values)
+        yield message._replace(time=message.time.astimezone(_UTC))
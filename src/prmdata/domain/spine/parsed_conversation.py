@@ -1,4 +1,7 @@
-from typing import NamedTuple, List, Optional, Iterable, Iterator
+from bisect import bisect_right
+from datetime import datetime
+from operator import itemgetter
+from typing import Dict, NamedTuple, List, Optional, Iterable, Iterator, Tuple
 
 from prmdata.domain.spine.conversation import Conversation
 from prmdata.domain.spine.message import Message
@@ -15,7 +18,8 @@ class ParsedConversation(NamedTuple):
     request_started: Message
     request_started_ack: Optional[Message]
     request_completed: Optional[Message]
-    intermediate_messages: List[Message]
+    intermediate_error_codes: List[int]
+    intermediate_message_count: int
     request_completed_ack: Optional[Message]
 
 
@@ -35,7 +39,8 @@ class SpineConversationParser:
         self._req_started_message: Optional[Message] = None
         self._req_completed_message: Optional[Message] = None
         self._request_started_ack: Optional[Message] = None
-        self._intermediate_messages: List[Message] = []
+        self._intermediate_error_codes: List[int] = []
+        self._intermediate_message_count = 0
         self._request_completed_ack: Optional[Message] = None
 
     @staticmethod
@@ -65,13 +70,24 @@ class SpineConversationParser:
         elif self._is_acknowledging(message, self._req_started_message):
             self._request_started_ack = message
         else:
-            self._intermediate_messages.append(message)
+            self._process_intermediate_message(message)
 
-    def parse(self):
+    def _process_intermediate_message(self, message):
+        self._intermediate_message_count += 1
+        if message.error_code is not None:
+            self._intermediate_error_codes.append(message.error_code)
+
+    def parse(self) -> ParsedConversation:
+        parsed = self.parse_if_started()
+        if parsed is None:
+            raise ConversationMissingStart()
+        return parsed
+
+    def parse_if_started(self) -> Optional[ParsedConversation]:
         self._req_started_message = self._get_next_or_none()
 
         if self._req_started_message.interaction_id != EHR_REQUEST_STARTED:
-            raise ConversationMissingStart()
+            return None
 
         next_message = self._get_next_or_none()
         while next_message is not None:
@@ -83,11 +99,116 @@ class SpineConversationParser:
             request_started=self._req_started_message,
             request_started_ack=self._request_started_ack,
             request_completed=self._req_completed_message,
-            intermediate_messages=self._intermediate_messages,
+            intermediate_error_codes=self._intermediate_error_codes,
+            intermediate_message_count=self._intermediate_message_count,
             request_completed_ack=self._request_completed_ack,
         )
 
 
+def _is_earlier(message: Message, current: Optional[Message]) -> bool:
+    return current is None or message.time < current.time
+
+
+def _is_not_earlier(message: Message, current: Optional[Message]) -> bool:
+    return current is None or message.time >= current.time
+
+
+def _find_earliest(messages: List[Message], interaction_id: str) -> Optional[Message]:
+    earliest = None
+    for message in messages:
+        if message.interaction_id == interaction_id and _is_earlier(message, earliest):
+            earliest = message
+    return earliest
+
+
+def _find_latest(messages: List[Message], interaction_id: str) -> Optional[Message]:
+    latest = None
+    for message in messages:
+        if message.interaction_id == interaction_id and _is_not_earlier(message, latest):
+            latest = message
+    return latest
+
+
+class UnorderedConversationParser:
+    def __init__(self, conversation: Conversation):
+        self._id = conversation.id
+        self._messages = conversation.messages
+        self._req_started_message = _find_earliest(self._messages, EHR_REQUEST_STARTED)
+        self._req_completed_message = _find_latest(self._messages, EHR_REQUEST_COMPLETED)
+        self._req_completed_times = {
+            message.guid: message.time
+            for message in self._messages
+            if message.interaction_id == EHR_REQUEST_COMPLETED
+        }
+        self._sorted_req_completed_times = sorted(self._req_completed_times.values())
+        self._acknowledgements: Dict[str, Optional[Message]] = {}
+        self._intermediate_error_codes: List[Tuple[datetime, int]] = []
+        self._intermediate_message_count = 0
+
+    def _acknowledges_current_request_completed(self, message: Message) -> bool:
+        completed_time = self._req_completed_times.get(message.message_ref)
+        if completed_time is None:
+            return False
+        completed_times = self._sorted_req_completed_times
+        return bisect_right(completed_times, message.time) <= bisect_right(
+            completed_times, completed_time
+        )
+
+    def _acknowledged_interaction(
+        self, message: Message, req_started_message: Message
+    ) -> Optional[str]:
+        if message.interaction_id != APPLICATION_ACK:
+            return None
+        if message.message_ref == req_started_message.guid:
+            return EHR_REQUEST_STARTED
+        if self._acknowledges_current_request_completed(message):
+            return EHR_REQUEST_COMPLETED
+        return None
+
+    def _process_intermediate_message(self, message):
+        self._intermediate_message_count += 1
+        if message.error_code is not None:
+            self._intermediate_error_codes.append((message.time, message.error_code))
+
+    def _process_message(self, message: Message, req_started_message: Message):
+        if message is req_started_message or message.interaction_id == EHR_REQUEST_COMPLETED:
+            return
+        acknowledged_interaction = self._acknowledged_interaction(message, req_started_message)
+        if acknowledged_interaction is None:
+            self._process_intermediate_message(message)
+        elif _is_not_earlier(message, self._acknowledgements.get(acknowledged_interaction)):
+            self._acknowledgements[acknowledged_interaction] = message
+
+    def parse(self) -> ParsedConversation:
+        parsed = self.parse_if_started()
+        if parsed is None:
+            raise ConversationMissingStart()
+        return parsed
+
+    def parse_if_started(self) -> Optional[ParsedConversation]:
+        if self._req_started_message is None:
+            return None
+
+        for message in self._messages:
+            self._process_message(message, self._req_started_message)
+
+        self._intermediate_error_codes.sort(key=itemgetter(0))
+        return ParsedConversation(
+            self._id,
+            request_started=self._req_started_message,
+            request_started_ack=self._acknowledgements.get(EHR_REQUEST_STARTED),
+            request_completed=self._req_completed_message,
+            intermediate_error_codes=[code for _, code in self._intermediate_error_codes],
+            intermediate_message_count=self._intermediate_message_count,
+            request_completed_ack=self._acknowledgements.get(EHR_REQUEST_COMPLETED),
+        )
+
+
+def parse_unordered_conversation(conversation: Conversation) -> ParsedConversation:
+    parser = UnorderedConversationParser(conversation)
+    return parser.parse()
+
+
 def filter_conversations_by_request_started_time(
     conversations: Iterable[ParsedConversation], time_range: DateTimeRange
 ) -> Iterator[ParsedConversation]:
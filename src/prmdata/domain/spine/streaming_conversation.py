@@ -0,0 +1,151 @@
+from collections import deque
+from datetime import datetime, timedelta
+from heapq import heappop, heappush
+from itertools import count
+from operator import attrgetter
+from typing import Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from prmdata.domain.spine.conversation import Conversation, ConversationGroupingCounters
+from prmdata.domain.spine.message import Message
+from prmdata.domain.spine.parsed_conversation import APPLICATION_ACK, EHR_REQUEST_COMPLETED
+
+
+class ConversationWatermark(NamedTuple):
+    lateness: timedelta
+    idle_timeout: Optional[timedelta] = None
+
+
+_message_time = attrgetter("time")
+
+
+class _StreamingConversationGrouper:
+    def __init__(
+        self,
+        watermark: ConversationWatermark,
+        counters: ConversationGroupingCounters,
+        sort_messages: bool,
+    ):
+        self._sort_messages = sort_messages
+        self._lateness = watermark.lateness
+        self._idle_timeout = watermark.idle_timeout
+        self._counters = counters
+        self._open: Dict[str, List[Message]] = {}
+        self._last_activity: Dict[str, datetime] = {}
+        self._out_of_order: Set[str] = set()
+        self._completed_guids: Dict[str, Set[str]] = {}
+        self._unmatched_acks: Dict[str, Dict[str, datetime]] = {}
+        self._emitted: Set[str] = set()
+        self._emitted_at: Deque[Tuple[datetime, str]] = deque()
+        self._finished: List[Tuple[datetime, int, str]] = []
+        self._idle: List[Tuple[datetime, int, str]] = []
+        self._sequence = count()
+        self._latest_time: Optional[datetime] = None
+
+    def _emit(self, conversation_id: str) -> Conversation:
+        messages = self._open.pop(conversation_id)
+        del self._last_activity[conversation_id]
+        self._completed_guids.pop(conversation_id, None)
+        self._unmatched_acks.pop(conversation_id, None)
+        if conversation_id in self._out_of_order:
+            messages.sort(key=_message_time)
+            self._out_of_order.discard(conversation_id)
+            self._counters.sorted_conversation_count += 1
+        self._counters.conversation_count += 1
+        return Conversation(conversation_id, messages)
+
+    def _emit_before_end(self, conversation_id: str, watermark: datetime) -> Conversation:
+        self._emitted.add(conversation_id)
+        self._emitted_at.append((watermark, conversation_id))
+        return self._emit(conversation_id)
+
+    def _track_activity(self, conversation_id: str, time: datetime):
+        last_activity = self._last_activity.get(conversation_id)
+        if last_activity is not None and time <= last_activity:
+            return
+        self._last_activity[conversation_id] = time
+        if self._idle_timeout is not None:
+            heappush(self._idle, (time, next(self._sequence), conversation_id))
+
+    def _mark_finished(self, conversation_id: str, time: datetime):
+        heappush(self._finished, (time, next(self._sequence), conversation_id))
+
+    def _track_request_completed(self, message: Message):
+        conversation_id = message.conversation_id
+        self._completed_guids.setdefault(conversation_id, set()).add(message.guid)
+        ack_time = self._unmatched_acks.get(conversation_id, {}).pop(message.guid, None)
+        if ack_time is not None:
+            self._mark_finished(conversation_id, max(ack_time, message.time))
+
+    def _track_ack(self, message: Message):
+        conversation_id = message.conversation_id
+        if message.message_ref in self._completed_guids.get(conversation_id, ()):
+            self._mark_finished(conversation_id, message.time)
+        elif message.message_ref is not None:
+            self._unmatched_acks.setdefault(conversation_id, {})[message.message_ref] = message.time
+
+    def _append(self, message: Message):
+        conversation_id = message.conversation_id
+        messages = self._open.setdefault(conversation_id, [])
+        if self._sort_messages and messages and message.time < messages[-1].time:
+            self._out_of_order.add(conversation_id)
+        messages.append(message)
+        self._track_activity(conversation_id, message.time)
+        if message.interaction_id == EHR_REQUEST_COMPLETED:
+            self._track_request_completed(message)
+        elif message.interaction_id == APPLICATION_ACK:
+            self._track_ack(message)
+
+    def _emit_finished(self, watermark: datetime) -> Iterator[Conversation]:
+        while self._finished and self._finished[0][0] <= watermark:
+            _, _, conversation_id = heappop(self._finished)
+            if conversation_id in self._open:
+                self._counters.finished_emitted_count += 1
+                yield self._emit_before_end(conversation_id, watermark)
+
+    def _emit_idle(self, watermark: datetime, idle_before: datetime) -> Iterator[Conversation]:
+        while self._idle and self._idle[0][0] <= idle_before:
+            time, _, conversation_id = heappop(self._idle)
+            if self._last_activity.get(conversation_id) == time:
+                self._counters.idle_emitted_count += 1
+                yield self._emit_before_end(conversation_id, watermark)
+
+    def _forget_emitted(self, forget_before: datetime):
+        while self._emitted_at and self._emitted_at[0][0] < forget_before:
+            _, conversation_id = self._emitted_at.popleft()
+            self._emitted.discard(conversation_id)
+
+    def add(self, message: Message) -> Iterator[Conversation]:
+        if message.conversation_id in self._emitted:
+            self._counters.late_message_count += 1
+            return
+        self._append(message)
+        self._counters.peak_open_conversation_count = max(
+            self._counters.peak_open_conversation_count, len(self._open)
+        )
+        if self._latest_time is None or message.time > self._latest_time:
+            self._latest_time = message.time
+        watermark = self._latest_time - self._lateness
+        self._forget_emitted(watermark - self._lateness)
+        yield from self._emit_finished(watermark)
+        if self._idle_timeout is not None:
+            yield from self._emit_idle(watermark, watermark - self._idle_timeout)
+
+    def flush(self) -> Iterator[Conversation]:
+        for conversation_id in list(self._open):
+            yield self._emit(conversation_id)
+
+
+def group_into_conversations_streaming(
+    messages: Iterable[Message],
+    watermark: ConversationWatermark,
+    counters: Optional[ConversationGroupingCounters] = None,
+    sort_messages: bool = True,
+) -> Iterator[Conversation]:
+    grouper = _StreamingConversationGrouper(
+        watermark,
+        counters if counters is not None else ConversationGroupingCounters(),
+        sort_messages,
+    )
+    for message in messages:
+        yield from grouper.add(message)
+    yield from grouper.flush()
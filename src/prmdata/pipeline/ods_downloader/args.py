@@ -0,0 +1,91 @@
+from argparse import ArgumentParser
+
+from prmdata.domain.ods_portal.sources import ODS_PORTAL_PAGE_SIZE, ODS_PORTAL_SEARCH_URL
+
+
+def parse_ods_portal_pipeline_arguments(argument_list):
+    parser = ArgumentParser(description="ODS portal pipeline")
+    parser.add_argument(
+        "--mapping-file",
+        type=str,
+        required=True,
+        help="The gzipped CSV file mapping practice ODS codes (NACS) to their ASIDs.",
+    )
+    parser.add_argument(
+        "--search-url",
+        type=str,
+        default=ODS_PORTAL_SEARCH_URL,
+        help="The ODS portal organisation search endpoint.",
+    )
+    parser.add_argument(
+        "--s3-endpoint-url",
+        type=str,
+        required=False,
+        help="The endpoint used to upload output data (optional).",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=4,
+        help="The maximum number of concurrent connections to the ODS portal.",
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=5,
+        help="The maximum rate of requests sent to the ODS portal.",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=5,
+        help="How many times a failed or throttled request is retried, with exponential backoff.",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=ODS_PORTAL_PAGE_SIZE,
+        help="The number of organisations requested per page.",
+    )
+    parser.add_argument(
+        "--cache-directory",
+        type=str,
+        required=False,
+        help="A local directory to cache ODS portal responses in (optional). \
+        Cached responses are revalidated with the portal once they are older than the TTL.",
+    )
+    parser.add_argument(
+        "--cache-ttl-hours",
+        type=float,
+        default=24,
+        help="How long a cached response is used without revalidating it.",
+    )
+    parser.add_argument(
+        "--cache-max-age-days",
+        type=float,
+        default=90,
+        help="How long a cached response is kept before it is evicted and fetched again.",
+    )
+    parser.add_argument(
+        "--output-key",
+        type=str,
+        default="organisation-list.json",
+        help="The S3 key of the organisation list when uploading to a bucket.",
+    )
+
+    output_group = parser.add_mutually_exclusive_group(required=True)
+
+    output_group.add_argument(
+        "--output-bucket",
+        type=str,
+        help="The S3 bucket where the organisation list will be uploaded.",
+    )
+    output_group.add_argument(
+        "--output-file",
+        type=str,
+        help="The local file where the organisation list will be saved.",
+    )
+
+    args = parser.parse_args(argument_list)
+
+    return args
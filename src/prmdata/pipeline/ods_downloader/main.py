@@ -0,0 +1,77 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+import boto3
+from dateutil.tz import tzutc
+
+from prmdata.domain.ods_portal.models import OrganisationMetadata
+from prmdata.domain.ods_portal.sources import (
+    CCG_SEARCH_PARAMS,
+    PRACTICE_SEARCH_PARAMS,
+    OdsPortalClient,
+    construct_asid_to_ods_mappings,
+    construct_ccg_list_from_ods_portal_response,
+    construct_practice_list_from_ods_portal_response,
+)
+from prmdata.pipeline.ods_downloader.args import parse_ods_portal_pipeline_arguments
+from prmdata.utils.io.csv import read_gzip_csv_file
+from prmdata.utils.io.http import HttpResponseCache, RateLimiter, build_http_session
+from prmdata.utils.io.json import upload_json_object, write_json_file
+
+
+def _read_asid_mappings(file_path):
+    return construct_asid_to_ods_mappings(read_gzip_csv_file(file_path))
+
+
+def _build_response_cache(args):
+    if args.cache_directory is None:
+        return None
+    cache = HttpResponseCache(
+        args.cache_directory,
+        ttl=timedelta(hours=args.cache_ttl_hours),
+        max_age=timedelta(days=args.cache_max_age_days),
+    )
+    cache.evict_expired()
+    return cache
+
+
+def _build_ods_portal_client(args, executor):
+    return OdsPortalClient(
+        session=build_http_session(args.max_connections, args.max_retries),
+        executor=executor,
+        rate_limiter=RateLimiter(args.requests_per_second),
+        search_url=args.search_url,
+        page_size=args.page_size,
+        cache=_build_response_cache(args),
+    )
+
+
+def _fetch_organisation_metadata(args) -> OrganisationMetadata:
+    with ThreadPoolExecutor(max_workers=args.max_connections) as page_executor:
+        client = _build_ods_portal_client(args, page_executor)
+        with ThreadPoolExecutor(max_workers=2) as background:
+            asid_mappings = background.submit(_read_asid_mappings, args.mapping_file)
+            ccgs = background.submit(client.fetch_organisations, CCG_SEARCH_PARAMS)
+            practices = client.fetch_organisations(PRACTICE_SEARCH_PARAMS)
+
+            return OrganisationMetadata(
+                generated_on=datetime.now(tzutc()),
+                practices=construct_practice_list_from_ods_portal_response(
+                    practices, asid_mappings.result()
+                ),
+                ccgs=construct_ccg_list_from_ods_portal_response(ccgs.result()),
+            )
+
+
+def main():
+    args = parse_ods_portal_pipeline_arguments(sys.argv[1:])
+
+    organisation_metadata = asdict(_fetch_organisation_metadata(args))
+
+    if args.output_file:
+        write_json_file(organisation_metadata, args.output_file)
+    elif args.output_bucket:
+        s3 = boto3.resource("s3", endpoint_url=args.s3_endpoint_url)
+        upload_json_object(organisation_metadata, s3.Object(args.output_bucket, args.output_key))
@@ -1,10 +1,24 @@
 from argparse import ArgumentParser
 
+from prmdata.utils.profiling import PROFILED_STAGES
+
 
 def _list_str(values):
     return values.split(",")
 
 
+def _check_conversation_grouping_arguments(parser, args):
+    if args.time_ordered_input and (not args.input_files or args.decompression_workers):
+        parser.error("--time-ordered-input needs --input-files and no --decompression-workers")
+    if args.conversation_idle_days is not None and args.conversation_lateness_minutes is None:
+        parser.error("--conversation-idle-days needs --conversation-lateness-minutes")
+    if args.conversation_lateness_minutes is not None and args.input_dataset:
+        parser.error(
+            "--conversation-lateness-minutes cannot be used with --input-dataset, "
+            "which is ordered by conversation rather than time"
+        )
+
+
 def parse_platform_metrics_calculator_pipeline_arguments(argument_list):
     parser = ArgumentParser(description="GP2GP Data Platform pipeline")
     parser.add_argument("--month", type=int, required=True, help="The target month.")
@@ -17,11 +31,40 @@ def parse_platform_metrics_calculator_pipeline_arguments(argument_list):
         This list is the output of the ODS portal pipeline.",
     )
     parser.add_argument(
+        "--asid-history-file",
+        type=str,
+        required=False,
+        help="A CSV file of ASID to ODS code assignments with ASID, NACS, ValidFrom and \
+        ValidTo columns (optional). Transfers are attributed to the practice the requesting \
+        ASID belonged to when the transfer was requested. ASIDs not in the file use the \
+        organisation list.",
+    )
+    input_group = parser.add_mutually_exclusive_group(required=True)
+
+    input_group.add_argument(
         "--input-files",
         type=_list_str,
-        required=True,
         help="The spine data file(s) used for analysis. \
-        These files must be gzipped. Separate files with ','.",
+        These files can be gzipped, zstd compressed or uncompressed. Separate files with ','.",
+    )
+    input_group.add_argument(
+        "--input-dataset",
+        type=str,
+        help="The local directory or s3://bucket/prefix of a spine dataset written by the \
+        spine compaction pipeline. Messages of the target month and the month after are read.",
+    )
+    input_group.add_argument(
+        "--input-transfers-file",
+        type=str,
+        help="A local path or s3://bucket/key of a transfers.parquet written by a previous run \
+        for the same month. Metrics are recalculated from it without reading spine data.",
+    )
+    input_group.add_argument(
+        "--input-asid-counts-file",
+        type=str,
+        help="A local path or s3://bucket/key of an asidTransferCounts.parquet written by a \
+        previous run for the same month. Only practice, national and organisation metadata \
+        outputs are written.",
     )
     parser.add_argument(
         "--s3-endpoint-url",
@@ -30,6 +73,62 @@ def parse_platform_metrics_calculator_pipeline_arguments(argument_list):
         help="The endpoint used to upload output data (optional).",
     )
 
+    parser.add_argument(
+        "--decompression-workers",
+        type=int,
+        required=False,
+        help="Decompress each input file in parallel chunks with this many workers (optional). \
+        This builds a seek-point index of every input file, cached next to it as <file>.gzidx.",
+    )
+
+    parser.add_argument(
+        "--time-ordered-input",
+        action="store_true",
+        help="Every input file is already sorted by _time. The files are merged into one \
+        time-ordered stream of messages instead of being read one after the other.",
+    )
+    parser.add_argument(
+        "--conversation-lateness-minutes",
+        type=float,
+        required=False,
+        help="Group messages into conversations as a stream (optional). A finished conversation \
+        is passed on once no message can still be this many minutes late for it, instead of \
+        after every input message has been read.",
+    )
+    parser.add_argument(
+        "--conversation-idle-days",
+        type=float,
+        required=False,
+        help="With --conversation-lateness-minutes, also pass on conversations that have had no \
+        messages for this many days (optional). Messages arriving later are dropped.",
+    )
+
+    parser.add_argument(
+        "--skip-conversation-sorting",
+        action="store_true",
+        help="Do not sort the messages of each conversation by time. Acknowledgements are \
+        matched to the message they reference by GUID instead, which also handles \
+        acknowledgements timestamped before that message.",
+    )
+
+    parser.add_argument(
+        "--deduplicate-messages",
+        action="store_true",
+        help="Drop every message whose GUID has already been read, e.g. from overlapping \
+        exports. Uses 16 to 32 bytes of memory per distinct message.",
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=_list_str,
+        nargs="?",
+        const=["main"],
+        required=False,
+        help="Profile the run and save the profile (pstats format) alongside the output data. \
+        Optionally takes the stages to profile, separated with ','. \
+        Stages are main (the whole run), transfers, metrics and output.",
+    )
+
     output_group = parser.add_mutually_exclusive_group(required=True)
 
     output_group.add_argument(
@@ -41,6 +140,55 @@ def parse_platform_metrics_calculator_pipeline_arguments(argument_list):
         help="The local directory where the output data will be saved.",
     )
 
+    parser.add_argument(
+        "--sla-scenarios-file",
+        type=str,
+        required=False,
+        help="A JSON file of alternative SLA band thresholds (optional). Practice and national \
+        metrics are also written for every scenario in it.",
+    )
+    parser.add_argument(
+        "--output-transfers-dataset",
+        type=str,
+        required=False,
+        help="Also write the transfers into this local directory or s3://bucket/prefix as a \
+        dataset partitioned by year and month (optional). The target month is replaced.",
+    )
+    parser.add_argument(
+        "--partition-transfers-by-status",
+        action="store_true",
+        help="Further partition the transfers dataset by transfer status.",
+    )
+
+    parser.add_argument(
+        "--parquet-compression",
+        type=str,
+        required=False,
+        help="The compression codec of the transfers Parquet output, e.g. snappy, zstd or none \
+        (optional, defaults to snappy).",
+    )
+    parser.add_argument(
+        "--parquet-row-group-size",
+        type=int,
+        required=False,
+        help="The maximum number of rows per row group of the transfers Parquet output \
+        (optional, defaults to 65536).",
+    )
+    parser.add_argument(
+        "--parquet-page-index",
+        action="store_true",
+        help="Write a Parquet page index for the transfers output (needs PyArrow 13 or later).",
+    )
+
     args = parser.parse_args(argument_list)
+    if args.input_asid_counts_file and (args.sla_scenarios_file or args.output_transfers_dataset):
+        parser.error(
+            "--sla-scenarios-file and --output-transfers-dataset need transfers and cannot be "
+            "used with --input-asid-counts-file"
+        )
+
+    _check_conversation_grouping_arguments(parser, args)
+    if args.profile is not None and not set(args.profile) <= set(PROFILED_STAGES):
+        parser.error(f"--profile stages must be among {', '.join(PROFILED_STAGES)}")
 
     return args
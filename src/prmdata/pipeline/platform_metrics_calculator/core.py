@@ -1,4 +1,4 @@
-from typing import Iterable, List, Iterator
+from typing import Iterable, List, Iterator, NamedTuple, Optional
 
 from prmdata.domain.data_platform.national_metrics import (
     NationalMetricsPresentation,
@@ -9,40 +9,98 @@ from prmdata.domain.data_platform.practice_metrics import (
     PracticeMetricsPresentation,
 )
 from prmdata.utils.date.range import DateTimeRange
+from prmdata.utils.fingerprint_set import FingerprintSet
+from prmdata.domain.ods_portal.asid_mapping import TemporalAsidMapping
 from prmdata.domain.ods_portal.models import PracticeDetails
-from prmdata.domain.gp2gp.national_metrics import calculate_national_metrics
+from prmdata.domain.gp2gp.asid_counts import AsidTransferCount
+from prmdata.domain.gp2gp.national_metrics import (
+    calculate_national_metrics,
+    calculate_national_metrics_from_asid_counts,
+)
 from prmdata.domain.gp2gp.transfer import (
     Transfer,
     derive_transfers,
     filter_for_successful_transfers,
 )
-from prmdata.domain.gp2gp.practice_metrics import calculate_sla_by_practice
+from prmdata.domain.gp2gp.practice_metrics import (
+    calculate_sla_by_practice,
+    calculate_sla_by_practice_from_asid_counts,
+)
+from prmdata.domain.gp2gp.sla_scenarios import SlaScenario, calculate_sla_scenario_metrics
 from prmdata.domain.spine.message import Message
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
 from prmdata.domain.spine.parsed_conversation import (
-    parse_conversation,
-    ConversationMissingStart,
+    SpineConversationParser,
+    UnorderedConversationParser,
     filter_conversations_by_request_started_time,
 )
-from prmdata.domain.spine.conversation import group_into_conversations
+from prmdata.domain.spine.conversation import (
+    ConversationGroupingCounters,
+    group_into_conversations,
+)
+from prmdata.domain.spine.streaming_conversation import (
+    ConversationWatermark,
+    group_into_conversations_streaming,
+)
+
+
+class SlaScenarioMetricsData(NamedTuple):
+    name: str
+    practice_metrics: PracticeMetricsPresentation
+    national_metrics: NationalMetricsPresentation
+
+
+def _deduplicate_messages(spine_messages, quality):
+    guids = FingerprintSet()
+    for message in spine_messages:
+        if guids.add(message.guid):
+            yield message
+        else:
+            quality.duplicate_messages += 1
+
 
+def _count_duplicate_messages(conversation) -> int:
+    return len(conversation.messages) - len({message.guid for message in conversation.messages})
 
-def _parse_conversations(conversations):
+
+def _parse_conversations(conversations, parser, quality):
     for conversation in conversations:
-        try:
-            yield parse_conversation(conversation)
-        except ConversationMissingStart:
-            pass
+        quality.duplicate_messages += _count_duplicate_messages(conversation)
+        parsed_conversation = parser(conversation).parse_if_started()
+        if parsed_conversation is None:
+            quality.conversations_missing_start += 1
+        else:
+            yield parsed_conversation
+
+
+def _group_into_conversations(spine_messages, watermark, counters, sort_messages):
+    if watermark is None:
+        return group_into_conversations(spine_messages, counters, sort_messages)
+    return group_into_conversations_streaming(spine_messages, watermark, counters, sort_messages)
 
 
 def parse_transfers_from_messages(
-    spine_messages: Iterable[Message], time_range: DateTimeRange
+    spine_messages: Iterable[Message],
+    time_range: DateTimeRange,
+    watermark: Optional[ConversationWatermark] = None,
+    counters: Optional[ConversationGroupingCounters] = None,
+    sort_messages: bool = True,
+    quality: Optional[DataQualityCounters] = None,
+    deduplicate: bool = False,
 ) -> Iterator[Transfer]:
-    conversations = group_into_conversations(spine_messages)
-    parsed_conversations = _parse_conversations(conversations)
+    quality = quality if quality is not None else DataQualityCounters()
+    if deduplicate:
+        spine_messages = _deduplicate_messages(spine_messages, quality)
+    conversations = _group_into_conversations(spine_messages, watermark, counters, sort_messages)
+    parsed_conversations = _parse_conversations(
+        conversations,
+        SpineConversationParser if sort_messages else UnorderedConversationParser,
+        quality,
+    )
     conversations_started_in_range = filter_conversations_by_request_started_time(
         parsed_conversations, time_range
     )
-    transfers = derive_transfers(conversations_started_in_range)
+    transfers = derive_transfers(conversations_started_in_range, quality)
     return transfers
 
 
@@ -50,9 +108,13 @@ def calculate_practice_metrics_data(
     transfers: List[Transfer],
     practice_list: List[PracticeDetails],
     time_range: DateTimeRange,
+    asid_mapping: Optional[TemporalAsidMapping] = None,
+    quality: Optional[DataQualityCounters] = None,
 ) -> PracticeMetricsPresentation:
     completed_transfers = filter_for_successful_transfers(transfers)
-    sla_metrics = calculate_sla_by_practice(practice_list, completed_transfers)
+    sla_metrics = calculate_sla_by_practice(
+        practice_list, completed_transfers, asid_mapping, quality
+    )
     practice_metrics = construct_practice_metrics(
         sla_metrics, year=time_range.start.year, month=time_range.start.month
     )
@@ -68,3 +130,53 @@ def calculate_national_metrics_data(
         year=time_range.start.year,
         month=time_range.start.month,
     )
+
+
+def calculate_practice_metrics_data_from_asid_counts(
+    asid_counts: List[AsidTransferCount],
+    practice_list: List[PracticeDetails],
+    time_range: DateTimeRange,
+    asid_mapping: Optional[TemporalAsidMapping] = None,
+    quality: Optional[DataQualityCounters] = None,
+) -> PracticeMetricsPresentation:
+    sla_metrics = calculate_sla_by_practice_from_asid_counts(
+        practice_list, asid_counts, asid_mapping, attributed_at=time_range.start, quality=quality
+    )
+    return construct_practice_metrics(
+        sla_metrics, year=time_range.start.year, month=time_range.start.month
+    )
+
+
+def calculate_national_metrics_data_from_asid_counts(
+    asid_counts: List[AsidTransferCount], time_range: DateTimeRange
+) -> NationalMetricsPresentation:
+    return construct_national_metrics(
+        national_metrics=calculate_national_metrics_from_asid_counts(asid_counts),
+        year=time_range.start.year,
+        month=time_range.start.month,
+    )
+
+
+def calculate_sla_scenario_metrics_data(
+    transfers: List[Transfer],
+    practice_list: List[PracticeDetails],
+    scenarios: List[SlaScenario],
+    time_range: DateTimeRange,
+    asid_mapping: Optional[TemporalAsidMapping] = None,
+) -> List[SlaScenarioMetricsData]:
+    year = time_range.start.year
+    month = time_range.start.month
+    return [
+        SlaScenarioMetricsData(
+            name=scenario_metrics.scenario.name,
+            practice_metrics=construct_practice_metrics(
+                scenario_metrics.practice_metrics, year=year, month=month
+            ),
+            national_metrics=construct_national_metrics(
+                national_metrics=scenario_metrics.national_metrics, year=year, month=month
+            ),
+        )
+        for scenario_metrics in calculate_sla_scenario_metrics(
+            transfers, practice_list, scenarios, asid_mapping=asid_mapping
+        )
+    ]
@@ -1,15 +1,27 @@
+import logging
 import sys
 from dataclasses import asdict
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import boto3
 from dateutil.relativedelta import relativedelta
 from dateutil.tz import tzutc
+from prmdata.domain.data_platform.data_quality import construct_data_quality_report
 from prmdata.domain.data_platform.organisation_metadata import construct_organisation_metadata
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
 from prmdata.utils.date.range import DateTimeRange
+from prmdata.utils.profiling import StageProfiler, WHOLE_RUN
 
-from prmdata.utils.io.csv import read_gzip_csv_files
+from prmdata.utils.io.csv import read_csv_file, read_csv_files_parallel
+from prmdata.domain.ods_portal.asid_mapping import (
+    construct_asid_assignments_from_rows,
+    construct_temporal_asid_mapping,
+)
+from prmdata.utils.io.staged import StagedReadMetrics, read_csv_files_staged
 from prmdata.utils.io.dictionary import camelize_dict
+from prmdata.utils.io.parquet import resolve_filesystem, write_table_with_profile
+from prmdata.domain.spine.dataset import read_message_dataset
+from prmdata.domain.gp2gp.dataset import write_transfer_dataset
 from prmdata.utils.io.json import write_json_file, read_json_file, upload_json_object
 from prmdata.domain.ods_portal.models import construct_organisation_list_from_dict
 from prmdata.pipeline.platform_metrics_calculator.args import (
@@ -17,13 +29,43 @@ from prmdata.pipeline.platform_metrics_calculator.args import (
 )
 from prmdata.pipeline.platform_metrics_calculator.core import (
     calculate_practice_metrics_data,
+    calculate_practice_metrics_data_from_asid_counts,
     parse_transfers_from_messages,
-    calculate_national_metrics_data,
+    calculate_national_metrics_data_from_asid_counts,
+    calculate_sla_scenario_metrics_data,
+)
+from prmdata.domain.gp2gp.asid_counts import (
+    ASID_COUNTS_WRITER_PROFILE,
+    convert_asid_counts_to_table,
+    convert_table_to_asid_counts,
+    count_transfers_by_asid,
+)
+from prmdata.domain.gp2gp.sla_scenarios import construct_sla_scenarios_from_dict
+from prmdata.domain.gp2gp.transfer import (
+    TRANSFER_WRITER_PROFILE,
+    convert_table_to_transfers,
+    convert_transfers_to_table,
+)
+from prmdata.domain.spine.conversation import ConversationGroupingCounters
+from prmdata.domain.spine.streaming_conversation import ConversationWatermark
+from prmdata.domain.spine.message import (
+    SPLUNK_COLUMNS,
+    construct_messages_from_splunk_items,
+    merge_messages_by_time,
 )
-from prmdata.domain.gp2gp.transfer import convert_transfers_to_table
-from prmdata.domain.spine.message import construct_messages_from_splunk_items
-from pyarrow.parquet import write_table
 from pyarrow.fs import S3FileSystem
+from pyarrow.parquet import read_table
+
+PRACTICE_METRICS_FILE_NAME = "practiceMetrics.json"
+ORGANISATION_METADATA_FILE_NAME = "organisationMetadata.json"
+NATIONAL_METRICS_FILE_NAME = "nationalMetrics.json"
+TRANSFERS_FILE_NAME = "transfers.parquet"
+ASID_COUNTS_FILE_NAME = "asidTransferCounts.parquet"
+PROFILE_FILE_NAME = "profile.pstats"
+DATA_QUALITY_FILE_NAME = "dataQuality.json"
+SLA_SCENARIOS_PATH = "sla-scenarios"
+
+logger = logging.getLogger(__name__)
 
 
 def _write_data_platform_json_file(platform_data, output_file_path):
@@ -38,17 +80,125 @@ def _upload_data_platform_json_object(platform_data, s3_object):
     upload_json_object(camelized_dict, s3_object)
 
 
-def _read_spine_csv_gz_files(file_paths):
-    items = read_gzip_csv_files(file_paths)
+def _read_spine_csv_gz_files(args, read_metrics):
+    if args.decompression_workers:
+        items = read_csv_files_parallel(
+            args.input_files, args.decompression_workers, SPLUNK_COLUMNS
+        )
+    else:
+        items = read_csv_files_staged(args.input_files, read_metrics, SPLUNK_COLUMNS)
     return construct_messages_from_splunk_items(items)
 
 
+def _read_time_ordered_spine_files(args):
+    return merge_messages_by_time(
+        construct_messages_from_splunk_items(read_csv_file(file_path, SPLUNK_COLUMNS))
+        for file_path in args.input_files
+    )
+
+
+def _read_spine_messages(args, read_metrics):
+    if args.input_dataset:
+        filesystem, root_path = resolve_filesystem(args.input_dataset, args.s3_endpoint_url)
+        return read_message_dataset(filesystem, root_path, _get_input_time_range(args))
+    if args.time_ordered_input:
+        return _read_time_ordered_spine_files(args)
+    return _read_spine_csv_gz_files(args, read_metrics)
+
+
+def _read_transfers(args, time_range, read_metrics, quality):
+    if args.input_asid_counts_file:
+        return None
+    if args.input_transfers_file:
+        filesystem, path = resolve_filesystem(args.input_transfers_file, args.s3_endpoint_url)
+        return list(convert_table_to_transfers(read_table(path, filesystem=filesystem)))
+    spine_messages = _read_spine_messages(args, read_metrics)
+    watermark = _get_conversation_watermark(args)
+    counters = ConversationGroupingCounters()
+    transfers = list(
+        parse_transfers_from_messages(
+            spine_messages,
+            time_range,
+            watermark,
+            counters,
+            sort_messages=not args.skip_conversation_sorting,
+            quality=quality,
+            deduplicate=args.deduplicate_messages,
+        )
+    )
+    if watermark is not None:
+        _log_grouping_counters(counters)
+    return transfers
+
+
+def _get_conversation_watermark(args):
+    if args.conversation_lateness_minutes is None:
+        return None
+    idle_timeout = (
+        timedelta(days=args.conversation_idle_days)
+        if args.conversation_idle_days is not None
+        else None
+    )
+    return ConversationWatermark(
+        lateness=timedelta(minutes=args.conversation_lateness_minutes), idle_timeout=idle_timeout
+    )
+
+
+def _log_grouping_counters(counters):
+    logger.info(
+        "Grouped %d conversations, at most %d open: %d emitted finished, %d emitted idle, "
+        "%d late messages dropped",
+        counters.conversation_count,
+        counters.peak_open_conversation_count,
+        counters.finished_emitted_count,
+        counters.idle_emitted_count,
+        counters.late_message_count,
+    )
+
+
+def _read_asid_counts(args, transfers):
+    if args.input_asid_counts_file:
+        filesystem, path = resolve_filesystem(args.input_asid_counts_file, args.s3_endpoint_url)
+        return list(convert_table_to_asid_counts(read_table(path, filesystem=filesystem)))
+    return count_transfers_by_asid(transfers)
+
+
+def _log_read_metrics(read_metrics):
+    for stage, unit in [(read_metrics.decompress, "bytes"), (read_metrics.parse, "rows")]:
+        logger.info(
+            "%s: %d %s, %.2fs busy, %.2fs waiting, %.0f %s/s",
+            stage.name,
+            stage.item_count,
+            unit,
+            stage.busy_seconds,
+            stage.waiting_seconds,
+            stage.throughput,
+            unit,
+        )
+
+
 def _get_time_range(year, month):
     metric_month = datetime(year, month, 1, tzinfo=tzutc())
     next_month = metric_month + relativedelta(months=1)
     return DateTimeRange(metric_month, next_month)
 
 
+def _get_input_time_range(args):
+    metric_month = datetime(args.year, args.month, 1, tzinfo=tzutc())
+    return DateTimeRange(metric_month, metric_month + relativedelta(months=2))
+
+
+def _get_transfer_writer_profile(args):
+    overrides = {
+        "compression": args.parquet_compression,
+        "row_group_size": args.parquet_row_group_size,
+        "write_page_index": args.parquet_page_index or None,
+    }
+    return TRANSFER_WRITER_PROFILE._replace(
+        **{field: value for field, value in overrides.items() if value is not None}
+    )
+
+
 def _is_outputting_to_file(args):
     return args.output_directory
 
@@ -57,67 +207,229 @@ def _is_outputting_to_s3(args):
     return args.output_bucket
 
 
-def main():
-    args = parse_platform_metrics_calculator_pipeline_arguments(sys.argv[1:])
+def _s3_path(args):
+    version = "v2"
+    return f"{version}/{args.year}/{args.month}"
+
+
+def _read_asid_mapping(args, practices):
+    if not args.asid_history_file:
+        return construct_temporal_asid_mapping(practices)
+    assignments = construct_asid_assignments_from_rows(read_csv_file(args.asid_history_file))
+    return construct_temporal_asid_mapping(practices, assignments)
+
+
+def _calculate_practice_metrics(
+    transfers, asid_counts, practices, asid_mapping, time_range, quality
+):
+    if transfers is None:
+        return calculate_practice_metrics_data_from_asid_counts(
+            asid_counts, practices, time_range, asid_mapping, quality
+        )
+    return calculate_practice_metrics_data(transfers, practices, time_range, asid_mapping, quality)
+
+
+def _calculate_sla_scenario_metrics(args, transfers, practices, asid_mapping, time_range):
+    if not args.sla_scenarios_file:
+        return []
+    scenarios = construct_sla_scenarios_from_dict(read_json_file(args.sla_scenarios_file))
+    return calculate_sla_scenario_metrics_data(
+        transfers, practices, scenarios, time_range, asid_mapping
+    )
+
+
+def _run_pipeline(args, profiler):
     time_range = _get_time_range(args.year, args.month)
 
     organisation_data = read_json_file(args.organisation_list_file)
     organisation_metadata = construct_organisation_list_from_dict(data=organisation_data)
 
-    spine_messages = _read_spine_csv_gz_files(args.input_files)
-    transfers = list(parse_transfers_from_messages(spine_messages, time_range))
-    practice_metrics_data = calculate_practice_metrics_data(
-        transfers, organisation_metadata.practices, time_range
-    )
-    national_metrics_data = calculate_national_metrics_data(
-        transfers=transfers, time_range=time_range
-    )
-    organisation_metadata = construct_organisation_metadata(organisation_metadata)
-    transfer_table = convert_transfers_to_table(transfers)
+    quality = DataQualityCounters()
+    with profiler.stage("transfers"):
+        read_metrics = StagedReadMetrics()
+        transfers = _read_transfers(args, time_range, read_metrics, quality)
+        asid_counts = _read_asid_counts(args, transfers)
+        if args.input_files and not (args.decompression_workers or args.time_ordered_input):
+            _log_read_metrics(read_metrics)
+
+    with profiler.stage("metrics"):
+        practices = organisation_metadata.practices
+        asid_mapping = _read_asid_mapping(args, practices)
+        practice_metrics_data = _calculate_practice_metrics(
+            transfers, asid_counts, practices, asid_mapping, time_range, quality
+        )
+        national_metrics_data = calculate_national_metrics_data_from_asid_counts(
+            asid_counts, time_range
+        )
+        scenario_metrics_data = _calculate_sla_scenario_metrics(
+            args, transfers, practices, asid_mapping, time_range
+        )
+        organisation_metadata = construct_organisation_metadata(organisation_metadata)
+
+    with profiler.stage("output"):
+        _write_metrics_outputs(
+            args, practice_metrics_data, organisation_metadata, national_metrics_data
+        )
+        _write_parquet_output(
+            args,
+            convert_asid_counts_to_table(asid_counts),
+            ASID_COUNTS_FILE_NAME,
+            ASID_COUNTS_WRITER_PROFILE,
+        )
+        _write_sla_scenario_outputs(args, scenario_metrics_data)
+        _write_data_quality_output(
+            args, construct_data_quality_report(quality, year=args.year, month=args.month)
+        )
+        if transfers is not None:
+            _write_transfer_outputs(args, convert_transfers_to_table(transfers))
 
-    practice_metrics_file_name = "practiceMetrics.json"
-    organisation_metadata_file_name = "organisationMetadata.json"
-    national_metrics_file_name = "nationalMetrics.json"
-    transfers_file_name = "transfers.parquet"
 
+def _write_metrics_outputs(
+    args, practice_metrics_data, organisation_metadata, national_metrics_data
+):
     if _is_outputting_to_file(args):
-        _write_data_platform_json_file(
-            practice_metrics_data,
-            f"{args.output_directory}/{args.month}-{args.year}-{practice_metrics_file_name}",
+        _write_local_outputs(
+            args, practice_metrics_data, organisation_metadata, national_metrics_data
         )
-        _write_data_platform_json_file(
-            organisation_metadata,
-            f"{args.output_directory}/{args.month}-{args.year}-{organisation_metadata_file_name}",
+    elif _is_outputting_to_s3(args):
+        _upload_s3_outputs(
+            args, practice_metrics_data, organisation_metadata, national_metrics_data
         )
-        _write_data_platform_json_file(
-            national_metrics_data,
-            f"{args.output_directory}/{args.month}-{args.year}-{national_metrics_file_name}",
+
+
+def _write_parquet_output(args, table, file_name, profile):
+    if _is_outputting_to_file(args):
+        write_table_with_profile(
+            table, f"{args.output_directory}/{args.month}-{args.year}-{file_name}", profile
+        )
+    elif _is_outputting_to_s3(args):
+        write_table_with_profile(
+            table=table,
+            where=f"{args.output_bucket}/{_s3_path(args)}/{file_name}",
+            profile=profile,
+            filesystem=S3FileSystem(endpoint_override=args.s3_endpoint_url),
         )
-        write_table(
-            transfer_table,
-            f"{args.output_directory}/{args.month}-{args.year}-{transfers_file_name}",
+
+
+def _write_data_quality_output(args, data_quality_report):
+    logger.info("Data quality: %s", data_quality_report)
+    if _is_outputting_to_file(args):
+        _write_data_platform_json_file(
+            data_quality_report,
+            f"{args.output_directory}/{args.month}-{args.year}-{DATA_QUALITY_FILE_NAME}",
         )
     elif _is_outputting_to_s3(args):
         s3 = boto3.resource("s3", endpoint_url=args.s3_endpoint_url)
+        _upload_data_platform_json_object(
+            data_quality_report,
+            s3.Object(args.output_bucket, f"{_s3_path(args)}/{DATA_QUALITY_FILE_NAME}"),
+        )
 
-        bucket_name = args.output_bucket
-        version = "v2"
-        s3_path = f"{version}/{args.year}/{args.month}"
 
-        _upload_data_platform_json_object(
-            practice_metrics_data,
-            s3.Object(bucket_name, f"{s3_path}/{practice_metrics_file_name}"),
+def _write_transfer_outputs(args, transfer_table):
+    _write_parquet_output(
+        args, transfer_table, TRANSFERS_FILE_NAME, _get_transfer_writer_profile(args)
+    )
+    if args.output_transfers_dataset:
+        _write_transfers_dataset(args, transfer_table)
+
+
+def _write_local_sla_scenario_outputs(args, scenario_metrics_data):
+    for scenario_metrics in scenario_metrics_data:
+        file_prefix = f"{args.output_directory}/{args.month}-{args.year}-{scenario_metrics.name}"
+        _write_data_platform_json_file(
+            scenario_metrics.practice_metrics, f"{file_prefix}-{PRACTICE_METRICS_FILE_NAME}"
         )
-        _upload_data_platform_json_object(
-            organisation_metadata,
-            s3.Object(bucket_name, f"{s3_path}/{organisation_metadata_file_name}"),
+        _write_data_platform_json_file(
+            scenario_metrics.national_metrics, f"{file_prefix}-{NATIONAL_METRICS_FILE_NAME}"
         )
+
+
+def _upload_s3_sla_scenario_outputs(args, scenario_metrics_data):
+    s3 = boto3.resource("s3", endpoint_url=args.s3_endpoint_url)
+    for scenario_metrics in scenario_metrics_data:
+        key_prefix = f"{_s3_path(args)}/{SLA_SCENARIOS_PATH}/{scenario_metrics.name}"
         _upload_data_platform_json_object(
-            national_metrics_data,
-            s3.Object(bucket_name, f"{s3_path}/{national_metrics_file_name}"),
+            scenario_metrics.practice_metrics,
+            s3.Object(args.output_bucket, f"{key_prefix}/{PRACTICE_METRICS_FILE_NAME}"),
         )
-        write_table(
-            table=transfer_table,
-            where=bucket_name + "/" + f"{s3_path}/{transfers_file_name}",
-            filesystem=S3FileSystem(endpoint_override=args.s3_endpoint_url),
+        _upload_data_platform_json_object(
+            scenario_metrics.national_metrics,
+            s3.Object(args.output_bucket, f"{key_prefix}/{NATIONAL_METRICS_FILE_NAME}"),
         )
+
+
+def _write_sla_scenario_outputs(args, scenario_metrics_data):
+    if _is_outputting_to_file(args):
+        _write_local_sla_scenario_outputs(args, scenario_metrics_data)
+    elif _is_outputting_to_s3(args):
+        _upload_s3_sla_scenario_outputs(args, scenario_metrics_data)
+
+
+def _write_transfers_dataset(args, transfer_table):
+    filesystem, root_path = resolve_filesystem(args.output_transfers_dataset, args.s3_endpoint_url)
+    write_transfer_dataset(
+        transfer_table,
+        filesystem,
+        root_path,
+        year=args.year,
+        month=args.month,
+        partition_by_status=args.partition_transfers_by_status,
+        profile=_get_transfer_writer_profile(args),
+    )
+
+
+def _write_local_outputs(args, practice_metrics_data, organisation_metadata, national_metrics_data):
+    _write_data_platform_json_file(
+        practice_metrics_data,
+        f"{args.output_directory}/{args.month}-{args.year}-{PRACTICE_METRICS_FILE_NAME}",
+    )
+    _write_data_platform_json_file(
+        organisation_metadata,
+        f"{args.output_directory}/{args.month}-{args.year}-{ORGANISATION_METADATA_FILE_NAME}",
+    )
+    _write_data_platform_json_file(
+        national_metrics_data,
+        f"{args.output_directory}/{args.month}-{args.year}-{NATIONAL_METRICS_FILE_NAME}",
+    )
+
+
+def _upload_s3_outputs(args, practice_metrics_data, organisation_metadata, national_metrics_data):
+    s3 = boto3.resource("s3", endpoint_url=args.s3_endpoint_url)
+
+    bucket_name = args.output_bucket
+    s3_path = _s3_path(args)
+
+    _upload_data_platform_json_object(
+        practice_metrics_data,
+        s3.Object(bucket_name, f"{s3_path}/{PRACTICE_METRICS_FILE_NAME}"),
+    )
+    _upload_data_platform_json_object(
+        organisation_metadata,
+        s3.Object(bucket_name, f"{s3_path}/{ORGANISATION_METADATA_FILE_NAME}"),
+    )
+    _upload_data_platform_json_object(
+        national_metrics_data,
+        s3.Object(bucket_name, f"{s3_path}/{NATIONAL_METRICS_FILE_NAME}"),
+    )
+
+
+def _write_profile(args, profiler):
+    if _is_outputting_to_file(args):
+        profiler.write_file(f"{args.output_directory}/{args.month}-{args.year}-{PROFILE_FILE_NAME}")
+    elif _is_outputting_to_s3(args):
+        s3 = boto3.resource("s3", endpoint_url=args.s3_endpoint_url)
+        profiler.upload(s3.Object(args.output_bucket, f"{_s3_path(args)}/{PROFILE_FILE_NAME}"))
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    args = parse_platform_metrics_calculator_pipeline_arguments(sys.argv[1:])
+    profiler = StageProfiler(args.profile)
+
+    try:
+        with profiler.stage(WHOLE_RUN):
+            _run_pipeline(args, profiler)
+    finally:
+        if profiler.enabled:
+            _write_profile(args, profiler)
@@ -0,0 +1,33 @@
+from argparse import ArgumentParser
+
+
+def _list_str(values):
+    return values.split(",")
+
+
+def parse_spine_compaction_pipeline_arguments(argument_list):
+    parser = ArgumentParser(description="Spine data compaction pipeline")
+    parser.add_argument(
+        "--input-files",
+        type=_list_str,
+        required=True,
+        help="The spine data file(s) to compact. Separate files with ','.",
+    )
+    parser.add_argument(
+        "--output-dataset",
+        type=str,
+        required=True,
+        help="The local directory or s3://bucket/prefix of the Parquet dataset. \
+        Messages are merged into the existing date partitions, \
+        dropping those whose GUID is already in the partition.",
+    )
+    parser.add_argument(
+        "--s3-endpoint-url",
+        type=str,
+        required=False,
+        help="The endpoint used to upload output data (optional).",
+    )
+
+    args = parser.parse_args(argument_list)
+
+    return args
@@ -0,0 +1,17 @@
+import sys
+
+from prmdata.domain.spine.dataset import write_message_dataset
+from prmdata.domain.spine.message import SPLUNK_COLUMNS, construct_messages_from_splunk_items
+from prmdata.pipeline.spine_compaction.args import parse_spine_compaction_pipeline_arguments
+from prmdata.utils.io.parquet import resolve_filesystem
+from prmdata.utils.io.staged import read_csv_files_staged
+
+
+def main():
+    args = parse_spine_compaction_pipeline_arguments(sys.argv[1:])
+
+    items = read_csv_files_staged(args.input_files, columns=SPLUNK_COLUMNS)
+    messages = list(construct_messages_from_splunk_items(items))
+
+    filesystem, root_path = resolve_filesystem(args.output_dataset, args.s3_endpoint_url)
+    write_message_dataset(messages, filesystem, root_path)
@@ -0,0 +1,60 @@
+from array import array
+from hashlib import blake2b
+
+EMPTY_SLOT = 0
+DEFAULT_CAPACITY = 1 << 16
+
+
+def _fingerprint(key: str) -> int:
+    digest = blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+def _empty_slots(slot_count: int) -> array:
+    return array("Q", [EMPTY_SLOT]) * slot_count
+
+
+def _slot_count(capacity: int) -> int:
+    slot_count = 1
+    while slot_count < 2 * capacity:
+        slot_count <<= 1
+    return slot_count
+
+
+class FingerprintSet:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._slots = _empty_slots(_slot_count(capacity))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: str) -> bool:
+        fingerprint = _fingerprint(key)
+        return self._slots[self._find_slot(fingerprint)] == fingerprint
+
+    def _find_slot(self, fingerprint: int) -> int:
+        slots = self._slots
+        mask = len(slots) - 1
+        index = fingerprint & mask
+        while slots[index] != EMPTY_SLOT and slots[index] != fingerprint:
+            index = (index + 1) & mask
+        return index
+
+    def _grow(self):
+        old_slots = self._slots
+        self._slots = _empty_slots(2 * len(old_slots))
+        for fingerprint in old_slots:
+            if fingerprint != EMPTY_SLOT:
+                self._slots[self._find_slot(fingerprint)] = fingerprint
+
+    def add(self, key: str) -> bool:
+        fingerprint = _fingerprint(key)
+        index = self._find_slot(fingerprint)
+        if self._slots[index] == fingerprint:
+            return False
+        self._slots[index] = fingerprint
+        self._size += 1
+        if 2 * self._size > len(self._slots):
+            self._grow()
+        return True
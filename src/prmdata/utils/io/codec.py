@@ -0,0 +1,53 @@
+import gzip
+from pathlib import Path
+from typing import BinaryIO, Union
+
+import pyarrow as pa
+
+GZIP = "gzip"
+ZSTD = "zstd"
+UNCOMPRESSED = "uncompressed"
+
+_CODECS_BY_EXTENSION = {
+    ".gz": GZIP,
+    ".gzip": GZIP,
+    ".zst": ZSTD,
+    ".zstd": ZSTD,
+}
+
+_MAGIC_BYTES = {
+    GZIP: b"\x1f\x8b",
+    ZSTD: b"\x28\xb5\x2f\xfd",
+}
+
+
+def _detect_codec_from_magic_bytes(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        header = f.read(4)
+    for codec, magic_bytes in _MAGIC_BYTES.items():
+        if header.startswith(magic_bytes):
+            return codec
+    return UNCOMPRESSED
+
+
+def detect_codec(file_path: str) -> str:
+    codec = _CODECS_BY_EXTENSION.get(Path(file_path).suffix.lower())
+    if codec is not None:
+        return codec
+    return _detect_codec_from_magic_bytes(file_path)
+
+
+def open_decompressed(file_path: str) -> Union[gzip.GzipFile, BinaryIO]:
+    codec = detect_codec(file_path)
+    if codec == GZIP:
+        return gzip.open(file_path, "rb")
+    if codec == ZSTD:
+        return pa.input_stream(file_path, compression=ZSTD)
+    return open(file_path, "rb")
+
+
+def open_input_stream(file_path: str) -> pa.NativeFile:
+    codec = detect_codec(file_path)
+    if codec == UNCOMPRESSED:
+        return pa.memory_map(file_path)
+    return pa.input_stream(file_path, compression=codec)
@@ -1,6 +1,29 @@
 import csv
 import gzip
-from typing import Iterable, List
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO, TextIOWrapper
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pyarrow as pa
+from pyarrow.csv import ConvertOptions, ParseOptions, ReadOptions, open_csv, read_csv
+
+from prmdata.utils.io.codec import (
+    GZIP,
+    UNCOMPRESSED,
+    detect_codec,
+    open_decompressed,
+    open_input_stream,
+)
+from prmdata.utils.io.gzip_index import (
+    DEFAULT_SPAN,
+    load_or_build_gzip_index,
+    read_gzip_index_chunks,
+)
+
+UNCOMPRESSED_BLOCK_SIZE = 16 * 1024 * 1024
 
 
 def read_gzip_csv_file(file_path: str) -> Iterable[dict]:
@@ -12,3 +35,189 @@ def read_gzip_csv_file(file_path: str) -> Iterable[dict]:
 def read_gzip_csv_files(file_paths: List[str]) -> Iterable[dict]:
     for file_path in file_paths:
         yield from read_gzip_csv_file(file_path)
+
+
+def _projected_csv_options(columns: List[str], column_names: Optional[List[str]]) -> dict:
+    return {
+        "read_options": ReadOptions(column_names=column_names),
+        "parse_options": ParseOptions(newlines_in_values=True),
+        "convert_options": ConvertOptions(
+            include_columns=columns,
+            include_missing_columns=True,
+            column_types={column: pa.string() for column in columns},
+            strings_can_be_null=False,
+        ),
+    }
+
+
+def _batch_rows(batches: Iterable[pa.RecordBatch], columns: List[str]) -> Iterator[dict]:
+    for batch in batches:
+        column_values = [column.to_pylist() for column in batch.columns]
+        for values in zip(*column_values):
+            yield dict(zip(columns, values))
+
+
+def read_projected_csv(
+    source, columns: List[str], column_names: Optional[List[str]] = None
+) -> Iterator[dict]:
+    reader = open_csv(source, **_projected_csv_options(columns, column_names))
+    yield from _batch_rows(reader, columns)
+
+
+def _find_record_boundary(block: bytes) -> int:
+    position = block.rfind(b"\n")
+    while position != -1 and block.count(b'"', 0, position) % 2 != 0:
+        position = block.rfind(b"\n", 0, position)
+    return position + 1
+
+
+def _align_to_records(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    remainder = b""
+    for chunk in chunks:
+        block = remainder + chunk
+        boundary = _find_record_boundary(block)
+        remainder = block[boundary:]
+        if boundary > 0:
+            yield block[:boundary]
+    if remainder:
+        yield remainder
+
+
+def _build_irregular_row(fieldnames: List[str], values: List[str]) -> dict:
+    field_count = len(fieldnames)
+    value_count = len(values)
+    row: Dict[Optional[str], Any] = dict(zip(fieldnames, values))
+    if value_count > field_count:
+        row[None] = values[field_count:]
+    for fieldname in fieldnames[value_count:]:
+        row[fieldname] = None
+    return row
+
+
+def _parse_records(records: Iterator[List[str]], fieldnames: List[str]) -> Iterator[dict]:
+    field_count = len(fieldnames)
+    for values in records:
+        if len(values) == field_count:
+            yield dict(zip(fieldnames, values))
+        elif values:
+            yield _build_irregular_row(fieldnames, values)
+
+
+def _read_header(block: bytes) -> List[str]:
+    return next(csv.reader(StringIO(block.decode("utf-8"), newline="")))
+
+
+def _project_rows(rows: Iterable[dict], columns: List[str]) -> Iterator[dict]:
+    for row in rows:
+        yield {column: row.get(column) for column in columns}
+
+
+def _parse_irregular_projected_block(
+    block: bytes, columns: List[str], column_names: Optional[List[str]]
+) -> Iterator[dict]:
+    records = csv.reader(StringIO(block.decode("utf-8"), newline=""))
+    fieldnames = column_names if column_names is not None else next(records, None)
+    if fieldnames is None:
+        return iter(())
+    return _project_rows(_parse_records(records, fieldnames), columns)
+
+
+def _parse_projected_block(
+    block: bytes, columns: List[str], column_names: Optional[List[str]]
+) -> Iterator[dict]:
+    try:
+        table = read_csv(pa.py_buffer(block), **_projected_csv_options(columns, column_names))
+    except pa.ArrowInvalid:
+        return _parse_irregular_projected_block(block, columns, column_names)
+    return _batch_rows(table.to_batches(), columns)
+
+
+def _parse_projected_record_blocks(blocks: Iterable[bytes], columns: List[str]):
+    column_names = None
+    for block in blocks:
+        yield from _parse_projected_block(block, columns, column_names)
+        column_names = column_names or _read_header(block)
+
+
+def read_irregular_projected_csv_file(
+    file_path: str, columns: List[str], skip_rows: int = 0
+) -> Iterator[dict]:
+    with TextIOWrapper(open_decompressed(file_path), encoding="utf-8", newline="") as f:
+        yield from islice(_project_rows(csv.DictReader(f), columns), skip_rows, None)
+
+
+def _read_projected_csv_file(file_path: str, columns: List[str]) -> Iterator[dict]:
+    row_count = 0
+    try:
+        with open_input_stream(file_path) as stream:
+            for row in read_projected_csv(stream, columns):
+                yield row
+                row_count += 1
+    except pa.ArrowInvalid:
+        yield from read_irregular_projected_csv_file(file_path, columns, skip_rows=row_count)
+
+
+def _parse_record_blocks(
+    blocks: Iterable[bytes], columns: Optional[List[str]] = None
+) -> Iterator[dict]:
+    if columns is not None:
+        yield from _parse_projected_record_blocks(blocks, columns)
+        return
+    fieldnames = None
+    for block in blocks:
+        records = csv.reader(StringIO(block.decode("utf-8"), newline=""))
+        if fieldnames is None:
+            fieldnames = next(records, None)
+        if fieldnames is not None:
+            yield from _parse_records(records, fieldnames)
+
+
+def _read_memory_map_blocks(mapped: mmap.mmap, block_size: int) -> Iterator[bytes]:
+    for offset in range(0, len(mapped), block_size):
+        end = offset + block_size
+        yield mapped[offset:end]
+
+
+def read_uncompressed_csv_file(file_path: str) -> Iterator[dict]:
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            blocks = _read_memory_map_blocks(mapped, UNCOMPRESSED_BLOCK_SIZE)
+            yield from _parse_record_blocks(_align_to_records(blocks))
+
+
+def read_csv_file(file_path: str, columns: Optional[List[str]] = None) -> Iterator[dict]:
+    if columns is not None:
+        yield from _read_projected_csv_file(file_path, columns)
+        return
+    if detect_codec(file_path) == UNCOMPRESSED:
+        yield from read_uncompressed_csv_file(file_path)
+        return
+    with TextIOWrapper(open_decompressed(file_path), encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def read_csv_files(file_paths: List[str], columns: Optional[List[str]] = None) -> Iterator[dict]:
+    for file_path in file_paths:
+        yield from read_csv_file(file_path, columns)
+
+
+def _read_csv_file_parallel(file_path: str, executor, workers: int, columns, span: int):
+    if detect_codec(file_path) != GZIP:
+        yield from read_csv_file(file_path, columns)
+        return
+    index = load_or_build_gzip_index(file_path, span)
+    chunks = read_gzip_index_chunks(file_path, index, executor, prefetch=2 * workers)
+    yield from _parse_record_blocks(_align_to_records(chunks), columns)
+
+
+def read_csv_files_parallel(
+    file_paths: List[str],
+    workers: int,
+    columns: Optional[List[str]] = None,
+    span: int = DEFAULT_SPAN,
+) -> Iterable[dict]:
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for file_path in file_paths:
+            yield from _read_csv_file_parallel(file_path, executor, workers, columns, span)
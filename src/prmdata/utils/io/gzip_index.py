@@ -0,0 +1,337 @@
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Executor
+from ctypes import (
+    CDLL,
+    Structure,
+    addressof,
+    byref,
+    c_char,
+    c_char_p,
+    c_int,
+    c_uint,
+    c_ulong,
+    c_void_p,
+    create_string_buffer,
+    sizeof,
+)
+from ctypes.util import find_library
+from functools import lru_cache
+from itertools import islice
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional
+
+DEFAULT_SPAN = 16 * 1024 * 1024
+INDEX_FILE_SUFFIX = ".gzidx"
+
+_WINDOW_SIZE = 32 * 1024
+_INPUT_CHUNK_SIZE = 64 * 1024
+_GZIP_WINDOW_BITS = 15 + 16
+_RAW_WINDOW_BITS = -15
+
+_Z_OK = 0
+_Z_STREAM_END = 1
+_Z_NO_FLUSH = 0
+_Z_BLOCK = 5
+_Z_ERRORS = {2: "dictionary needed", -3: "data error", -4: "out of memory"}
+_END_OF_BLOCK = 128
+_LAST_BLOCK = 64
+_UNUSED_BITS_MASK = 7
+
+_INDEX_MAGIC = b"PRMGZIX1"
+_INDEX_HEADER = struct.Struct("<8sQQQI")
+_ACCESS_POINT_HEADER = struct.Struct("<QQBI")
+
+
+class GzipIndexError(Exception):
+    pass
+
+
+class GzipAccessPoint(NamedTuple):
+    output_offset: int
+    input_offset: int
+    bits: int
+    window: bytes
+
+
+class GzipIndex(NamedTuple):
+    file_size: int
+    file_mtime_ns: int
+    uncompressed_size: int
+    access_points: List[GzipAccessPoint]
+
+
+class _ZStream(Structure):
+    _fields_ = [
+        ("next_in", c_void_p),
+        ("avail_in", c_uint),
+        ("total_in", c_ulong),
+        ("next_out", c_void_p),
+        ("avail_out", c_uint),
+        ("total_out", c_ulong),
+        ("msg", c_char_p),
+        ("state", c_void_p),
+        ("zalloc", c_void_p),
+        ("zfree", c_void_p),
+        ("opaque", c_void_p),
+        ("data_type", c_int),
+        ("adler", c_ulong),
+        ("reserved", c_ulong),
+    ]
+
+
+@lru_cache(maxsize=None)
+def _load_zlib_library() -> CDLL:
+    library_name = find_library("z")
+    if library_name is None:
+        raise GzipIndexError("Building a gzip index requires the zlib shared library")
+    library = CDLL(library_name)
+    library.zlibVersion.restype = c_char_p
+    return library
+
+
+class _GzipIndexBuilder:
+    def __init__(self, library: CDLL, file: BinaryIO, span: int):
+        self._library = library
+        self._file = file
+        self._span = span
+        self._stream = _ZStream()
+        self._input = create_string_buffer(_INPUT_CHUNK_SIZE)
+        self._window = create_string_buffer(_WINDOW_SIZE)
+        self._total_in = 0
+        self._total_out = 0
+        self._last_point_output_offset = 0
+        self._access_points: List[GzipAccessPoint] = []
+
+    def _inflate_block(self) -> int:
+        stream = self._stream
+        if stream.avail_out == 0:
+            stream.avail_out = _WINDOW_SIZE
+            stream.next_out = addressof(self._window)
+        self._total_in += stream.avail_in
+        self._total_out += stream.avail_out
+        result = self._library.inflate(byref(stream), _Z_BLOCK)
+        self._total_in -= stream.avail_in
+        self._total_out -= stream.avail_out
+        if result in _Z_ERRORS:
+            raise GzipIndexError(f"Unable to inflate gzip file: {_Z_ERRORS[result]}")
+        return result
+
+    def _is_access_point(self) -> bool:
+        data_type = self._stream.data_type
+        at_block_boundary = data_type & _END_OF_BLOCK and not data_type & _LAST_BLOCK
+        spanned = self._total_out - self._last_point_output_offset > self._span
+        return at_block_boundary and (self._total_out == 0 or spanned)
+
+    def _window_contents(self) -> bytes:
+        written = _WINDOW_SIZE - self._stream.avail_out
+        if self._total_out < _WINDOW_SIZE:
+            return self._window.raw[:written]
+        return self._window.raw[written:] + self._window.raw[:written]
+
+    def _add_access_point(self):
+        self._access_points.append(
+            GzipAccessPoint(
+                output_offset=self._total_out,
+                input_offset=self._total_in,
+                bits=self._stream.data_type & _UNUSED_BITS_MASK,
+                window=self._window_contents(),
+            )
+        )
+        self._last_point_output_offset = self._total_out
+
+    def _inflate_input(self) -> int:
+        result = self._inflate_block()
+        while result != _Z_STREAM_END:
+            if self._is_access_point():
+                self._add_access_point()
+            if self._stream.avail_in == 0:
+                break
+            result = self._inflate_block()
+        return result
+
+    def _read_input(self):
+        input_size = self._file.readinto(self._input)
+        if input_size == 0:
+            raise GzipIndexError("Unexpected end of gzip file")
+        self._stream.avail_in = input_size
+        self._stream.next_in = addressof(self._input)
+
+    def _inflate_file(self):
+        result = _Z_OK
+        while result != _Z_STREAM_END:
+            self._read_input()
+            result = self._inflate_input()
+        if self._stream.avail_in > 0 or self._file.read(1):
+            raise GzipIndexError("Gzip files with more than one member cannot be indexed")
+
+    def build(self) -> List[GzipAccessPoint]:
+        stream = byref(self._stream)
+        version = self._library.zlibVersion()
+        if self._library.inflateInit2_(stream, _GZIP_WINDOW_BITS, version, sizeof(_ZStream)):
+            raise GzipIndexError("Unable to initialise zlib")
+        try:
+            self._inflate_file()
+        finally:
+            self._library.inflateEnd(stream)
+        return self._access_points
+
+    @property
+    def uncompressed_size(self) -> int:
+        return self._total_out
+
+
+def build_gzip_index(file_path: str, span: int = DEFAULT_SPAN) -> GzipIndex:
+    library = _load_zlib_library()
+    stat = os.stat(file_path)
+    with open(file_path, "rb") as file:
+        builder = _GzipIndexBuilder(library, file, span)
+        access_points = builder.build()
+    return GzipIndex(
+        file_size=stat.st_size,
+        file_mtime_ns=stat.st_mtime_ns,
+        uncompressed_size=builder.uncompressed_size,
+        access_points=access_points,
+    )
+
+
+def write_gzip_index(index: GzipIndex, index_file_path: str):
+    with open(index_file_path, "wb") as file:
+        file.write(
+            _INDEX_HEADER.pack(
+                _INDEX_MAGIC,
+                index.file_size,
+                index.file_mtime_ns,
+                index.uncompressed_size,
+                len(index.access_points),
+            )
+        )
+        for point in index.access_points:
+            window = zlib.compress(point.window)
+            file.write(
+                _ACCESS_POINT_HEADER.pack(
+                    point.output_offset, point.input_offset, point.bits, len(window)
+                )
+            )
+            file.write(window)
+
+
+def _read_access_point(file: BinaryIO) -> GzipAccessPoint:
+    output_offset, input_offset, bits, window_size = _ACCESS_POINT_HEADER.unpack(
+        file.read(_ACCESS_POINT_HEADER.size)
+    )
+    window = zlib.decompress(file.read(window_size))
+    return GzipAccessPoint(output_offset, input_offset, bits, window)
+
+
+def read_gzip_index(index_file_path: str) -> GzipIndex:
+    with open(index_file_path, "rb") as file:
+        magic, file_size, file_mtime_ns, uncompressed_size, point_count = _INDEX_HEADER.unpack(
+            file.read(_INDEX_HEADER.size)
+        )
+        if magic != _INDEX_MAGIC:
+            raise GzipIndexError(f"{index_file_path} is not a gzip index")
+        access_points = [_read_access_point(file) for _ in range(point_count)]
+    return GzipIndex(file_size, file_mtime_ns, uncompressed_size, access_points)
+
+
+def _is_index_of(index: GzipIndex, file_path: str) -> bool:
+    stat = os.stat(file_path)
+    return index.file_size == stat.st_size and index.file_mtime_ns == stat.st_mtime_ns
+
+
+def _read_cached_gzip_index(index_file_path: str, file_path: str) -> Optional[GzipIndex]:
+    try:
+        index = read_gzip_index(index_file_path)
+    except (OSError, GzipIndexError, struct.error, zlib.error):
+        return None
+    return index if _is_index_of(index, file_path) else None
+
+
+def load_or_build_gzip_index(file_path: str, span: int = DEFAULT_SPAN) -> GzipIndex:
+    index_file_path = f"{file_path}{INDEX_FILE_SUFFIX}"
+    index = _read_cached_gzip_index(index_file_path, file_path)
+    if index is None:
+        index = build_gzip_index(file_path, span)
+        try:
+            write_gzip_index(index, index_file_path)
+        except OSError:
+            pass
+    return index
+
+
+def _read_compressed_range(file_path: str, start: GzipAccessPoint, end_offset: Optional[int]):
+    with open(file_path, "rb") as file:
+        file.seek(start.input_offset - 1 if start.bits else start.input_offset)
+        size = -1 if end_offset is None else end_offset - file.tell() + 1
+        return file.read(size)
+
+
+def _prime_inflater(library: CDLL, stream: _ZStream, start: GzipAccessPoint, compressed: bytes):
+    if start.bits:
+        bits = compressed[0] >> (8 - start.bits)
+        if library.inflatePrime(byref(stream), start.bits, bits) != _Z_OK:
+            raise GzipIndexError("Unable to prime zlib at a gzip index access point")
+    if start.window:
+        if library.inflateSetDictionary(byref(stream), start.window, len(start.window)) != _Z_OK:
+            raise GzipIndexError("Unable to set the window of a gzip index access point")
+
+
+def _inflate_range(start: GzipAccessPoint, compressed: bytes, output_size: int) -> bytes:
+    library = _load_zlib_library()
+    stream = _ZStream()
+    input_offset = 1 if start.bits else 0
+    input_buffer = (c_char * (len(compressed) - input_offset)).from_buffer_copy(
+        compressed, input_offset
+    )
+    output = create_string_buffer(output_size)
+    version = library.zlibVersion()
+    if library.inflateInit2_(byref(stream), _RAW_WINDOW_BITS, version, sizeof(_ZStream)):
+        raise GzipIndexError("Unable to initialise zlib")
+    try:
+        _prime_inflater(library, stream, start, compressed)
+        stream.next_in = addressof(input_buffer)
+        stream.avail_in = len(input_buffer)
+        stream.next_out = addressof(output)
+        stream.avail_out = output_size
+        result = library.inflate(byref(stream), _Z_NO_FLUSH)
+    finally:
+        library.inflateEnd(byref(stream))
+    if result not in (_Z_OK, _Z_STREAM_END):
+        return b""
+    return output.raw[: output_size - stream.avail_out]
+
+
+def read_gzip_index_chunk(file_path: str, index: GzipIndex, chunk_number: int) -> bytes:
+    access_points = index.access_points
+    start = access_points[chunk_number]
+    if chunk_number + 1 < len(access_points):
+        end = access_points[chunk_number + 1]
+        end_offset, output_size = end.input_offset, end.output_offset - start.output_offset
+    else:
+        end_offset, output_size = None, index.uncompressed_size - start.output_offset
+    if output_size == 0:
+        return b""
+
+    compressed = _read_compressed_range(file_path, start, end_offset)
+    output = _inflate_range(start, compressed, output_size)
+    if len(output) != output_size:
+        raise GzipIndexError(f"Gzip index of {file_path} does not match its contents")
+    return output
+
+
+def read_gzip_index_chunks(
+    file_path: str, index: GzipIndex, executor: Executor, prefetch: int
+) -> Iterator[bytes]:
+    chunk_numbers = iter(range(len(index.access_points)))
+
+    def submit(numbers):
+        return [executor.submit(read_gzip_index_chunk, file_path, index, n) for n in numbers]
+
+    pending = deque(submit(islice(chunk_numbers, prefetch)))
+    while pending:
+        chunk = pending.popleft().result()
+        pending.extend(submit(islice(chunk_numbers, 1)))
+        if chunk:
+            yield chunk
@@ -0,0 +1,163 @@
+import json
+import os
+import time
+from datetime import timedelta
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from typing import Callable, NamedTuple, Optional, Union
+from uuid import uuid4
+
+from requests import Request, Response, Session
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_second: float, clock=time.monotonic, sleep=time.sleep):
+        self._interval = 1 / requests_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = Lock()
+        self._next_slot = clock()
+
+    def wait(self):
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            self._sleep(slot - now)
+
+
+def build_http_session(
+    max_connections: int, max_retries: int, backoff_factor: float = 0.5
+) -> Session:
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=max_connections, pool_block=True, max_retries=retry
+    )
+    session = Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class CachedResponse(NamedTuple):
+    content: bytes
+    headers: CaseInsensitiveDict
+    fetched_at: float
+    status_code: int = 200
+
+
+HttpResponse = Union[Response, CachedResponse]
+
+
+def build_request_url(url: str, params: dict) -> str:
+    request_url = Request("GET", url, params=params).prepare().url
+    if request_url is None:
+        raise ValueError(f"Unable to build a request URL from {url}")
+    return request_url
+
+
+class HttpResponseCache:
+    def __init__(self, directory: str, ttl: timedelta, max_age: timedelta, clock=time.time):
+        self._directory = Path(directory)
+        self._ttl = ttl.total_seconds()
+        self._max_age = max_age.total_seconds()
+        self._clock = clock
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, url: str) -> Path:
+        return self._directory / sha256(url.encode("utf-8")).hexdigest()
+
+    def _read(self, url: str) -> Optional[CachedResponse]:
+        entry_path = self._entry_path(url)
+        try:
+            metadata = json.loads(entry_path.with_suffix(".json").read_text())
+            content = entry_path.with_suffix(".body").read_bytes()
+        except FileNotFoundError:
+            return None
+        return CachedResponse(
+            content=content,
+            headers=CaseInsensitiveDict(metadata["headers"]),
+            fetched_at=metadata["fetched_at"],
+        )
+
+    def _write(self, url: str, response: CachedResponse):
+        entry_path = self._entry_path(url)
+        metadata = {"headers": dict(response.headers), "fetched_at": response.fetched_at}
+        _write_atomically(entry_path.with_suffix(".body"), response.content)
+        _write_atomically(entry_path.with_suffix(".json"), json.dumps(metadata).encode("utf-8"))
+
+    def _is_expired(self, fetched_at: float) -> bool:
+        return self._clock() - fetched_at > self._max_age
+
+    def _is_fresh(self, response: CachedResponse, not_before: Optional[float]) -> bool:
+        if not_before is not None and response.fetched_at < not_before:
+            return False
+        return self._clock() - response.fetched_at <= self._ttl
+
+    def _read_unexpired(self, url: str) -> Optional[CachedResponse]:
+        cached = self._read(url)
+        if cached is None or self._is_expired(cached.fetched_at):
+            return None
+        return cached
+
+    def _refresh(self, cached: Optional[CachedResponse], response: Response) -> CachedResponse:
+        if cached is not None and response.status_code == 304:
+            headers = CaseInsensitiveDict(cached.headers)
+            headers.update(response.headers)
+            return CachedResponse(cached.content, headers, fetched_at=self._clock())
+        return CachedResponse(
+            response.content, CaseInsensitiveDict(response.headers), fetched_at=self._clock()
+        )
+
+    def get(
+        self, url: str, fetch: Callable[[dict], Response], not_before: Optional[float] = None
+    ) -> HttpResponse:
+        cached = self._read_unexpired(url)
+        if cached is not None and self._is_fresh(cached, not_before):
+            return cached
+
+        response = fetch(_conditional_headers(cached))
+        if not _is_reusable(cached, response):
+            return response
+
+        refreshed = self._refresh(cached, response)
+        self._write(url, refreshed)
+        return refreshed
+
+    def evict_expired(self):
+        for metadata_path in self._directory.glob("*.json"):
+            metadata = json.loads(metadata_path.read_text())
+            if self._is_expired(metadata["fetched_at"]):
+                metadata_path.unlink()
+                metadata_path.with_suffix(".body").unlink(missing_ok=True)
+
+
+def _is_reusable(cached: Optional[CachedResponse], response: Response) -> bool:
+    return response.status_code == 200 or (cached is not None and response.status_code == 304)
+
+
+def _conditional_headers(cached: Optional[CachedResponse]) -> dict:
+    if cached is None:
+        return {}
+    validators = {
+        "If-None-Match": cached.headers.get("ETag"),
+        "If-Modified-Since": cached.headers.get("Last-Modified"),
+    }
+    return {name: value for name, value in validators.items() if value is not None}
+
+
+def _write_atomically(path: Path, content: bytes):
+    temporary_path = path.with_name(f"{path.name}.{uuid4().hex}.tmp")
+    temporary_path.write_bytes(content)
+    os.replace(temporary_path, path)
@@ -0,0 +1,147 @@
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import uuid4
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import Schema, Table
+from pyarrow.fs import FileSystem, FileType, LocalFileSystem, S3FileSystem
+
+S3_SCHEME = "s3://"
+PART_FILE_NAME = "part-0.parquet"
+STAGING_PREFIX = "_staging-"
+
+
+class ParquetWriterProfile(NamedTuple):
+    compression: str = "snappy"
+    row_group_size: Optional[int] = None
+    sort_keys: Sequence[Tuple[str, str]] = ()
+    dictionary_columns: Optional[Sequence[str]] = None
+    write_statistics: bool = True
+    write_page_index: bool = False
+
+
+DEFAULT_WRITER_PROFILE = ParquetWriterProfile()
+
+
+def _writer_options(profile: ParquetWriterProfile) -> dict:
+    options = {
+        "compression": profile.compression,
+        "row_group_size": profile.row_group_size,
+        "use_dictionary": (
+            True if profile.dictionary_columns is None else list(profile.dictionary_columns)
+        ),
+        "write_statistics": profile.write_statistics,
+    }
+    if profile.write_page_index:
+        options["write_page_index"] = True
+    return options
+
+
+def write_table_with_profile(
+    table: Table,
+    where: str,
+    profile: ParquetWriterProfile = DEFAULT_WRITER_PROFILE,
+    filesystem: Optional[FileSystem] = None,
+):
+    if profile.sort_keys:
+        table = table.take(pc.sort_indices(table, sort_keys=list(profile.sort_keys)))
+    pq.write_table(table, where, filesystem=filesystem, **_writer_options(profile))
+
+
+def resolve_filesystem(path: str, s3_endpoint_url: Optional[str] = None) -> Tuple[FileSystem, str]:
+    if path.startswith(S3_SCHEME):
+        return S3FileSystem(endpoint_override=s3_endpoint_url), path.replace(S3_SCHEME, "", 1)
+    return LocalFileSystem(), os.path.abspath(path)
+
+
+def _parent_path(path: str) -> str:
+    return path.rsplit("/", 1)[0]
+
+
+def _write_file(
+    table: Table, filesystem: FileSystem, file_path: str, profile: ParquetWriterProfile
+):
+    filesystem.create_dir(_parent_path(file_path), recursive=True)
+    write_table_with_profile(table, file_path, profile, filesystem)
+
+
+def replace_directory(
+    filesystem: FileSystem,
+    directory_path: str,
+    files: Dict[str, Table],
+    profile: ParquetWriterProfile = DEFAULT_WRITER_PROFILE,
+):
+    parent_path, directory_name = directory_path.rsplit("/", 1)
+    staging_path = f"{parent_path}/{STAGING_PREFIX}{directory_name}-{uuid4().hex}"
+    for relative_path, table in files.items():
+        _write_file(table, filesystem, f"{staging_path}/{relative_path}", profile)
+
+    if filesystem.get_file_info(directory_path).type != FileType.NotFound:
+        filesystem.delete_dir(directory_path)
+    for relative_path in files:
+        target_path = f"{directory_path}/{relative_path}"
+        filesystem.create_dir(_parent_path(target_path), recursive=True)
+        filesystem.move(f"{staging_path}/{relative_path}", target_path)
+    filesystem.delete_dir(staging_path)
+
+
+def _select_partition(table: Table, partition_column: str, value) -> Table:
+    partition = table.filter(pc.equal(table[partition_column], value))
+    return partition.remove_column(partition.schema.get_field_index(partition_column))
+
+
+def _read_directory(filesystem: FileSystem, directory_path: str) -> Optional[Table]:
+    if filesystem.get_file_info(directory_path).type == FileType.NotFound:
+        return None
+    return ds.dataset(directory_path, format="parquet", filesystem=filesystem).to_table()
+
+
+def _first_occurrence_indices(values: list) -> List[int]:
+    seen = set()
+    indices = []
+    for index, value in enumerate(values):
+        if value not in seen:
+            seen.add(value)
+            indices.append(index)
+    return indices
+
+
+def _merge_partition(existing: Optional[Table], partition: Table, unique_column: str) -> Table:
+    if existing is not None:
+        partition = pa.concat_tables([existing.cast(partition.schema), partition])
+    return partition.take(_first_occurrence_indices(partition[unique_column].to_pylist()))
+
+
+def write_partitioned_table(
+    table: Table,
+    filesystem: FileSystem,
+    root_path: str,
+    partition_column: str,
+    unique_column: str,
+    sort_keys: List[Tuple[str, str]],
+    dictionary_columns: List[str],
+):
+    profile = ParquetWriterProfile(sort_keys=sort_keys, dictionary_columns=dictionary_columns)
+    for value in pc.unique(table[partition_column]).to_pylist():
+        directory_path = f"{root_path}/{partition_column}={value.isoformat()}"
+        partition = _merge_partition(
+            _read_directory(filesystem, directory_path),
+            _select_partition(table, partition_column, value),
+            unique_column,
+        )
+        replace_directory(filesystem, directory_path, {PART_FILE_NAME: partition}, profile)
+
+
+def read_partitioned_table(
+    filesystem: FileSystem, root_path: str, partition_schema: Schema, filter_expression
+) -> Table:
+    dataset = ds.dataset(
+        root_path,
+        format="parquet",
+        filesystem=filesystem,
+        partitioning=ds.partitioning(partition_schema, flavor="hive"),
+    )
+    return dataset.to_table(filter=filter_expression)
@@ -0,0 +1,179 @@
+import csv
+from dataclasses import dataclass, field
+from io import BufferedReader, RawIOBase, TextIOWrapper
+from queue import Full, Queue
+from threading import Event, Thread
+from time import perf_counter
+from typing import Iterator, List, Optional
+
+from pyarrow import ArrowInvalid, PythonFile
+
+from prmdata.utils.io.codec import UNCOMPRESSED, detect_codec, open_decompressed
+from prmdata.utils.io.csv import (
+    read_csv_file,
+    read_irregular_projected_csv_file,
+    read_projected_csv,
+)
+
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_END_OF_FILE = object()
+_PUT_TIMEOUT_SECONDS = 0.1
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    item_count: int = 0
+    busy_seconds: float = 0.0
+    waiting_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        if self.busy_seconds == 0:
+            return 0.0
+        return self.item_count / self.busy_seconds
+
+
+@dataclass
+class StagedReadMetrics:
+    decompress: StageMetrics = field(default_factory=lambda: StageMetrics("decompress"))
+    parse: StageMetrics = field(default_factory=lambda: StageMetrics("parse"))
+
+
+class _ChunkProducer:
+    def __init__(self, chunks: Queue, stop: Event, chunk_size: int, metrics: StageMetrics):
+        self._chunks = chunks
+        self._stop = stop
+        self._chunk_size = chunk_size
+        self._metrics = metrics
+
+    def _put(self, item):
+        start = perf_counter()
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=_PUT_TIMEOUT_SECONDS)
+                break
+            except Full:
+                continue
+        self._metrics.waiting_seconds += perf_counter() - start
+
+    def _read_chunk(self, file) -> bytes:
+        start = perf_counter()
+        chunk = file.read(self._chunk_size)
+        self._metrics.busy_seconds += perf_counter() - start
+        self._metrics.item_count += len(chunk)
+        return chunk
+
+    def _decompress_file(self, file_path: str):
+        with open_decompressed(file_path) as file:
+            chunk = self._read_chunk(file)
+            while chunk and not self._stop.is_set():
+                self._put(chunk)
+                chunk = self._read_chunk(file)
+        self._put(_END_OF_FILE)
+
+    def run(self, file_paths: List[str]):
+        try:
+            for file_path in file_paths:
+                if detect_codec(file_path) != UNCOMPRESSED:
+                    self._decompress_file(file_path)
+        except Exception as exception:
+            self._put(exception)
+
+
+class _QueueReader(RawIOBase):
+    def __init__(self, chunks: Queue, metrics: StageMetrics):
+        self._chunks = chunks
+        self._metrics = metrics
+        self._buffer = memoryview(b"")
+        self._end_of_file = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _next_chunk(self):
+        start = perf_counter()
+        item = self._chunks.get()
+        self._metrics.waiting_seconds += perf_counter() - start
+        if item is _END_OF_FILE:
+            self._end_of_file = True
+        elif isinstance(item, Exception):
+            raise item
+        else:
+            self._buffer = memoryview(item)
+
+    def skip_to_end_of_file(self):
+        self._buffer = memoryview(b"")
+        while not self._end_of_file:
+            self._next_chunk()
+
+    def readinto(self, buffer) -> int:
+        if len(self._buffer) == 0 and not self._end_of_file:
+            self._next_chunk()
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def _read_queued_projected_csv_rows(
+    file_path: str, raw_reader: _QueueReader, columns: List[str]
+) -> Iterator[dict]:
+    row_count = 0
+    try:
+        with PythonFile(BufferedReader(raw_reader), mode="r") as f:
+            for row in read_projected_csv(f, columns):
+                yield row
+                row_count += 1
+    except ArrowInvalid:
+        raw_reader.skip_to_end_of_file()
+        yield from read_irregular_projected_csv_file(file_path, columns, skip_rows=row_count)
+
+
+def _read_queued_csv_rows(
+    file_path: str, chunks: Queue, metrics: StageMetrics, columns: Optional[List[str]]
+) -> Iterator[dict]:
+    raw_reader = _QueueReader(chunks, metrics)
+    if columns is not None:
+        yield from _read_queued_projected_csv_rows(file_path, raw_reader, columns)
+        return
+    with TextIOWrapper(BufferedReader(raw_reader), encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def _read_csv_rows(
+    file_path: str, chunks: Queue, metrics: StageMetrics, columns: Optional[List[str]]
+) -> Iterator[dict]:
+    if detect_codec(file_path) == UNCOMPRESSED:
+        rows = read_csv_file(file_path, columns)
+    else:
+        rows = _read_queued_csv_rows(file_path, chunks, metrics, columns)
+    for row in rows:
+        metrics.item_count += 1
+        yield row
+
+
+def read_csv_files_staged(
+    file_paths: List[str],
+    metrics: Optional[StagedReadMetrics] = None,
+    columns: Optional[List[str]] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[dict]:
+    metrics = metrics if metrics is not None else StagedReadMetrics()
+    chunks: Queue = Queue(maxsize=queue_size)
+    stop = Event()
+    producer = _ChunkProducer(chunks, stop, chunk_size, metrics.decompress)
+    thread = Thread(target=producer.run, args=(file_paths,), daemon=True)
+
+    thread.start()
+    started = perf_counter()
+    try:
+        for file_path in file_paths:
+            yield from _read_csv_rows(file_path, chunks, metrics.parse, columns)
+    finally:
+        stop.set()
+        thread.join()
+        metrics.parse.busy_seconds = perf_counter() - started - metrics.parse.waiting_seconds
@@ -0,0 +1,45 @@
+import marshal
+from contextlib import contextmanager
+from cProfile import Profile
+from pathlib import Path
+from typing import Iterable, Optional
+
+WHOLE_RUN = "main"
+PROFILED_STAGES = [WHOLE_RUN, "transfers", "metrics", "output"]
+
+
+class StageProfiler:
+    def __init__(self, stages: Optional[Iterable[str]]):
+        self._stages = set(stages) if stages is not None else set()
+        self._profile = Profile()
+        self._depth = 0
+
+    @property
+    def enabled(self) -> bool:
+        return len(self._stages) > 0
+
+    @contextmanager
+    def stage(self, name: str):
+        if name not in self._stages:
+            yield
+            return
+
+        if self._depth == 0:
+            self._profile.enable()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._profile.disable()
+
+    def to_bytes(self) -> bytes:
+        self._profile.create_stats()
+        return marshal.dumps(self._profile.stats)
+
+    def write_file(self, file_path: str):
+        Path(file_path).write_bytes(self.to_bytes())
+
+    def upload(self, s3_object):
+        s3_object.put(Body=self.to_bytes(), ContentType="application/octet-stream")
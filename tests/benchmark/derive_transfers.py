@@ -0,0 +1,69 @@
+import random
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+
+from prmdata.domain.gp2gp.transfer import derive_transfers
+from prmdata.domain.spine.conversation import group_into_conversations
+from prmdata.domain.spine.message import construct_messages_from_splunk_items
+from prmdata.domain.spine.parsed_conversation import ConversationMissingStart, parse_conversation
+from tests.benchmark.spine_data import SpineDataProfile, build_practices, generate_spine_items
+
+
+def _parse_benchmark_arguments(argument_list):
+    parser = ArgumentParser(description="Microbenchmark of transfer derivation")
+    parser.add_argument("--conversations", type=int, default=20000)
+    parser.add_argument("--max-fragments", type=int, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=2020)
+    return parser.parse_args(argument_list)
+
+
+def _build_parsed_conversations(args):
+    profile = SpineDataProfile(
+        year=2019,
+        month=12,
+        conversation_count=args.conversations,
+        practice_count=100,
+        error_rate=args.error_rate,
+        pending_rate=0.05,
+        out_of_order_rate=0,
+        max_fragment_count=args.max_fragments,
+    )
+    items = generate_spine_items(profile, build_practices(profile.practice_count))
+    conversations = group_into_conversations(construct_messages_from_splunk_items(items))
+    parsed = []
+    for conversation in conversations:
+        try:
+            parsed.append(parse_conversation(conversation))
+        except ConversationMissingStart:
+            pass
+    return parsed
+
+
+def _time_derivation(parsed_conversations) -> float:
+    start = perf_counter()
+    for _ in derive_transfers(parsed_conversations):
+        pass
+    return perf_counter() - start
+
+
+def main():
+    args = _parse_benchmark_arguments(sys.argv[1:])
+    random.seed(args.seed)
+    parsed_conversations = _build_parsed_conversations(args)
+
+    timings = [_time_derivation(parsed_conversations) for _ in range(args.repeat)]
+    best = min(timings)
+    conversation_count = len(parsed_conversations)
+
+    sys.stdout.write(
+        f"derive_transfers: {conversation_count:,} conversations, best of {args.repeat}: "
+        f"{best:.3f}s, {best / conversation_count * 1e6:.2f} us per conversation, "
+        f"{conversation_count / best:,.0f} conversations/sec\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
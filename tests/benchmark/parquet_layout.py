@@ -0,0 +1,114 @@
+import random
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from prmdata.domain.gp2gp.transfer import (
+    TRANSFER_WRITER_PROFILE,
+    convert_transfers_to_table,
+    derive_transfers,
+)
+from prmdata.domain.spine.conversation import group_into_conversations
+from prmdata.domain.spine.message import construct_messages_from_splunk_items
+from prmdata.domain.spine.parsed_conversation import ConversationMissingStart, parse_conversation
+from prmdata.utils.io.parquet import ParquetWriterProfile, write_table_with_profile
+from tests.benchmark.spine_data import SpineDataProfile, build_practices, generate_spine_items
+
+WRITER_PROFILES = {
+    "pyarrow defaults": ParquetWriterProfile(),
+    "transfers": TRANSFER_WRITER_PROFILE,
+    "transfers, zstd": TRANSFER_WRITER_PROFILE._replace(compression="zstd"),
+}
+
+
+def _parse_benchmark_arguments(argument_list):
+    parser = ArgumentParser(description="File size and scan times of transfers Parquet layouts")
+    parser.add_argument("--conversations", type=int, default=200000)
+    parser.add_argument("--practices", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=2020)
+    return parser.parse_args(argument_list)
+
+
+def _build_transfer_table(args):
+    profile = SpineDataProfile(
+        year=2019,
+        month=12,
+        conversation_count=args.conversations,
+        practice_count=args.practices,
+        error_rate=0.05,
+        pending_rate=0.05,
+        out_of_order_rate=0,
+        max_fragment_count=4,
+    )
+    items = generate_spine_items(profile, build_practices(profile.practice_count))
+    parsed = []
+    for conversation in group_into_conversations(construct_messages_from_splunk_items(items)):
+        try:
+            parsed.append(parse_conversation(conversation))
+        except ConversationMissingStart:
+            pass
+    return convert_transfers_to_table(list(derive_transfers(parsed)))
+
+
+def _scan_filters():
+    day_start = datetime(2019, 12, 16)
+    timestamp_type = pa.timestamp("us")
+    date_requested = ds.field("date_requested")
+    return {
+        "full scan": None,
+        "one day": (date_requested >= pa.scalar(day_start, type=timestamp_type))
+        & (date_requested < pa.scalar(day_start + timedelta(days=1), type=timestamp_type)),
+        "failed": ds.field("status") == "FAILED",
+    }
+
+
+def _best_scan_seconds(file_path: str, scan_filter, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        ds.dataset(file_path, format="parquet").to_table(filter=scan_filter)
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+def _write_header(scan_filters):
+    columns = "".join(f"{name:>12}" for name in scan_filters)
+    sys.stdout.write(f"{'profile':<20}{'size':>12}{'row groups':>12}{columns}\n")
+
+
+def _write_row(name, file_path, scan_seconds):
+    dataset = ds.dataset(file_path, format="parquet")
+    row_group_count = sum(fragment.num_row_groups for fragment in dataset.get_fragments())
+    size = Path(file_path).stat().st_size / 2**20
+    timings = "".join(f"{seconds * 1000:>10.1f}ms" for seconds in scan_seconds)
+    sys.stdout.write(f"{name:<20}{size:>9.2f}MiB{row_group_count:>12}{timings}\n")
+
+
+def main():
+    args = _parse_benchmark_arguments(sys.argv[1:])
+    random.seed(args.seed)
+    table = _build_transfer_table(args)
+    scan_filters = _scan_filters()
+
+    sys.stdout.write(f"transfers: {table.num_rows:,}\n")
+    _write_header(scan_filters)
+    with TemporaryDirectory() as directory:
+        for index, (name, profile) in enumerate(WRITER_PROFILES.items()):
+            file_path = f"{directory}/transfers-{index}.parquet"
+            write_table_with_profile(table, file_path, profile)
+            scan_seconds = [
+                _best_scan_seconds(file_path, scan_filter, args.repeat)
+                for scan_filter in scan_filters.values()
+            ]
+            _write_row(name, file_path, scan_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import random
+import sys
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from dateutil.tz import tzutc
+from pyarrow.parquet import write_table
+
+from prmdata.domain.gp2gp.transfer import convert_transfers_to_table, derive_transfers
+from prmdata.domain.ods_portal.models import construct_organisation_list_from_dict
+from prmdata.domain.spine.conversation import (
+    ConversationGroupingCounters,
+    group_into_conversations,
+)
+from prmdata.domain.spine.message import SPLUNK_COLUMNS, construct_messages_from_splunk_items
+from prmdata.domain.spine.parsed_conversation import (
+    ConversationMissingStart,
+    filter_conversations_by_request_started_time,
+    parse_conversation,
+)
+from prmdata.pipeline.platform_metrics_calculator.core import (
+    calculate_national_metrics_data,
+    calculate_practice_metrics_data,
+)
+from prmdata.pipeline.platform_metrics_calculator.main import _get_time_range
+from prmdata.utils.io.csv import read_csv_files, read_gzip_csv_files
+from prmdata.utils.io.staged import StagedReadMetrics, read_csv_files_staged
+from tests.benchmark.spine_data import (
+    SpineDataProfile,
+    build_organisation_list,
+    build_splunk_header,
+    build_practices,
+    generate_spine_items,
+    spine_items_to_rows,
+)
+from tests.benchmark.timing import StageTimer, write_report, write_results_file
+from tests.builders.file import build_gzip_csv
+
+
+def _parse_benchmark_arguments(argument_list):
+    parser = ArgumentParser(description="GP2GP data pipeline benchmark on synthetic Spine data")
+    parser.add_argument("--conversations", type=int, default=20000)
+    parser.add_argument("--practices", type=int, default=500)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--pending-rate", type=float, default=0.05)
+    parser.add_argument("--out-of-order-rate", type=float, default=0.01)
+    parser.add_argument("--max-fragments", type=int, default=4)
+    parser.add_argument(
+        "--extra-columns",
+        type=int,
+        default=20,
+        help="Columns added to the synthetic export that the pipeline does not use.",
+    )
+    parser.add_argument("--month", type=int, default=12)
+    parser.add_argument("--year", type=int, default=2019)
+    parser.add_argument("--seed", type=int, default=2020)
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record the peak traced allocation of every stage (slows the run down).",
+    )
+    parser.add_argument("--results-file", type=str, help="Write the results as JSON.")
+    return parser.parse_args(argument_list)
+
+
+def _write_spine_csv_gz(items, extra_column_count, file_path: Path):
+    file_path.write_bytes(
+        build_gzip_csv(
+            build_splunk_header(extra_column_count),
+            spine_items_to_rows(items, extra_column_count),
+        )
+    )
+
+
+def _parse_conversations(conversations):
+    parsed = []
+    for conversation in conversations:
+        try:
+            parsed.append(parse_conversation(conversation))
+        except ConversationMissingStart:
+            pass
+    return parsed
+
+
+def _write_read_metrics(read_metrics):
+    for stage, unit in [(read_metrics.decompress, "bytes"), (read_metrics.parse, "rows")]:
+        sys.stdout.write(
+            f"staged {stage.name}: {stage.item_count:,} {unit}, {stage.busy_seconds:.2f}s busy, "
+            f"{stage.waiting_seconds:.2f}s waiting, {stage.throughput:,.0f} {unit}/sec\n"
+        )
+
+
+def _run_stages(timer, input_file_paths, organisation_metadata, time_range, output_directory):
+    items = timer.run("read csv", lambda: list(read_gzip_csv_files(input_file_paths)))
+    read_metrics = StagedReadMetrics()
+    timer.run_alternative(
+        "read csv (staged, projected)",
+        lambda: list(read_csv_files_staged(input_file_paths, read_metrics, SPLUNK_COLUMNS)),
+    )
+    timer.run_alternative(
+        "read csv (projected)",
+        lambda: list(read_csv_files(input_file_paths, SPLUNK_COLUMNS)),
+    )
+    messages = timer.run(
+        "construct messages", lambda: list(construct_messages_from_splunk_items(items))
+    )
+    grouping_counters = ConversationGroupingCounters()
+    conversations = timer.run(
+        "group", lambda: list(group_into_conversations(messages, grouping_counters))
+    )
+    parsed = timer.run("parse", _parse_conversations, conversations)
+    transfers = timer.run(
+        "derive transfers",
+        lambda: list(
+            derive_transfers(filter_conversations_by_request_started_time(parsed, time_range))
+        ),
+    )
+    timer.run(
+        "practice metrics",
+        calculate_practice_metrics_data,
+        transfers,
+        organisation_metadata.practices,
+        time_range,
+    )
+    timer.run("national metrics", calculate_national_metrics_data, transfers, time_range)
+    table = timer.run("transfers table", convert_transfers_to_table, transfers)
+    timer.run("write parquet", write_table, table, str(output_directory / "transfers.parquet"))
+    return grouping_counters, read_metrics
+
+
+def main():
+    args = _parse_benchmark_arguments(sys.argv[1:])
+    random.seed(args.seed)
+
+    profile = SpineDataProfile(
+        year=args.year,
+        month=args.month,
+        conversation_count=args.conversations,
+        practice_count=args.practices,
+        error_rate=args.error_rate,
+        pending_rate=args.pending_rate,
+        out_of_order_rate=args.out_of_order_rate,
+        max_fragment_count=args.max_fragments,
+    )
+    practices = build_practices(profile.practice_count)
+    organisation_metadata = construct_organisation_list_from_dict(
+        build_organisation_list(practices, datetime(args.year, args.month, 1, tzinfo=tzutc()))
+    )
+    items = generate_spine_items(profile, practices)
+    time_range = _get_time_range(args.year, args.month)
+
+    with TemporaryDirectory() as directory:
+        output_directory = Path(directory)
+        input_file_path = output_directory / "spine.csv.gz"
+        _write_spine_csv_gz(items, args.extra_columns, input_file_path)
+
+        timer = StageTimer(message_count=len(items), trace_memory=args.trace_memory)
+        grouping_counters, read_metrics = _run_stages(
+            timer, [str(input_file_path)], organisation_metadata, time_range, output_directory
+        )
+
+    write_report(timer, len(items))
+    sys.stdout.write(
+        f"conversations: {grouping_counters.conversation_count:,}, "
+        f"needing sorting: {grouping_counters.sorted_conversation_count:,}\n"
+    )
+    _write_read_metrics(read_metrics)
+    if args.results_file:
+        write_results_file(timer, len(items), vars(args), args.results_file)
+
+
+if __name__ == "__main__":
+    main()
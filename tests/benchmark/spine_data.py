@@ -0,0 +1,212 @@
+import random
+from datetime import datetime, timedelta
+from typing import List, NamedTuple
+
+from dateutil.relativedelta import relativedelta
+from dateutil.tz import tzutc
+
+from prmdata.domain.spine.parsed_conversation import (
+    EHR_REQUEST_STARTED,
+    EHR_REQUEST_COMPLETED,
+    APPLICATION_ACK,
+    COMMON_POINT_TO_POINT,
+)
+from tests.builders.common import a_string
+from tests.builders.spine import build_spine_item
+
+SPLUNK_HEADER = [
+    "_time",
+    "conversationID",
+    "GUID",
+    "interactionID",
+    "messageSender",
+    "messageRecipient",
+    "messageRef",
+    "jdiEvent",
+    "toSystem",
+    "fromSystem",
+]
+
+SUPPLIERS = ["EMIS", "SystmOne", "Vision", "Unknown"]
+ERROR_CODES = ["6", "10", "12", "20", "25", "30", "99"]
+ERROR_SUPPRESSED = "15"
+
+
+class SpineDataProfile(NamedTuple):
+    year: int
+    month: int
+    conversation_count: int
+    practice_count: int
+    error_rate: float
+    pending_rate: float
+    out_of_order_rate: float
+    max_fragment_count: int
+
+
+class SyntheticPractice(NamedTuple):
+    ods_code: str
+    name: str
+    asids: List[str]
+    supplier: str
+
+
+def _an_asid():
+    return a_string(12, characters="0123456789")
+
+
+def _a_guid():
+    value = f"{random.getrandbits(128):032x}"
+    return f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+
+
+def _format_splunk_time(time: datetime) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S.") + f"{time.microsecond // 1000:03d}+0000"
+
+
+def _a_jdi_event(error_rate: float) -> str:
+    if random.random() < error_rate:
+        return random.choice(ERROR_CODES)
+    return "NONE"
+
+
+def build_practices(practice_count: int) -> List[SyntheticPractice]:
+    return [
+        SyntheticPractice(
+            ods_code=f"P{index:05d}",
+            name=f"Synthetic Practice {index}",
+            asids=[_an_asid() for _ in range(random.randint(1, 2))],
+            supplier=random.choice(SUPPLIERS),
+        )
+        for index in range(practice_count)
+    ]
+
+
+def build_organisation_list(practices: List[SyntheticPractice], generated_on: datetime) -> dict:
+    return {
+        "generated_on": generated_on.isoformat(),
+        "practices": [
+            {"ods_code": practice.ods_code, "name": practice.name, "asids": practice.asids}
+            for practice in practices
+        ],
+        "ccgs": [],
+    }
+
+
+class _ConversationBuilder:
+    def __init__(self, conversation_id, requester, sender):
+        self._conversation_id = conversation_id
+        self._requester_asid = random.choice(requester.asids)
+        self._sender_asid = random.choice(sender.asids)
+        self._requester_system = requester.supplier
+        self._sender_system = sender.supplier
+        self.items: List[dict] = []
+
+    def _add(self, time, interaction_id, from_requester, message_ref="NotProvided", jdi="NONE"):
+        guid = _a_guid()
+        from_asid, to_asid = self._requester_asid, self._sender_asid
+        from_system, to_system = self._requester_system, self._sender_system
+        if not from_requester:
+            from_asid, to_asid = to_asid, from_asid
+            from_system, to_system = to_system, from_system
+
+        self.items.append(
+            build_spine_item(
+                time=_format_splunk_time(time),
+                conversation_id=self._conversation_id,
+                guid=guid,
+                interaction_id=interaction_id,
+                message_sender=from_asid,
+                message_recipient=to_asid,
+                message_ref=message_ref,
+                jdi_event=jdi,
+                from_system=from_system,
+                to_system=to_system,
+            )
+        )
+        return guid
+
+    def request_started(self, time):
+        return self._add(time, EHR_REQUEST_STARTED, from_requester=True)
+
+    def request_completed(self, time):
+        return self._add(time, EHR_REQUEST_COMPLETED, from_requester=False)
+
+    def fragment(self, time):
+        return self._add(time, COMMON_POINT_TO_POINT, from_requester=False)
+
+    def acknowledgement(self, time, message_ref, jdi, from_requester):
+        return self._add(time, APPLICATION_ACK, from_requester, message_ref=message_ref, jdi=jdi)
+
+
+def _a_request_start_time(profile: SpineDataProfile) -> datetime:
+    month_start = datetime(profile.year, profile.month, 1, tzinfo=tzutc())
+    month_length = (month_start + relativedelta(months=1)) - month_start
+    return month_start + timedelta(seconds=random.uniform(0, month_length.total_seconds()))
+
+
+def _an_integration_duration() -> timedelta:
+    return timedelta(seconds=random.expovariate(1 / 172800))
+
+
+def _build_conversation(profile, practices) -> List[dict]:
+    requester, sender = random.sample(practices, 2)
+    conversation = _ConversationBuilder(_a_guid(), requester, sender)
+
+    started_on = _a_request_start_time(profile)
+    started_guid = conversation.request_started(started_on)
+    sender_jdi = _a_jdi_event(profile.error_rate)
+    conversation.acknowledgement(
+        started_on + timedelta(seconds=2), started_guid, sender_jdi, from_requester=False
+    )
+    if sender_jdi != "NONE":
+        return conversation.items
+
+    completed_on = started_on + timedelta(minutes=random.uniform(1, 30))
+    completed_guid = conversation.request_completed(completed_on)
+    fragment_time = completed_on
+    for _ in range(random.randint(0, profile.max_fragment_count)):
+        fragment_time += timedelta(seconds=random.uniform(1, 60))
+        fragment_guid = conversation.fragment(fragment_time)
+        conversation.acknowledgement(
+            fragment_time + timedelta(seconds=1),
+            fragment_guid,
+            _a_jdi_event(profile.error_rate),
+            from_requester=True,
+        )
+
+    if random.random() >= profile.pending_rate:
+        final_jdi = random.choice([_a_jdi_event(profile.error_rate), "NONE", ERROR_SUPPRESSED])
+        conversation.acknowledgement(
+            max(fragment_time, completed_on + _an_integration_duration()),
+            completed_guid,
+            final_jdi,
+            from_requester=True,
+        )
+    return conversation.items
+
+
+def _displace_messages(items: List[dict], out_of_order_rate: float):
+    for index in range(len(items) - 1):
+        if random.random() < out_of_order_rate:
+            swap_index = min(len(items) - 1, index + random.randint(1, 8))
+            items[index], items[swap_index] = items[swap_index], items[index]
+
+
+def generate_spine_items(profile: SpineDataProfile, practices: List[SyntheticPractice]):
+    items = [
+        item
+        for _ in range(profile.conversation_count)
+        for item in _build_conversation(profile, practices)
+    ]
+    items.sort(key=lambda item: item["_time"])
+    _displace_messages(items, profile.out_of_order_rate)
+    return items
+
+
+def build_splunk_header(extra_column_count: int = 0) -> List[str]:
+    return SPLUNK_HEADER + [f"extraField{i}" for i in range(extra_column_count)]
+
+
+def spine_items_to_rows(items: List[dict], extra_column_count: int = 0) -> List[List[str]]:
+    extra_values = [f"splunk metadata {i}" for i in range(extra_column_count)]
+    return [[item.get(column, "") for column in SPLUNK_HEADER] + extra_values for item in items]
@@ -0,0 +1,91 @@
+import json
+import resource
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Callable, List, NamedTuple, Optional
+
+
+class StageResult(NamedTuple):
+    name: str
+    seconds: float
+    messages_per_second: float
+    peak_traced_bytes: Optional[int]
+    alternative: bool = False
+
+
+class StageTimer:
+    def __init__(self, message_count: int, trace_memory: bool = False):
+        self._message_count = message_count
+        self._trace_memory = trace_memory
+        self.results: List[StageResult] = []
+
+    def run(self, name: str, stage: Callable, *args, **kwargs):
+        return self._run(name, False, stage, *args, **kwargs)
+
+    def run_alternative(self, name: str, stage: Callable, *args, **kwargs):
+        return self._run(name, True, stage, *args, **kwargs)
+
+    def _run(self, name: str, alternative: bool, stage: Callable, *args, **kwargs):
+        if self._trace_memory:
+            tracemalloc.start()
+        start = perf_counter()
+        output = stage(*args, **kwargs)
+        seconds = perf_counter() - start
+        peak = None
+        if self._trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        throughput = self._message_count / seconds if seconds > 0 else float("inf")
+        self.results.append(StageResult(name, seconds, throughput, peak, alternative))
+        return output
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(result.seconds for result in self.results if not result.alternative)
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _format_bytes(byte_count: Optional[int]) -> str:
+    if byte_count is None:
+        return "-"
+    return f"{byte_count / 2 ** 20:.1f} MiB"
+
+
+_LABEL_WIDTH = 32
+
+
+def _format_label(result: StageResult) -> str:
+    return f"{result.name} *" if result.alternative else result.name
+
+
+def write_report(timer: StageTimer, message_count: int, out=sys.stdout):
+    out.write(f"{'stage':<{_LABEL_WIDTH}}{'seconds':>10}{'msgs/sec':>14}{'peak traced':>14}\n")
+    for result in timer.results:
+        out.write(
+            f"{_format_label(result):<{_LABEL_WIDTH}}{result.seconds:>10.3f}"
+            f"{result.messages_per_second:>14,.0f}"
+            f"{_format_bytes(result.peak_traced_bytes):>14}\n"
+        )
+    total_seconds = timer.total_seconds
+    out.write(
+        f"{'total':<{_LABEL_WIDTH}}{total_seconds:>10.3f}{message_count / total_seconds:>14,.0f}\n"
+    )
+    out.write("* alternative read variant, not included in total\n")
+    out.write(f"messages: {message_count:,}, peak RSS: {_format_bytes(peak_rss_bytes())}\n")
+
+
+def write_results_file(timer: StageTimer, message_count: int, parameters: dict, file_path: str):
+    content = {
+        "parameters": parameters,
+        "message_count": message_count,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "stages": [result._asdict() for result in timer.results],
+    }
+    with open(file_path, "w") as f:
+        json.dump(content, f, indent=2)
@@ -1,7 +1,11 @@
 import gzip
+import random
 import shutil
+import zlib
 from io import BytesIO
 
+import pyarrow as pa
+
 
 def _build_csv_contents(header, rows):
     def build_line(values):
@@ -27,9 +31,36 @@ def build_gzip_csv(header, rows):
     return buffer.getvalue()
 
 
+def build_zstd_csv(header, rows):
+    contents = _build_csv_contents(header, rows)
+    return pa.compress(contents.encode("utf-8"), codec="zstd", asbytes=True)
+
+
+def build_csv(header, rows):
+    return _build_csv_contents(header, rows).encode("utf-8")
+
+
 def gzip_file(input_file_path):
     gzip_file_path = input_file_path.with_suffix(".gz")
     with open(input_file_path, "rb") as input_file:
         with gzip.open(gzip_file_path, "wb") as output_file:
             shutil.copyfileobj(input_file, output_file)
     return gzip_file_path
+
+
+def build_compressible_lines(line_count):
+    return b"".join(
+        f"{i},{random.getrandbits(64):016x},message {random.random()}\n".encode("utf-8")
+        for i in range(line_count)
+    )
+
+
+def gzip_with_sync_flushes(contents, piece_size, level=zlib.Z_DEFAULT_COMPRESSION):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 15 + 16)
+    starts = list(range(0, len(contents), piece_size))
+    ends = starts[1:] + [len(contents)]
+    pieces = [contents[start:end] for start, end in zip(starts, ends)]
+    compressed = [
+        compressor.compress(piece) + compressor.flush(zlib.Z_SYNC_FLUSH) for piece in pieces
+    ]
+    return b"".join(compressed) + compressor.flush(zlib.Z_FINISH)
@@ -1,14 +1,21 @@
 from typing import List
 
 from prmdata.domain.gp2gp.practice_metrics import PracticeMetrics, IntegratedPracticeMetrics
+from prmdata.domain.gp2gp.sla import assign_to_sla_band
 from prmdata.domain.gp2gp.transfer import Transfer, TransferStatus
 from tests.builders.common import a_string, a_duration, an_integer, a_datetime
 
 
+def _sla_band_of(sla_duration):
+    return assign_to_sla_band(sla_duration) if sla_duration is not None else None
+
+
 def build_transfer(**kwargs):
+    sla_duration = kwargs.get("sla_duration", a_duration())
     return Transfer(
         conversation_id=kwargs.get("conversation_id", a_string(36)),
-        sla_duration=kwargs.get("sla_duration", a_duration()),
+        sla_duration=sla_duration,
+        sla_band=kwargs.get("sla_band", _sla_band_of(sla_duration)),
         requesting_practice_asid=kwargs.get("requesting_practice_asid", a_string(12)),
         sending_practice_asid=kwargs.get("sending_practice_asid", a_string(12)),
         requesting_supplier=kwargs.get("requesting_supplier", a_string(12)),
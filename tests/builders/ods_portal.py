@@ -1,10 +1,20 @@
+import json
 from unittest.mock import MagicMock
 
 
-def build_mock_response(content=None, status_code=200, next_page=None):
+def build_mock_response(content=None, status_code=200, next_page=None, total_count=None):
     mock_response = MagicMock()
     mock_response.content = content
     mock_response.status_code = status_code
+    mock_response.headers = {}
     if next_page is not None:
-        mock_response.headers = {"Next-Page": next_page}
+        mock_response.headers["Next-Page"] = next_page
+    if total_count is not None:
+        mock_response.headers["X-Total-Count"] = str(total_count)
     return mock_response
+
+
+def build_ods_portal_page(organisations):
+    return json.dumps(
+        {"Organisations": [{"Name": name, "OrgId": ods_code} for ods_code, name in organisations]}
+    ).encode("utf-8")
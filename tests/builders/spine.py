@@ -9,7 +9,8 @@ def build_parsed_conversation(**kwargs):
         request_started=kwargs.get("request_started", build_message()),
         request_started_ack=kwargs.get("request_started_ack", build_message()),
         request_completed=kwargs.get("request_completed", build_message()),
-        intermediate_messages=kwargs.get("intermediate_messages", []),
+        intermediate_error_codes=kwargs.get("intermediate_error_codes", []),
+        intermediate_message_count=kwargs.get("intermediate_message_count", 0),
         request_completed_ack=kwargs.get("request_completed_ack", build_message()),
     )
 
@@ -0,0 +1,143 @@
+import json
+import logging
+from subprocess import check_output
+from threading import Lock, Thread
+
+from werkzeug.serving import make_server
+from werkzeug.wrappers import Request, Response
+
+from tests.builders.file import build_gzip_csv
+from tests.builders.ods_portal import build_ods_portal_page
+
+logger = logging.getLogger(__name__)
+
+PRACTICES = [("A12345", "GP Practice"), ("B12345", "GP Practice 2"), ("C12345", "GP Practice 3")]
+CCGS = [("02N", "NHS Airedale CCG")]
+ORGANISATIONS_BY_ROLE = {"RO177": PRACTICES, "RO98": CCGS}
+
+
+class FakeOdsPortal:
+    def __init__(self, unavailable_request_count):
+        self._unavailable_request_count = unavailable_request_count
+        self._lock = Lock()
+        self.request_count = 0
+        self.revalidated_request_count = 0
+
+    def _is_unavailable(self):
+        with self._lock:
+            self.request_count += 1
+            return self.request_count <= self._unavailable_request_count
+
+    def __call__(self, environ, start_response):
+        request = Request(environ)
+        if self._is_unavailable():
+            return Response(status=503)(environ, start_response)
+        if request.headers.get("If-None-Match") == '"v1"':
+            self.revalidated_request_count += 1
+            return Response(status=304)(environ, start_response)
+
+        organisations = ORGANISATIONS_BY_ROLE[request.args["PrimaryRoleId"]]
+        start = int(request.args["Offset"])
+        end = start + int(request.args["Limit"])
+        page = organisations[start:end]
+        response = Response(
+            build_ods_portal_page(page),
+            content_type="application/json",
+            headers={"X-Total-Count": str(len(organisations)), "ETag": '"v1"'},
+        )
+        return response(environ, start_response)
+
+
+class ThreadedServer:
+    def __init__(self, server):
+        self._server = server
+        self._thread = Thread(target=server.serve_forever)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._thread.join()
+
+
+def _start_fake_ods_portal(unavailable_request_count=0):
+    fake_ods_portal = FakeOdsPortal(unavailable_request_count)
+    server = ThreadedServer(make_server("127.0.0.1", 8886, fake_ods_portal, threaded=True))
+    server.start()
+    return fake_ods_portal, server
+
+
+def _write_mapping_file(file_path):
+    file_path.write_bytes(
+        build_gzip_csv(
+            ["ASID", "NACS"],
+            [["123456789123", "A12345"], ["223456789123", "B12345"], ["323456789123", "A12345"]],
+        )
+    )
+
+
+def _run_pipeline(pipeline_command, server):
+    try:
+        pipeline_output = check_output(pipeline_command, shell=True)
+        logger.debug(pipeline_output)
+    finally:
+        server.stop()
+
+
+def test_with_local_file(tmp_path):
+    fake_ods_portal, server = _start_fake_ods_portal(unavailable_request_count=1)
+    mapping_file_path = tmp_path / "asid-lookup.csv.gz"
+    _write_mapping_file(mapping_file_path)
+    output_file_path = tmp_path / "organisation-list.json"
+
+    pipeline_command = f"\
+        ods-portal-pipeline --mapping-file {mapping_file_path}\
+        --search-url http://127.0.0.1:8886/organisations\
+        --page-size 2\
+        --requests-per-second 100\
+        --output-file {output_file_path}\
+    "
+
+    _run_pipeline(pipeline_command, server)
+
+    actual = json.loads(output_file_path.read_text())
+
+    assert actual["practices"] == [
+        {"ods_code": "A12345", "name": "GP Practice", "asids": ["123456789123", "323456789123"]},
+        {"ods_code": "B12345", "name": "GP Practice 2", "asids": ["223456789123"]},
+        {"ods_code": "C12345", "name": "GP Practice 3", "asids": []},
+    ]
+    assert actual["ccgs"] == [{"ods_code": "02N", "name": "NHS Airedale CCG"}]
+    assert "generated_on" in actual
+    assert fake_ods_portal.request_count == 4
+
+
+def test_rerun_revalidates_cached_responses(tmp_path):
+    mapping_file_path = tmp_path / "asid-lookup.csv.gz"
+    _write_mapping_file(mapping_file_path)
+    output_file_path = tmp_path / "organisation-list.json"
+    cache_directory = tmp_path / "cache"
+
+    pipeline_command = f"\
+        ods-portal-pipeline --mapping-file {mapping_file_path}\
+        --search-url http://127.0.0.1:8886/organisations\
+        --page-size 2\
+        --requests-per-second 100\
+        --cache-directory {cache_directory}\
+        --cache-ttl-hours 0\
+        --output-file {output_file_path}\
+    "
+
+    first_run_portal, server = _start_fake_ods_portal()
+    _run_pipeline(pipeline_command, server)
+    expected = json.loads(output_file_path.read_text())
+
+    second_run_portal, server = _start_fake_ods_portal()
+    _run_pipeline(pipeline_command, server)
+    actual = json.loads(output_file_path.read_text())
+
+    assert actual["practices"] == expected["practices"]
+    assert actual["ccgs"] == expected["ccgs"]
+    assert first_run_portal.revalidated_request_count == 0
+    assert second_run_portal.revalidated_request_count == 3
@@ -1,3 +1,4 @@
+import csv
 from datetime import datetime
 import json
 import logging
@@ -7,11 +8,16 @@ from threading import Thread
 
 import boto3
 from botocore.config import Config
+from dateutil.tz import tzutc
 from moto.server import DomainDispatcherApplication, create_backend_app
 from werkzeug.serving import make_server
 from tests.builders.file import gzip_file
 import pyarrow.parquet as pq
 
+from prmdata.domain.gp2gp.dataset import read_transfer_dataset
+from prmdata.utils.date.range import DateTimeRange
+from prmdata.utils.io.parquet import resolve_filesystem
+
 from subprocess import check_output
 
 logger = logging.getLogger(__name__)
@@ -19,39 +25,39 @@ logger = logging.getLogger(__name__)
 EXPECTED_TRANSFERS = {
     "conversation_id": [
         "integrated-within-8-days--A12345",
+        "integrated-within-8-days--A12347",
         "integrated-beyond-8-days--A12345",
-        "completed-within-3-days-in-jan--A12345",
         "failed--A12345",
-        "integrated-within-8-days--A12347",
+        "completed-within-3-days-in-jan--A12345",
         "completed-within-3-days--A12347",
     ],
     "date_completed": [
         datetime(2019, 12, 6, 8, 41, 48, 337000),
+        datetime(2019, 12, 7, 8, 41, 48, 337000),
         datetime(2019, 12, 15, 8, 41, 48, 337000),
-        datetime(2020, 1, 1, 8, 41, 48, 337000),
         datetime(2019, 12, 20, 8, 41, 48, 337000),
-        datetime(2019, 12, 7, 8, 41, 48, 337000),
+        datetime(2020, 1, 1, 8, 41, 48, 337000),
         datetime(2019, 12, 31, 18, 3, 24, 982000),
     ],
     "date_requested": [
         datetime(2019, 12, 1, 18, 2, 29, 985000),
+        datetime(2019, 12, 3, 18, 2, 29, 985000),
         datetime(2019, 12, 5, 18, 2, 29, 985000),
-        datetime(2019, 12, 30, 18, 2, 29, 985000),
         datetime(2019, 12, 19, 18, 2, 29, 985000),
-        datetime(2019, 12, 3, 18, 2, 29, 985000),
+        datetime(2019, 12, 30, 18, 2, 29, 985000),
         datetime(2019, 12, 31, 18, 2, 29, 985000),
     ],
     "final_error_code": [None, None, None, 30, None, None],
     "intermediate_error_codes": [[], [], [], [], [], []],
     "requesting_practice_asid": [
         "123456789123",
+        "987654321240",
         "123456789123",
         "123456789123",
         "123456789123",
         "987654321240",
-        "987654321240",
     ],
-    "requesting_supplier": ["", "SystmOne", "SystmOne", "Vision", "", "SystmOne"],
+    "requesting_supplier": ["", "", "SystmOne", "Vision", "SystmOne", "SystmOne"],
     "sender_error_code": [None, None, None, None, None, None],
     "sending_practice_asid": [
         "003456789123",
@@ -61,8 +67,16 @@ EXPECTED_TRANSFERS = {
         "003456789123",
         "003456789123",
     ],
-    "sending_supplier": ["", "EMIS", "Vision", "Unknown", "", "Vision"],
-    "sla_duration": [398306, 830306, 139106, 52706, 311906, 3],
+    "sending_supplier": ["", "", "EMIS", "Unknown", "Vision", "Vision"],
+    "sla_duration": [398306, 311906, 830306, 52706, 139106, 3],
+    "sla_duration_microseconds": [
+        398306429000,
+        311906429000,
+        830306429000,
+        52706429000,
+        139106429000,
+        3074000,
+    ],
     "status": ["INTEGRATED", "INTEGRATED", "INTEGRATED", "FAILED", "INTEGRATED", "INTEGRATED"],
 }
 
@@ -88,10 +102,29 @@ def _read_parquet(path):
     return pq.read_table(path).to_pydict()
 
 
+def _sort_by_conversation_id(columns):
+    order = sorted(
+        range(len(columns["conversation_id"])), key=lambda i: columns["conversation_id"][i]
+    )
+    return {name: [values[i] for i in order] for name, values in columns.items()}
+
+
 def _gzip_files(file_paths):
     return [gzip_file(file_path) for file_path in file_paths]
 
 
+def _sort_csv_by_time(file_path):
+    with open(file_path, newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = sorted(reader, key=lambda row: row["_time"])
+    with open(file_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    return file_path
+
+
 def _csv_join(strings):
     return ",".join(strings)
 
@@ -164,6 +197,245 @@ def test_with_local_files(datadir):
     assert actual_organisation_metadata["practices"] == expected_organisation_metadata["practices"]
     assert actual_national_metrics["metrics"] == expected_national_metrics["metrics"]
     assert actual_transfers == EXPECTED_TRANSFERS
+    assert _read_json(datadir / "12-2019-dataQuality.json")["conversationsMissingStart"] == 1
+
+
+def test_with_compacted_input_dataset(datadir):
+    input_file_paths = _gzip_files(
+        [datadir / "test_gp2gp_dec_2019.csv", datadir / "test_gp2gp_jan_2020.csv"]
+    )
+    dataset_path = datadir / "spine-dataset"
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+
+    expected_practice_metrics = _read_json(
+        datadir / "expected_json_output" / "practiceMetrics.json"
+    )
+    expected_national_metrics = _read_json(
+        datadir / "expected_json_output" / "nationalMetrics.json"
+    )
+
+    compaction_command = f"\
+        spine-compaction-pipeline --input-files {_csv_join_paths(input_file_paths)}\
+        --output-dataset {dataset_path}\
+    "
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-dataset {dataset_path}\
+        --output-directory {datadir}\
+    "
+
+    logger.debug(check_output(compaction_command, shell=True))
+    logger.debug(check_output(pipeline_command, shell=True))
+
+    actual_practice_metrics = _read_json(datadir / "12-2019-practiceMetrics.json")
+    actual_national_metrics = _read_json(datadir / "12-2019-nationalMetrics.json")
+    actual_transfers = _read_parquet(datadir / "12-2019-transfers.parquet")
+
+    assert actual_practice_metrics["practices"] == expected_practice_metrics["practices"]
+    assert actual_national_metrics["metrics"] == expected_national_metrics["metrics"]
+    assert _sort_by_conversation_id(actual_transfers) == _sort_by_conversation_id(
+        EXPECTED_TRANSFERS
+    )
+
+
+def test_with_transfers_dataset_output(datadir):
+    input_file_paths = _gzip_files(
+        [datadir / "test_gp2gp_dec_2019.csv", datadir / "test_gp2gp_jan_2020.csv"]
+    )
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+    transfers_dataset_path = datadir / "transfers-dataset"
+
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-files {_csv_join_paths(input_file_paths)}\
+        --output-directory {datadir}\
+        --output-transfers-dataset {transfers_dataset_path}\
+        --partition-transfers-by-status\
+    "
+
+    logger.debug(check_output(pipeline_command, shell=True))
+
+    filesystem, root_path = resolve_filesystem(str(transfers_dataset_path))
+    time_range = DateTimeRange(
+        datetime(2019, 12, 1, tzinfo=tzutc()), datetime(2020, 1, 1, tzinfo=tzutc())
+    )
+    actual_transfers = read_transfer_dataset(filesystem, root_path, time_range).to_pydict()
+
+    assert _sort_by_conversation_id(actual_transfers) == _sort_by_conversation_id(
+        EXPECTED_TRANSFERS
+    )
+
+
+def test_with_input_transfers_file(datadir):
+    input_file_paths = _gzip_files(
+        [datadir / "test_gp2gp_dec_2019.csv", datadir / "test_gp2gp_jan_2020.csv"]
+    )
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+    transfers_file_path = datadir / "12-2019-transfers.parquet"
+    rerun_directory = datadir / "rerun"
+    rerun_directory.mkdir()
+
+    expected_practice_metrics = _read_json(
+        datadir / "expected_json_output" / "practiceMetrics.json"
+    )
+    expected_national_metrics = _read_json(
+        datadir / "expected_json_output" / "nationalMetrics.json"
+    )
+
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-files {_csv_join_paths(input_file_paths)}\
+        --output-directory {datadir}\
+    "
+    rerun_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-transfers-file {transfers_file_path}\
+        --output-directory {rerun_directory}\
+    "
+
+    logger.debug(check_output(pipeline_command, shell=True))
+    logger.debug(check_output(rerun_command, shell=True))
+
+    actual_practice_metrics = _read_json(rerun_directory / "12-2019-practiceMetrics.json")
+    actual_national_metrics = _read_json(rerun_directory / "12-2019-nationalMetrics.json")
+    actual_transfers = _read_parquet(rerun_directory / "12-2019-transfers.parquet")
+
+    assert actual_practice_metrics["practices"] == expected_practice_metrics["practices"]
+    assert actual_national_metrics["metrics"] == expected_national_metrics["metrics"]
+    assert actual_transfers == EXPECTED_TRANSFERS
+
+
+def test_with_sla_scenarios(datadir):
+    input_file_paths = _gzip_files(
+        [datadir / "test_gp2gp_dec_2019.csv", datadir / "test_gp2gp_jan_2020.csv"]
+    )
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+    scenarios_file_path = datadir / "sla-scenarios.json"
+    scenarios_file_path.write_text(
+        json.dumps(
+            {
+                "scenarios": [
+                    {"name": "default", "thresholds_in_seconds": [259200, 691200]},
+                    {"name": "within-1-day", "thresholds_in_seconds": [86400, 691200]},
+                ]
+            }
+        )
+    )
+
+    expected_practice_metrics = _read_json(
+        datadir / "expected_json_output" / "practiceMetrics.json"
+    )
+    expected_national_metrics = _read_json(
+        datadir / "expected_json_output" / "nationalMetrics.json"
+    )
+
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-files {_csv_join_paths(input_file_paths)}\
+        --output-directory {datadir}\
+        --sla-scenarios-file {scenarios_file_path}\
+    "
+
+    logger.debug(check_output(pipeline_command, shell=True))
+
+    default_practice_metrics = _read_json(datadir / "12-2019-default-practiceMetrics.json")
+    default_national_metrics = _read_json(datadir / "12-2019-default-nationalMetrics.json")
+    one_day_national_metrics = _read_json(datadir / "12-2019-within-1-day-nationalMetrics.json")
+
+    assert default_practice_metrics["practices"] == expected_practice_metrics["practices"]
+    assert default_national_metrics["metrics"] == expected_national_metrics["metrics"]
+    assert (
+        one_day_national_metrics["metrics"][0]["integrated"]["within3Days"]
+        < default_national_metrics["metrics"][0]["integrated"]["within3Days"]
+    )
+
+
+def test_with_input_asid_counts_file(datadir):
+    input_file_paths = _gzip_files(
+        [datadir / "test_gp2gp_dec_2019.csv", datadir / "test_gp2gp_jan_2020.csv"]
+    )
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+    asid_counts_file_path = datadir / "12-2019-asidTransferCounts.parquet"
+    rerun_directory = datadir / "rerun"
+    rerun_directory.mkdir()
+
+    expected_practice_metrics = _read_json(
+        datadir / "expected_json_output" / "practiceMetrics.json"
+    )
+    expected_national_metrics = _read_json(
+        datadir / "expected_json_output" / "nationalMetrics.json"
+    )
+
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-files {_csv_join_paths(input_file_paths)}\
+        --output-directory {datadir}\
+    "
+    rerun_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-asid-counts-file {asid_counts_file_path}\
+        --output-directory {rerun_directory}\
+    "
+
+    logger.debug(check_output(pipeline_command, shell=True))
+    logger.debug(check_output(rerun_command, shell=True))
+
+    actual_practice_metrics = _read_json(rerun_directory / "12-2019-practiceMetrics.json")
+    actual_national_metrics = _read_json(rerun_directory / "12-2019-nationalMetrics.json")
+
+    assert actual_practice_metrics["practices"] == expected_practice_metrics["practices"]
+    assert actual_national_metrics["metrics"] == expected_national_metrics["metrics"]
+    assert not (rerun_directory / "12-2019-transfers.parquet").exists()
+
+
+def test_with_asid_history_file(datadir):
+    input_file_paths = _gzip_files(
+        [datadir / "test_gp2gp_dec_2019.csv", datadir / "test_gp2gp_jan_2020.csv"]
+    )
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+    asid_history_file_path = datadir / "asid-history.csv"
+    asid_history_file_path.write_text(
+        "ASID,NACS,ValidFrom,ValidTo\n"
+        "987654321240,A12346,,2019-12-15\n"
+        "987654321240,A12347,2019-12-15,\n"
+    )
+
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --asid-history-file {asid_history_file_path}\
+        --input-files {_csv_join_paths(input_file_paths)}\
+        --output-directory {datadir}\
+    "
+
+    logger.debug(check_output(pipeline_command, shell=True))
+
+    actual_practice_metrics = _read_json(datadir / "12-2019-practiceMetrics.json")
+    actual_integrated = {
+        practice["odsCode"]: practice["metrics"][0]["requester"]["integrated"]
+        for practice in actual_practice_metrics["practices"]
+    }
+
+    assert actual_integrated["A12345"]["transferCount"] == 3
+    assert actual_integrated["A12346"]["transferCount"] == 1
+    assert actual_integrated["A12346"]["within8DaysPercentage"] == 100.0
+    assert actual_integrated["A12347"]["transferCount"] == 1
+    assert actual_integrated["A12347"]["within3DaysPercentage"] == 100.0
 
 
 def test_with_s3_output(datadir):
@@ -258,3 +530,106 @@ def test_with_s3_output(datadir):
         output_bucket.delete()
         fake_s3.stop()
         logger.debug(pipeline_output)
+
+
+def test_with_streaming_conversation_grouping(datadir):
+    input_file_paths = _gzip_files(
+        [datadir / "test_gp2gp_dec_2019.csv", datadir / "test_gp2gp_jan_2020.csv"]
+    )
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+
+    expected_practice_metrics = _read_json(
+        datadir / "expected_json_output" / "practiceMetrics.json"
+    )
+    expected_national_metrics = _read_json(
+        datadir / "expected_json_output" / "nationalMetrics.json"
+    )
+
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-files {_csv_join_paths(input_file_paths)}\
+        --conversation-lateness-minutes 60\
+        --output-directory {datadir}\
+    "
+
+    logger.debug(check_output(pipeline_command, shell=True))
+
+    actual_practice_metrics = _read_json(datadir / "12-2019-practiceMetrics.json")
+    actual_national_metrics = _read_json(datadir / "12-2019-nationalMetrics.json")
+    actual_transfers = _read_parquet(datadir / "12-2019-transfers.parquet")
+
+    assert actual_practice_metrics["practices"] == expected_practice_metrics["practices"]
+    assert actual_national_metrics["metrics"] == expected_national_metrics["metrics"]
+    assert actual_transfers == EXPECTED_TRANSFERS
+
+
+def test_with_time_ordered_input(datadir):
+    input_file_paths = _gzip_files(
+        [
+            _sort_csv_by_time(datadir / "test_gp2gp_dec_2019.csv"),
+            datadir / "test_gp2gp_jan_2020.csv",
+        ]
+    )
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+
+    expected_practice_metrics = _read_json(
+        datadir / "expected_json_output" / "practiceMetrics.json"
+    )
+    expected_national_metrics = _read_json(
+        datadir / "expected_json_output" / "nationalMetrics.json"
+    )
+
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-files {_csv_join_paths(input_file_paths)}\
+        --time-ordered-input\
+        --conversation-lateness-minutes 0\
+        --output-directory {datadir}\
+    "
+
+    logger.debug(check_output(pipeline_command, shell=True))
+
+    actual_practice_metrics = _read_json(datadir / "12-2019-practiceMetrics.json")
+    actual_national_metrics = _read_json(datadir / "12-2019-nationalMetrics.json")
+    actual_transfers = _read_parquet(datadir / "12-2019-transfers.parquet")
+
+    assert actual_practice_metrics["practices"] == expected_practice_metrics["practices"]
+    assert actual_national_metrics["metrics"] == expected_national_metrics["metrics"]
+    assert actual_transfers == EXPECTED_TRANSFERS
+
+
+def test_with_conversation_sorting_skipped(datadir):
+    input_file_paths = _gzip_files(
+        [datadir / "test_gp2gp_dec_2019.csv", datadir / "test_gp2gp_jan_2020.csv"]
+    )
+    organisation_metadata_file_path = datadir / "organisation-list.json"
+
+    expected_practice_metrics = _read_json(
+        datadir / "expected_json_output" / "practiceMetrics.json"
+    )
+    expected_national_metrics = _read_json(
+        datadir / "expected_json_output" / "nationalMetrics.json"
+    )
+
+    pipeline_command = f"\
+        platform-metrics-pipeline --month 12\
+        --year 2019\
+        --organisation-list-file {organisation_metadata_file_path}\
+        --input-files {_csv_join_paths(input_file_paths)}\
+        --skip-conversation-sorting\
+        --output-directory {datadir}\
+    "
+
+    logger.debug(check_output(pipeline_command, shell=True))
+
+    actual_practice_metrics = _read_json(datadir / "12-2019-practiceMetrics.json")
+    actual_national_metrics = _read_json(datadir / "12-2019-nationalMetrics.json")
+    actual_transfers = _read_parquet(datadir / "12-2019-transfers.parquet")
+
+    assert actual_practice_metrics["practices"] == expected_practice_metrics["practices"]
+    assert actual_national_metrics["metrics"] == expected_national_metrics["metrics"]
+    assert actual_transfers == EXPECTED_TRANSFERS
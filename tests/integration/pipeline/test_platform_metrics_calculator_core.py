@@ -19,13 +19,22 @@ from prmdata.domain.data_platform.practice_metrics import (
     PracticeMetricsPresentation,
 )
 from prmdata.utils.date.range import DateTimeRange
+from prmdata.domain.ods_portal.asid_mapping import AsidAssignment, construct_temporal_asid_mapping
 from prmdata.domain.ods_portal.models import PracticeDetails
 from prmdata.pipeline.platform_metrics_calculator.core import (
     calculate_practice_metrics_data,
+    calculate_sla_scenario_metrics_data,
     parse_transfers_from_messages,
     calculate_national_metrics_data,
 )
-from prmdata.domain.gp2gp.sla import EIGHT_DAYS_IN_SECONDS, THREE_DAYS_IN_SECONDS
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
+from prmdata.domain.gp2gp.sla import (
+    DEFAULT_SLA_BANDS,
+    EIGHT_DAYS_IN_SECONDS,
+    THREE_DAYS_IN_SECONDS,
+    SlaBand,
+)
+from prmdata.domain.gp2gp.sla_scenarios import SlaScenario
 
 from prmdata.domain.gp2gp.transfer import Transfer, TransferStatus
 
@@ -108,6 +117,7 @@ def test_parses_transfer_correctly_given_valid_message_list():
         Transfer(
             conversation_id=conversation_id,
             sla_duration=timedelta(days=1, seconds=52707),
+            sla_band=SlaBand.WITHIN_3_DAYS,
             requesting_practice_asid=requesting_asid_with_transfer,
             sending_practice_asid=sending_asid_with_transfer,
             requesting_supplier=requesting_supplier,
@@ -126,6 +136,56 @@ def test_parses_transfer_correctly_given_valid_message_list():
     assert actual == expected
 
 
+def test_counts_data_quality_issues_while_parsing_transfers():
+    time_range = DateTimeRange(
+        start=datetime(2019, 12, 1, tzinfo=UTC), end=datetime(2020, 1, 1, tzinfo=UTC)
+    )
+    conversation = _build_successful_conversation(
+        conversation_id="abcdefg_1234",
+        ehr_request_started_on=datetime(2019, 12, 30, 18, 2, 29, tzinfo=UTC),
+        ehr_request_completed_on=datetime(2019, 12, 30, 18, 3, 21, tzinfo=UTC),
+        ehr_request_started_acknowledged_on=datetime(2019, 12, 30, 18, 3, 23, tzinfo=UTC),
+        ehr_request_completed_acknowledged_on=datetime(2020, 1, 1, 8, 41, 48, tzinfo=UTC),
+    )
+    duplicate_message = conversation[2]
+    missing_start = build_message(
+        time=datetime(2019, 12, 2, tzinfo=UTC), conversation_id="started-in-november"
+    )
+    spine_messages = conversation + [duplicate_message, missing_start]
+    quality = DataQualityCounters()
+
+    list(parse_transfers_from_messages(spine_messages, time_range, quality=quality))
+
+    assert quality == DataQualityCounters(conversations_missing_start=1, duplicate_messages=1)
+
+
+def test_drops_messages_with_a_guid_already_read_when_deduplicating():
+    time_range = DateTimeRange(
+        start=datetime(2019, 12, 1, tzinfo=UTC), end=datetime(2020, 1, 1, tzinfo=UTC)
+    )
+    conversation = _build_successful_conversation(
+        conversation_id="abcdefg_1234",
+        ehr_request_started_on=datetime(2019, 12, 30, 18, 2, 29, tzinfo=UTC),
+        ehr_request_completed_on=datetime(2019, 12, 30, 18, 3, 21, tzinfo=UTC),
+        ehr_request_started_acknowledged_on=datetime(2019, 12, 30, 18, 3, 23, tzinfo=UTC),
+        ehr_request_completed_acknowledged_on=datetime(2020, 1, 1, 8, 41, 48, tzinfo=UTC),
+    )
+    retried_completed_ack = conversation[3]._replace(time=datetime(2020, 1, 2, 9, 0, 0, tzinfo=UTC))
+    quality = DataQualityCounters()
+
+    actual = list(
+        parse_transfers_from_messages(
+            conversation + [retried_completed_ack],
+            time_range,
+            quality=quality,
+            deduplicate=True,
+        )
+    )
+
+    assert actual[0].date_completed == datetime(2020, 1, 1, 8, 41, 48, tzinfo=UTC)
+    assert quality.duplicate_messages == 1
+
+
 @freeze_time(datetime(year=2020, month=1, day=15, hour=23, second=42), tz_offset=0)
 def test_calculates_correct_metrics_given_a_successful_transfer():
     time_range = DateTimeRange(
@@ -144,6 +204,7 @@ def test_calculates_correct_metrics_given_a_successful_transfer():
         Transfer(
             conversation_id=conversation_id,
             sla_duration=timedelta(days=1, seconds=52707),
+            sla_band=SlaBand.WITHIN_3_DAYS,
             requesting_practice_asid=requesting_asid_with_transfer,
             sending_practice_asid=sending_asid_with_transfer,
             requesting_supplier=requesting_supplier,
@@ -239,3 +300,42 @@ def test_calculates_correct_national_metrics_given_series_of_messages():
     actual = calculate_national_metrics_data(transfers, time_range)
 
     assert actual == expected
+
+
+def test_attributes_sla_scenario_metrics_to_practice_of_asid_when_requested():
+    time_range = DateTimeRange(
+        start=datetime(2019, 12, 1, tzinfo=UTC), end=datetime(2020, 1, 1, tzinfo=UTC)
+    )
+    practice_list = [
+        PracticeDetails(asids=[], ods_code="A12345", name="Old GP"),
+        PracticeDetails(asids=["121212121212"], ods_code="B56789", name="New GP"),
+    ]
+    moved_on = datetime(2019, 12, 15, tzinfo=UTC)
+    asid_mapping = construct_temporal_asid_mapping(
+        practice_list,
+        [
+            AsidAssignment("121212121212", "A12345", None, moved_on),
+            AsidAssignment("121212121212", "B56789", moved_on, None),
+        ],
+    )
+    transfers = [
+        build_transfer(
+            requesting_practice_asid="121212121212",
+            sla_duration=timedelta(hours=1),
+            status=TransferStatus.INTEGRATED,
+            date_requested=datetime(2019, 12, day, tzinfo=UTC),
+        )
+        for day in [1, 2, 20]
+    ]
+    scenarios = [SlaScenario(name="default", sla_bands=DEFAULT_SLA_BANDS)]
+
+    actual = calculate_sla_scenario_metrics_data(
+        transfers, practice_list, scenarios, time_range, asid_mapping=asid_mapping
+    )
+
+    practices = actual[0].practice_metrics.practices
+    assert [practice.ods_code for practice in practices] == ["A12345", "B56789"]
+    assert [practice.metrics[0].requester.integrated.transfer_count for practice in practices] == [
+        2,
+        1,
+    ]
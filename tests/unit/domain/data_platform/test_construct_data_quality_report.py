@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from dateutil.tz import tzutc
+from freezegun import freeze_time
+
+from prmdata.domain.data_platform.data_quality import (
+    DataQualityPresentation,
+    construct_data_quality_report,
+)
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
+
+
+@freeze_time(datetime(year=2020, month=1, day=2, hour=23, second=42), tz_offset=0)
+def test_constructs_data_quality_report_from_counters():
+    counters = DataQualityCounters(
+        conversations_missing_start=3,
+        duplicate_messages=2,
+        negative_sla_durations=1,
+        unexpected_asids=4,
+    )
+
+    expected = DataQualityPresentation(
+        generated_on=datetime(year=2020, month=1, day=2, hour=23, second=42, tzinfo=tzutc()),
+        year=2019,
+        month=12,
+        conversations_missing_start=3,
+        duplicate_messages=2,
+        negative_sla_durations=1,
+        unexpected_asids=4,
+    )
+
+    actual = construct_data_quality_report(counters, year=2019, month=12)
+
+    assert actual == expected
@@ -4,6 +4,7 @@ import pytest
 from prmdata.domain.gp2gp.sla import (
     assign_to_sla_band,
     SlaBand,
+    SlaBandThreshold,
     THREE_DAYS_IN_SECONDS,
     EIGHT_DAYS_IN_SECONDS,
 )
@@ -13,9 +14,26 @@ from prmdata.domain.gp2gp.sla import (
     "sla_duration, expected",
     [
         (datetime.timedelta(seconds=THREE_DAYS_IN_SECONDS - 1), SlaBand.WITHIN_3_DAYS),
+        (datetime.timedelta(seconds=THREE_DAYS_IN_SECONDS), SlaBand.WITHIN_3_DAYS),
+        (
+            datetime.timedelta(seconds=THREE_DAYS_IN_SECONDS, microseconds=1),
+            SlaBand.WITHIN_8_DAYS,
+        ),
         (datetime.timedelta(seconds=EIGHT_DAYS_IN_SECONDS), SlaBand.WITHIN_8_DAYS),
         (datetime.timedelta(seconds=EIGHT_DAYS_IN_SECONDS + 1), SlaBand.BEYOND_8_DAYS),
     ],
 )
 def test_return_sla_band_given_sla_duration(sla_duration, expected):
     assert assign_to_sla_band(sla_duration=sla_duration) == expected
+
+
+def test_return_sla_band_given_custom_sla_band_thresholds():
+    sla_bands = [
+        SlaBandThreshold(SlaBand.WITHIN_3_DAYS, 3600),
+        SlaBandThreshold(SlaBand.WITHIN_8_DAYS, 7200),
+        SlaBandThreshold(SlaBand.BEYOND_8_DAYS, None),
+    ]
+
+    actual = assign_to_sla_band(sla_duration=datetime.timedelta(minutes=90), sla_bands=sla_bands)
+
+    assert actual == SlaBand.WITHIN_8_DAYS
@@ -1,9 +1,12 @@
 from collections import Counter
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Set, Iterator
 
-import pytest
+from dateutil.tz import tzutc
+
+from prmdata.domain.ods_portal.asid_mapping import AsidAssignment, construct_temporal_asid_mapping
 from prmdata.domain.ods_portal.models import PracticeDetails
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
 from prmdata.domain.gp2gp.practice_metrics import (
     PracticeMetrics,
     calculate_sla_by_practice,
@@ -57,12 +60,18 @@ def test_groups_by_ods_code_given_single_practice_and_no_transfers():
     _assert_has_ods_codes(actual, {"A12345"})
 
 
-def test_warns_about_transfer_with_unexpected_asid():
+def test_counts_unexpected_asids():
     practices = []
-    transfers = [build_transfer(requesting_practice_asid="121212121212")]
+    transfers = [
+        build_transfer(requesting_practice_asid="121212121212"),
+        build_transfer(requesting_practice_asid="121212121212"),
+        build_transfer(requesting_practice_asid="343434343434"),
+    ]
+    quality = DataQualityCounters()
+
+    calculate_sla_by_practice(practices, transfers, quality=quality)
 
-    with pytest.warns(RuntimeWarning):
-        calculate_sla_by_practice(practices, transfers)
+    assert quality.unexpected_asids == 2
 
 
 def test_groups_by_asid_given_two_practices_and_two_transfers_from_different_practices():
@@ -242,3 +251,30 @@ def test_returns_sum_of_all_integrated_transfers():
     actual = list(calculate_sla_by_practice(practice_list, transfers))
 
     assert actual[0].integrated.transfer_count == 3
+
+
+def test_attributes_transfers_to_practice_of_asid_when_requested():
+    practices = [
+        PracticeDetails(asids=[], ods_code="A12345", name=a_string()),
+        PracticeDetails(asids=["121212121212"], ods_code="B56789", name=a_string()),
+    ]
+    moved_on = datetime(2019, 12, 15, tzinfo=tzutc())
+    asid_mapping = construct_temporal_asid_mapping(
+        practices,
+        [
+            AsidAssignment("121212121212", "A12345", None, moved_on),
+            AsidAssignment("121212121212", "B56789", moved_on, None),
+        ],
+    )
+    transfers = [
+        build_transfer(
+            requesting_practice_asid="121212121212",
+            sla_duration=timedelta(hours=1),
+            date_requested=datetime(2019, 12, day, tzinfo=tzutc()),
+        )
+        for day in [1, 2, 20]
+    ]
+
+    actual = calculate_sla_by_practice(practices, transfers, asid_mapping)
+
+    assert [practice.integrated.transfer_count for practice in actual] == [2, 1]
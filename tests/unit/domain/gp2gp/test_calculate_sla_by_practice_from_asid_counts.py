@@ -0,0 +1,47 @@
+from prmdata.domain.gp2gp.asid_counts import AsidTransferCount
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
+from prmdata.domain.gp2gp.practice_metrics import (
+    IntegratedPracticeMetrics,
+    PracticeMetrics,
+    calculate_sla_by_practice_from_asid_counts,
+)
+from prmdata.domain.gp2gp.sla import SlaBand
+from prmdata.domain.gp2gp.transfer import TransferStatus
+from prmdata.domain.ods_portal.models import PracticeDetails
+
+
+def test_sums_integrated_counts_of_every_asid_of_a_practice():
+    practices = [
+        PracticeDetails(asids=["121212121212", "343434343434"], ods_code="A12345", name="A")
+    ]
+    asid_counts = [
+        AsidTransferCount("121212121212", TransferStatus.INTEGRATED, SlaBand.WITHIN_3_DAYS, 2),
+        AsidTransferCount("343434343434", TransferStatus.INTEGRATED, SlaBand.WITHIN_3_DAYS, 3),
+        AsidTransferCount("343434343434", TransferStatus.INTEGRATED, SlaBand.BEYOND_8_DAYS, 1),
+        AsidTransferCount("121212121212", TransferStatus.FAILED, None, 4),
+        AsidTransferCount("121212121212", TransferStatus.PENDING, None, 5),
+    ]
+
+    actual = calculate_sla_by_practice_from_asid_counts(practices, asid_counts)
+
+    assert list(actual) == [
+        PracticeMetrics(
+            ods_code="A12345",
+            name="A",
+            integrated=IntegratedPracticeMetrics(
+                transfer_count=6, within_3_days=5, within_8_days=0, beyond_8_days=1
+            ),
+        )
+    ]
+
+
+def test_counts_unexpected_asids():
+    practices = [PracticeDetails(asids=["121212121212"], ods_code="A12345", name="A")]
+    asid_counts = [
+        AsidTransferCount("999999999999", TransferStatus.INTEGRATED, SlaBand.WITHIN_3_DAYS, 1)
+    ]
+    quality = DataQualityCounters()
+
+    list(calculate_sla_by_practice_from_asid_counts(practices, asid_counts, quality=quality))
+
+    assert quality.unexpected_asids == 1
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from prmdata.domain.gp2gp.national_metrics import calculate_national_metrics
+from prmdata.domain.gp2gp.practice_metrics import IntegratedPracticeMetrics
+from prmdata.domain.gp2gp.sla import DEFAULT_SLA_BANDS, SlaBand, SlaBandThreshold
+from prmdata.domain.gp2gp.sla_scenarios import SlaScenario, calculate_sla_scenario_metrics
+from prmdata.domain.gp2gp.transfer import TransferStatus
+from prmdata.domain.ods_portal.models import PracticeDetails
+from tests.builders.common import a_string
+from tests.builders.gp2gp import (
+    a_failed_transfer,
+    a_pending_transfer,
+    an_integrated_transfer,
+    build_transfer,
+)
+
+
+def _a_scenario(within_3_days_seconds, within_8_days_seconds):
+    return SlaScenario(
+        name=a_string(),
+        sla_bands=[
+            SlaBandThreshold(SlaBand.WITHIN_3_DAYS, within_3_days_seconds),
+            SlaBandThreshold(SlaBand.WITHIN_8_DAYS, within_8_days_seconds),
+            SlaBandThreshold(SlaBand.BEYOND_8_DAYS, None),
+        ],
+    )
+
+
+def _an_integrated_transfer_from(asid, sla_duration):
+    return build_transfer(
+        requesting_practice_asid=asid,
+        sla_duration=sla_duration,
+        status=TransferStatus.INTEGRATED,
+    )
+
+
+def test_counts_transfers_into_each_scenarios_bands():
+    practices = [PracticeDetails(asids=["121212121212"], ods_code="A12345", name=a_string())]
+    transfers = [
+        _an_integrated_transfer_from("121212121212", timedelta(hours=1)),
+        _an_integrated_transfer_from("121212121212", timedelta(days=2)),
+        _an_integrated_transfer_from("121212121212", timedelta(days=5)),
+    ]
+    scenarios = [
+        _a_scenario(within_3_days_seconds=3600, within_8_days_seconds=172800),
+        _a_scenario(within_3_days_seconds=1800, within_8_days_seconds=3600),
+    ]
+
+    actual = calculate_sla_scenario_metrics(transfers, practices, scenarios)
+
+    assert [metrics.practice_metrics[0].integrated for metrics in actual] == [
+        IntegratedPracticeMetrics(
+            transfer_count=3, within_3_days=1, within_8_days=1, beyond_8_days=1
+        ),
+        IntegratedPracticeMetrics(
+            transfer_count=3, within_3_days=0, within_8_days=1, beyond_8_days=2
+        ),
+    ]
+
+
+def test_rounds_partial_seconds_up_before_comparing_with_thresholds():
+    practices = [PracticeDetails(asids=["121212121212"], ods_code="A12345", name=a_string())]
+    transfers = [
+        _an_integrated_transfer_from("121212121212", timedelta(seconds=60, milliseconds=1))
+    ]
+    scenarios = [_a_scenario(within_3_days_seconds=60, within_8_days_seconds=120)]
+
+    actual = calculate_sla_scenario_metrics(transfers, practices, scenarios)
+
+    assert actual[0].practice_metrics[0].integrated.within_8_days == 1
+
+
+def test_only_counts_successful_transfers_from_known_practices():
+    practices = [
+        PracticeDetails(asids=["121212121212"], ods_code="A12345", name=a_string()),
+        PracticeDetails(asids=["343434343434"], ods_code="B56789", name=a_string()),
+    ]
+    transfers = [
+        _an_integrated_transfer_from("343434343434", timedelta(hours=1)),
+        _an_integrated_transfer_from("999999999999", timedelta(hours=1)),
+        build_transfer(requesting_practice_asid="121212121212", status=TransferStatus.FAILED),
+    ]
+    scenarios = [_a_scenario(within_3_days_seconds=7200, within_8_days_seconds=14400)]
+
+    actual = calculate_sla_scenario_metrics(transfers, practices, scenarios)
+
+    assert [practice.integrated.transfer_count for practice in actual[0].practice_metrics] == [
+        0,
+        1,
+    ]
+    assert actual[0].national_metrics.integrated.within_3_days == 2
+
+
+def test_default_thresholds_match_national_metrics():
+    transfers = [
+        an_integrated_transfer(sla_duration=timedelta(days=1)),
+        an_integrated_transfer(sla_duration=timedelta(days=4)),
+        an_integrated_transfer(sla_duration=timedelta(days=9)),
+        a_failed_transfer(),
+        a_pending_transfer(),
+    ]
+    scenarios = [SlaScenario(name="default", sla_bands=DEFAULT_SLA_BANDS)]
+
+    actual = calculate_sla_scenario_metrics(transfers, [], scenarios)
+
+    assert actual[0].national_metrics == calculate_national_metrics(transfers)
+
+
+def test_returns_no_metrics_without_scenarios():
+    actual = calculate_sla_scenario_metrics([an_integrated_transfer()], [], [])
+
+    assert actual == []
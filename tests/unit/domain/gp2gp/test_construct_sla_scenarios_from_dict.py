@@ -0,0 +1,35 @@
+import pytest
+
+from prmdata.domain.gp2gp.sla import SlaBand, SlaBandThreshold
+from prmdata.domain.gp2gp.sla_scenarios import SlaScenario, construct_sla_scenarios_from_dict
+
+
+def test_constructs_scenario_with_three_bands():
+    data = {"scenarios": [{"name": "two-and-ten-days", "thresholds_in_seconds": [172800, 864000]}]}
+
+    actual = construct_sla_scenarios_from_dict(data)
+
+    assert actual == [
+        SlaScenario(
+            name="two-and-ten-days",
+            sla_bands=[
+                SlaBandThreshold(SlaBand.WITHIN_3_DAYS, 172800),
+                SlaBandThreshold(SlaBand.WITHIN_8_DAYS, 864000),
+                SlaBandThreshold(SlaBand.BEYOND_8_DAYS, None),
+            ],
+        )
+    ]
+
+
+def test_rejects_descending_thresholds():
+    data = {"scenarios": [{"name": "descending", "thresholds_in_seconds": [864000, 172800]}]}
+
+    with pytest.raises(ValueError):
+        construct_sla_scenarios_from_dict(data)
+
+
+def test_rejects_name_that_is_not_safe_in_a_file_name():
+    data = {"scenarios": [{"name": "../escape", "thresholds_in_seconds": [1, 2]}]}
+
+    with pytest.raises(ValueError):
+        construct_sla_scenarios_from_dict(data)
@@ -0,0 +1,34 @@
+from prmdata.domain.gp2gp.asid_counts import (
+    AsidTransferCount,
+    convert_asid_counts_to_table,
+    convert_table_to_asid_counts,
+)
+from prmdata.domain.gp2gp.sla import SlaBand
+from prmdata.domain.gp2gp.transfer import TransferStatus
+
+
+def test_converts_asid_counts_to_columns():
+    asid_counts = [
+        AsidTransferCount("121212121212", TransferStatus.INTEGRATED, SlaBand.WITHIN_3_DAYS, 4),
+        AsidTransferCount("343434343434", TransferStatus.FAILED, None, 1),
+    ]
+
+    actual = convert_asid_counts_to_table(asid_counts)
+
+    assert actual.to_pydict() == {
+        "requesting_practice_asid": ["121212121212", "343434343434"],
+        "status": ["INTEGRATED", "FAILED"],
+        "sla_band": ["WITHIN_3_DAYS", None],
+        "transfer_count": [4, 1],
+    }
+
+
+def test_converts_table_back_to_asid_counts():
+    asid_counts = [
+        AsidTransferCount("121212121212", TransferStatus.INTEGRATED, SlaBand.BEYOND_8_DAYS, 2),
+        AsidTransferCount("121212121212", TransferStatus.PENDING_WITH_ERROR, None, 3),
+    ]
+
+    actual = convert_table_to_asid_counts(convert_asid_counts_to_table(asid_counts))
+
+    assert list(actual) == asid_counts
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from dateutil.tz import tzutc
+
+from prmdata.domain.gp2gp.sla import SlaBand
+from prmdata.domain.gp2gp.transfer import (
+    TransferStatus,
+    convert_table_to_transfers,
+    convert_transfers_to_table,
+)
+from tests.builders.gp2gp import build_transfer
+
+
+def _round_trip(transfers):
+    return list(convert_table_to_transfers(convert_transfers_to_table(transfers)))
+
+
+def test_round_trips_transfer_with_whole_second_duration():
+    transfer = build_transfer(
+        sla_duration=timedelta(days=2, seconds=5),
+        requesting_supplier="EMIS",
+        sending_supplier="Vision",
+        sender_error_code=10,
+        final_error_code=30,
+        intermediate_error_codes=[20, 25],
+        status=TransferStatus.FAILED,
+        date_requested=datetime(2019, 12, 1, 10, 30, 5, 123000, tzinfo=tzutc()),
+        date_completed=datetime(2019, 12, 3, 10, 30, 10, 456000, tzinfo=tzutc()),
+    )
+
+    assert _round_trip([transfer]) == [transfer]
+
+
+def test_round_trips_pending_transfer_without_duration_or_completion():
+    transfer = build_transfer(
+        sla_duration=None,
+        status=TransferStatus.PENDING,
+        date_requested=datetime(2019, 12, 1, tzinfo=tzutc()),
+        date_completed=None,
+    )
+
+    assert _round_trip([transfer]) == [transfer]
+
+
+def test_assigns_sla_band_from_stored_duration():
+    transfer = build_transfer(sla_duration=timedelta(days=5))
+
+    actual = _round_trip([transfer])
+
+    assert actual[0].sla_band == SlaBand.WITHIN_8_DAYS
+
+
+def test_keeps_sla_band_of_fractional_duration_just_over_band_limit():
+    transfer = build_transfer(
+        sla_duration=timedelta(days=3, milliseconds=400), sla_band=SlaBand.WITHIN_8_DAYS
+    )
+
+    actual = _round_trip([transfer])
+
+    assert actual[0].sla_band == SlaBand.WITHIN_8_DAYS
+
+
+def test_keeps_fractional_duration():
+    transfer = build_transfer(sla_duration=timedelta(days=3, milliseconds=400))
+
+    actual = _round_trip([transfer])
+
+    assert actual[0].sla_duration == timedelta(days=3, milliseconds=400)
+
+
+def test_reads_whole_second_duration_of_table_without_microseconds_column():
+    transfer = build_transfer(sla_duration=timedelta(days=3, milliseconds=400))
+    table = convert_transfers_to_table([transfer])
+    table = table.remove_column(table.schema.get_field_index("sla_duration_microseconds"))
+
+    actual = list(convert_table_to_transfers(table))
+
+    assert actual[0].sla_duration == timedelta(days=3)
+    assert actual[0].sla_band == SlaBand.WITHIN_3_DAYS
+
+
+def test_throws_value_error_given_transfer_without_date_requested():
+    table = convert_transfers_to_table([build_transfer(date_requested=None)])
+
+    with pytest.raises(ValueError):
+        list(convert_table_to_transfers(table))
@@ -52,6 +52,19 @@ def test_sla_duration_is_converted_to_column_when_missing():
     assert actual_sla_duration_column == expected_sla_duration_column
 
 
+def test_sla_duration_is_converted_to_microseconds_column():
+    transfer = build_transfer(
+        sla_duration=timedelta(days=2, hours=1, minutes=3, seconds=6, milliseconds=1)
+    )
+
+    expected_sla_duration_column = {"sla_duration_microseconds": [176586001000]}
+
+    table = convert_transfers_to_table([transfer])
+    actual_sla_duration_column = table.select(["sla_duration_microseconds"]).to_pydict()
+
+    assert actual_sla_duration_column == expected_sla_duration_column
+
+
 def test_requesting_practice_asid_is_converted_to_column():
     transfer = build_transfer(requesting_practice_asid="003212345678")
 
@@ -206,6 +219,7 @@ def test_table_has_correct_schema():
         [
             ("conversation_id", pa.string()),
             ("sla_duration", pa.uint64()),
+            ("sla_duration_microseconds", pa.uint64()),
             ("requesting_practice_asid", pa.string()),
             ("sending_practice_asid", pa.string()),
             ("requesting_supplier", pa.string()),
@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from prmdata.domain.gp2gp.asid_counts import AsidTransferCount, count_transfers_by_asid
+from prmdata.domain.gp2gp.sla import SlaBand
+from prmdata.domain.gp2gp.transfer import TransferStatus
+from tests.builders.gp2gp import build_transfer
+
+
+def test_counts_transfers_by_asid_status_and_sla_band():
+    transfers = [
+        build_transfer(
+            requesting_practice_asid="121212121212",
+            status=TransferStatus.INTEGRATED,
+            sla_duration=timedelta(hours=1),
+        ),
+        build_transfer(
+            requesting_practice_asid="121212121212",
+            status=TransferStatus.INTEGRATED,
+            sla_duration=timedelta(hours=2),
+        ),
+        build_transfer(
+            requesting_practice_asid="121212121212",
+            status=TransferStatus.INTEGRATED,
+            sla_duration=timedelta(days=5),
+        ),
+        build_transfer(
+            requesting_practice_asid="343434343434",
+            status=TransferStatus.PENDING,
+            sla_duration=None,
+        ),
+    ]
+
+    actual = count_transfers_by_asid(transfers)
+
+    assert sorted(actual, key=lambda c: c.transfer_count) == [
+        AsidTransferCount("121212121212", TransferStatus.INTEGRATED, SlaBand.WITHIN_8_DAYS, 1),
+        AsidTransferCount("343434343434", TransferStatus.PENDING, None, 1),
+        AsidTransferCount("121212121212", TransferStatus.INTEGRATED, SlaBand.WITHIN_3_DAYS, 2),
+    ]
+
+
+def test_returns_no_counts_without_transfers():
+    assert count_transfers_by_asid([]) == []
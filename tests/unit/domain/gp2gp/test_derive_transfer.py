@@ -1,9 +1,10 @@
 from datetime import datetime, timedelta
 from typing import List, Iterator
 
-import pytest
 from tests.builders.spine import build_parsed_conversation, build_message
 from tests.builders.common import a_datetime
+from prmdata.domain.gp2gp.data_quality import DataQualityCounters
+from prmdata.domain.gp2gp.sla import SlaBand
 from prmdata.domain.gp2gp.transfer import (
     Transfer,
     TransferStatus,
@@ -47,6 +48,41 @@ def test_produces_sla_of_successful_conversation():
     _assert_attributes("sla_duration", actual, expected_sla_durations)
 
 
+def test_assigns_sla_band_of_successful_conversation():
+    conversations = [
+        build_parsed_conversation(
+            request_started=build_message(),
+            request_completed=build_message(
+                time=datetime(year=2020, month=6, day=1, hour=12, minute=42, second=0),
+            ),
+            request_completed_ack=build_message(
+                time=datetime(year=2020, month=6, day=5, hour=13, minute=52, second=0),
+                error_code=None,
+            ),
+        )
+    ]
+
+    actual = derive_transfers(conversations)
+
+    expected_sla_bands = [SlaBand.WITHIN_8_DAYS]
+
+    _assert_attributes("sla_band", actual, expected_sla_bands)
+
+
+def test_produces_no_sla_band_given_pending_request_completed_ack():
+    conversations = [
+        build_parsed_conversation(
+            request_started=build_message(),
+            request_completed=build_message(),
+            request_completed_ack=None,
+        )
+    ]
+
+    actual = derive_transfers(conversations)
+
+    _assert_attributes("sla_band", actual, [None])
+
+
 def test_produces_no_sla_given_pending_ehr_completed():
     conversations = [
         build_parsed_conversation(
@@ -158,8 +194,9 @@ def test_extracts_conversation_ids_for_conversations():
 
 
 def test_intermediate_error_code_is_empty_list_if_no_errors():
-    intermediate_messages = [build_message(), build_message(), build_message()]
-    conversations = [build_parsed_conversation(intermediate_messages=intermediate_messages)]
+    conversations = [
+        build_parsed_conversation(intermediate_error_codes=[], intermediate_message_count=3)
+    ]
 
     actual = derive_transfers(conversations)
 
@@ -169,8 +206,9 @@ def test_intermediate_error_code_is_empty_list_if_no_errors():
 
 
 def test_extracts_an_intermediate_message_error_code():
-    intermediate_messages = [build_message(error_code=20)]
-    conversations = [build_parsed_conversation(intermediate_messages=intermediate_messages)]
+    conversations = [
+        build_parsed_conversation(intermediate_error_codes=[20], intermediate_message_count=1)
+    ]
 
     actual = derive_transfers(conversations)
 
@@ -180,12 +218,9 @@ def test_extracts_an_intermediate_message_error_code():
 
 
 def test_extracts_multiple_intermediate_message_error_codes():
-    intermediate_messages = [
-        build_message(error_code=11),
-        build_message(),
-        build_message(error_code=10),
+    conversations = [
+        build_parsed_conversation(intermediate_error_codes=[11, 10], intermediate_message_count=3)
     ]
-    conversations = [build_parsed_conversation(intermediate_messages=intermediate_messages)]
 
     actual = derive_transfers(conversations)
 
@@ -224,7 +259,8 @@ def test_has_pending_status_if_no_final_ack_and_no_intermediate_error():
     conversations = [
         build_parsed_conversation(
             request_started=build_message(),
-            intermediate_messages=[build_message(error_code=None)],
+            intermediate_error_codes=[],
+            intermediate_message_count=1,
             request_completed_ack=None,
         )
     ]
@@ -289,7 +325,8 @@ def test_has_pending_with_error_status_if_error_in_intermediate_message():
         build_parsed_conversation(
             request_started=build_message(),
             request_completed=build_message(),
-            intermediate_messages=[build_message(error_code=30)],
+            intermediate_error_codes=[30],
+            intermediate_message_count=1,
             request_completed_ack=None,
         )
     ]
@@ -307,7 +344,7 @@ def test_has_pending_with_error_status_if_error_in_request_acknowledgement():
             request_started=build_message(),
             request_started_ack=build_message(error_code=10),
             request_completed=build_message(),
-            intermediate_messages=[],
+            intermediate_error_codes=[],
             request_completed_ack=None,
         )
     ]
@@ -403,7 +440,7 @@ def test_negative_sla_duration_clamped_to_zero():
     _assert_attributes("sla_duration", actual, [expected_sla])
 
 
-def test_warns_about_conversation_with_negative_sla():
+def test_counts_conversation_with_negative_sla():
     conversations = [
         build_parsed_conversation(
             request_started=build_message(),
@@ -411,6 +448,9 @@ def test_warns_about_conversation_with_negative_sla():
             request_completed_ack=build_message(time=datetime(year=2021, month=1, day=4)),
         )
     ]
+    quality = DataQualityCounters()
+
+    actual = derive_transfers(conversations, quality)
 
-    with pytest.warns(RuntimeWarning):
-        list(derive_transfers(conversations))
+    _assert_attributes("sla_duration", actual, [timedelta(0)])
+    assert quality.negative_sla_durations == 1
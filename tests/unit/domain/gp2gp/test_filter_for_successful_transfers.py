@@ -5,6 +5,7 @@ from prmdata.domain.gp2gp.transfer import (
     TransferStatus,
     filter_for_successful_transfers,
 )
+from prmdata.domain.gp2gp.sla import SlaBand
 from tests.builders.gp2gp import build_transfer
 from tests.builders.common import a_datetime
 
@@ -34,6 +35,7 @@ def test_includes_successful_transfer():
         Transfer(
             conversation_id="123",
             sla_duration=timedelta(hours=1),
+            sla_band=SlaBand.WITHIN_3_DAYS,
             requesting_practice_asid="121212121212",
             sending_practice_asid="343434343434",
             requesting_supplier="EMIS",
@@ -72,6 +74,7 @@ def test_includes_suppressed_transfers():
         Transfer(
             conversation_id="456",
             sla_duration=timedelta(hours=2),
+            sla_band=SlaBand.WITHIN_3_DAYS,
             requesting_practice_asid="121212121212",
             sending_practice_asid="343434343434",
             requesting_supplier="Vision",
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+from dateutil.tz import tzutc
+
+from prmdata.domain.gp2gp.dataset import read_transfer_dataset, write_transfer_dataset
+from prmdata.domain.gp2gp.transfer import TransferStatus, convert_transfers_to_table
+from prmdata.utils.date.range import DateTimeRange
+from prmdata.utils.io.parquet import resolve_filesystem
+from tests.builders.gp2gp import build_transfer
+
+
+def _write(transfers, directory, year, month, partition_by_status=False):
+    filesystem, root_path = resolve_filesystem(str(directory))
+    write_transfer_dataset(
+        convert_transfers_to_table(transfers),
+        filesystem,
+        root_path,
+        year=year,
+        month=month,
+        partition_by_status=partition_by_status,
+    )
+    return filesystem, root_path
+
+
+def _month_range(year, month, month_count=1):
+    start = datetime(year, month, 1, tzinfo=tzutc())
+    end = datetime(year + (month + month_count - 1) // 12, (month + month_count - 1) % 12 + 1, 1)
+    return DateTimeRange(start, end.replace(tzinfo=tzutc()))
+
+
+def _conversation_ids(table):
+    return sorted(table.column("conversation_id").to_pylist())
+
+
+def test_writes_month_partition_with_deterministic_file_name(tmp_path):
+    _write([build_transfer()], tmp_path, year=2019, month=12)
+
+    assert (tmp_path / "year=2019" / "month=12" / "part-0.parquet").exists()
+
+
+def test_writes_one_file_per_status_when_partitioning_by_status(tmp_path):
+    transfers = [
+        build_transfer(status=TransferStatus.INTEGRATED),
+        build_transfer(status=TransferStatus.FAILED),
+    ]
+
+    _write(transfers, tmp_path, year=2019, month=12, partition_by_status=True)
+
+    month_path = tmp_path / "year=2019" / "month=12"
+    assert sorted(p.name for p in month_path.iterdir()) == ["status=FAILED", "status=INTEGRATED"]
+
+
+def test_rewriting_a_month_replaces_only_that_month(tmp_path):
+    _write([build_transfer(conversation_id="nov")], tmp_path, year=2019, month=11)
+    _write([build_transfer(conversation_id="old-dec")], tmp_path, year=2019, month=12)
+    filesystem, root_path = _write(
+        [build_transfer(conversation_id="new-dec")], tmp_path, year=2019, month=12
+    )
+
+    actual = read_transfer_dataset(filesystem, root_path, _month_range(2019, 11, month_count=2))
+
+    assert _conversation_ids(actual) == ["new-dec", "nov"]
+    assert [p.name for p in (tmp_path / "year=2019").iterdir() if p.name.startswith("_")] == []
+
+
+def test_reads_only_months_within_time_range(tmp_path):
+    _write([build_transfer(conversation_id="nov")], tmp_path, year=2019, month=11)
+    _write([build_transfer(conversation_id="dec")], tmp_path, year=2019, month=12)
+    filesystem, root_path = _write(
+        [build_transfer(conversation_id="jan")], tmp_path, year=2020, month=1
+    )
+
+    actual = read_transfer_dataset(filesystem, root_path, _month_range(2019, 12, month_count=2))
+
+    assert _conversation_ids(actual) == ["dec", "jan"]
+
+
+def test_reads_transfers_with_the_table_schema(tmp_path):
+    transfers = [build_transfer(status=TransferStatus.FAILED)]
+    filesystem, root_path = _write(transfers, tmp_path, year=2019, month=12)
+
+    actual = read_transfer_dataset(filesystem, root_path, _month_range(2019, 12))
+
+    assert actual.to_pydict() == convert_transfers_to_table(transfers).to_pydict()
+
+
+def test_reads_only_requested_statuses(tmp_path):
+    transfers = [
+        build_transfer(conversation_id="integrated", status=TransferStatus.INTEGRATED),
+        build_transfer(conversation_id="failed", status=TransferStatus.FAILED),
+    ]
+    filesystem, root_path = _write(transfers, tmp_path, 2019, 12, partition_by_status=True)
+    _write([build_transfer(conversation_id="pending")], tmp_path, year=2020, month=1)
+
+    actual = read_transfer_dataset(
+        filesystem,
+        root_path,
+        _month_range(2019, 12, month_count=2),
+        statuses=[TransferStatus.FAILED, TransferStatus.PENDING],
+    )
+
+    assert _conversation_ids(actual) == ["failed", "pending"]
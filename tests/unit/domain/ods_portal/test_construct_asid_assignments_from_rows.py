@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from dateutil.tz import tzutc
+
+from prmdata.domain.ods_portal.asid_mapping import (
+    AsidAssignment,
+    construct_asid_assignments_from_rows,
+)
+
+
+def test_constructs_assignment_with_open_ended_validity():
+    rows = [{"ASID": "121212121212", "NACS": "A12345", "ValidFrom": "", "ValidTo": ""}]
+
+    actual = construct_asid_assignments_from_rows(rows)
+
+    assert actual == [AsidAssignment("121212121212", "A12345", None, None)]
+
+
+def test_parses_validity_times_as_utc():
+    rows = [
+        {
+            "ASID": "121212121212",
+            "NACS": "A12345",
+            "ValidFrom": "2019-12-01",
+            "ValidTo": "2020-01-01T12:00:00+00:00",
+        }
+    ]
+
+    actual = construct_asid_assignments_from_rows(rows)
+
+    assert actual == [
+        AsidAssignment(
+            "121212121212",
+            "A12345",
+            datetime(2019, 12, 1, tzinfo=tzutc()),
+            datetime(2020, 1, 1, 12, tzinfo=tzutc()),
+        )
+    ]
@@ -0,0 +1,15 @@
+from prmdata.domain.ods_portal.sources import construct_asid_to_ods_mappings
+
+
+def test_groups_asids_by_ods_code():
+    asid_lookup = [
+        {"ASID": "123456789123", "NACS": "A12345"},
+        {"ASID": "223456789123", "NACS": "B56789"},
+        {"ASID": "323456789123", "NACS": "A12345"},
+    ]
+
+    expected = {"A12345": ["123456789123", "323456789123"], "B56789": ["223456789123"]}
+
+    actual = construct_asid_to_ods_mappings(asid_lookup)
+
+    assert actual == expected
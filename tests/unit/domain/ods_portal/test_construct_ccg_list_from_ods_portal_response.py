@@ -0,0 +1,18 @@
+from prmdata.domain.ods_portal.models import CcgDetails
+from prmdata.domain.ods_portal.sources import construct_ccg_list_from_ods_portal_response
+
+
+def test_returns_ccgs():
+    organisations = [
+        {"Name": "NHS Airedale CCG", "OrgId": "02N"},
+        {"Name": "NHS Bradford CCG", "OrgId": "02W"},
+    ]
+
+    expected = [
+        CcgDetails(ods_code="02N", name="NHS Airedale CCG"),
+        CcgDetails(ods_code="02W", name="NHS Bradford CCG"),
+    ]
+
+    actual = construct_ccg_list_from_ods_portal_response(organisations)
+
+    assert actual == expected
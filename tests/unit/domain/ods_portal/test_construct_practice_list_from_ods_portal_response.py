@@ -0,0 +1,31 @@
+from prmdata.domain.ods_portal.models import PracticeDetails
+from prmdata.domain.ods_portal.sources import construct_practice_list_from_ods_portal_response
+
+
+def test_returns_practices_with_their_asids():
+    organisations = [
+        {"Name": "GP Practice", "OrgId": "A12345"},
+        {"Name": "GP Practice 2", "OrgId": "B56789"},
+    ]
+    asid_mappings = {"A12345": ["123456789123", "223456789123"], "B56789": ["323456789123"]}
+
+    expected = [
+        PracticeDetails(
+            ods_code="A12345", name="GP Practice", asids=["123456789123", "223456789123"]
+        ),
+        PracticeDetails(ods_code="B56789", name="GP Practice 2", asids=["323456789123"]),
+    ]
+
+    actual = construct_practice_list_from_ods_portal_response(organisations, asid_mappings)
+
+    assert actual == expected
+
+
+def test_returns_practice_without_asids_when_no_mapping_exists():
+    organisations = [{"Name": "GP Practice", "OrgId": "A12345"}]
+
+    expected = [PracticeDetails(ods_code="A12345", name="GP Practice", asids=[])]
+
+    actual = construct_practice_list_from_ods_portal_response(organisations, {})
+
+    assert actual == expected
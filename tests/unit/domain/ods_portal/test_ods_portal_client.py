@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from prmdata.domain.ods_portal.sources import OdsPortalClient, OdsPortalException
+from prmdata.utils.io.http import HttpResponseCache, build_request_url
+from tests.builders.ods_portal import build_mock_response, build_ods_portal_page
+
+SEARCH_URL = "https://ods.example.com/organisations"
+SEARCH_PARAMS = {"PrimaryRoleId": "RO177"}
+
+
+def _build_client(session, page_size=2, cache=None):
+    return OdsPortalClient(
+        session=session,
+        executor=ThreadPoolExecutor(max_workers=2),
+        rate_limiter=MagicMock(),
+        search_url=SEARCH_URL,
+        page_size=page_size,
+        cache=cache,
+    )
+
+
+def _build_paged_session(pages, total_count):
+    def get(url, params, headers):
+        page = pages[params["Offset"] // params["Limit"]]
+        response = build_mock_response(content=build_ods_portal_page(page), total_count=total_count)
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+
+def test_fetches_every_page_in_order():
+    pages = [
+        [("A12345", "GP 1"), ("B12345", "GP 2")],
+        [("C12345", "GP 3"), ("D12345", "GP 4")],
+        [("E12345", "GP 5")],
+    ]
+    session = _build_paged_session(pages, total_count=5)
+
+    expected = [{"Name": f"GP {i}", "OrgId": f"{c}12345"} for i, c in enumerate("ABCDE", 1)]
+
+    actual = _build_client(session).fetch_organisations(SEARCH_PARAMS)
+
+    assert actual == expected
+    assert session.get.call_count == 3
+
+
+def test_requests_pages_with_offset_and_limit():
+    pages = [[("A12345", "GP 1"), ("B12345", "GP 2")], [("C12345", "GP 3")]]
+    session = _build_paged_session(pages, total_count=3)
+
+    _build_client(session).fetch_organisations(SEARCH_PARAMS)
+
+    requested_params = sorted(
+        (call.kwargs["params"] for call in session.get.call_args_list),
+        key=lambda params: params["Offset"],
+    )
+    assert requested_params == [
+        {"PrimaryRoleId": "RO177", "Limit": 2, "Offset": 0},
+        {"PrimaryRoleId": "RO177", "Limit": 2, "Offset": 2},
+    ]
+
+
+def test_fetches_single_page_when_total_count_is_missing():
+    session = MagicMock()
+    session.get.return_value = build_mock_response(
+        content=build_ods_portal_page([("A12345", "GP 1"), ("B12345", "GP 2")])
+    )
+
+    actual = _build_client(session).fetch_organisations(SEARCH_PARAMS)
+
+    assert len(actual) == 2
+    assert session.get.call_count == 1
+
+
+def test_waits_for_rate_limiter_before_every_request():
+    pages = [[("A12345", "GP 1")], [("B12345", "GP 2")], [("C12345", "GP 3")]]
+    session = _build_paged_session(pages, total_count=3)
+    client = _build_client(session, page_size=1)
+    rate_limiter = client._rate_limiter
+
+    client.fetch_organisations(SEARCH_PARAMS)
+
+    assert rate_limiter.wait.call_count == 3
+
+
+def test_throws_ods_portal_exception_given_unsuccessful_response():
+    session = MagicMock()
+    session.get.return_value = build_mock_response(content=b"Not found", status_code=404)
+
+    with pytest.raises(OdsPortalException) as exception:
+        _build_client(session).fetch_organisations(SEARCH_PARAMS)
+
+    assert exception.value.status_code == 404
+    assert exception.value.content == b"Not found"
+
+
+def test_serves_pages_from_cache_without_sending_requests(tmp_path):
+    pages = [[("A12345", "GP 1"), ("B12345", "GP 2")], [("C12345", "GP 3")]]
+    session = _build_paged_session(pages, total_count=3)
+    cache = HttpResponseCache(str(tmp_path), ttl=timedelta(days=1), max_age=timedelta(days=30))
+    client = _build_client(session, cache=cache)
+    client.fetch_organisations(SEARCH_PARAMS)
+
+    actual = client.fetch_organisations(SEARCH_PARAMS)
+
+    assert [organisation["OrgId"] for organisation in actual] == ["A12345", "B12345", "C12345"]
+    assert session.get.call_count == 2
+
+
+def _cache_page(cache, session, offset):
+    params = {**SEARCH_PARAMS, "Limit": 2, "Offset": offset}
+    cache.get(
+        build_request_url(SEARCH_URL, params),
+        lambda headers: session.get(SEARCH_URL, params=params, headers=headers),
+    )
+
+
+def test_revalidates_every_page_when_first_page_is_stale(tmp_path):
+    pages = [[("A12345", "GP 1"), ("B12345", "GP 2")], [("C12345", "GP 3")]]
+    session = _build_paged_session(pages, total_count=3)
+    clock = MagicMock(return_value=1600000000.0)
+    cache = HttpResponseCache(
+        str(tmp_path), ttl=timedelta(days=1), max_age=timedelta(days=30), clock=clock
+    )
+    _cache_page(cache, session, offset=0)
+    clock.return_value += 12 * 60 * 60
+    _cache_page(cache, session, offset=2)
+    clock.return_value += 18 * 60 * 60
+    session.get.reset_mock()
+
+    _build_client(session, cache=cache).fetch_organisations(SEARCH_PARAMS)
+
+    requested_offsets = sorted(
+        call.kwargs["params"]["Offset"] for call in session.get.call_args_list
+    )
+    assert requested_offsets == [0, 2]
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+from dateutil.tz import tzutc
+
+from prmdata.domain.ods_portal.asid_mapping import AsidAssignment, TemporalAsidMapping
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=tzutc())
+
+
+def test_resolves_asid_to_ods_code_valid_at_time():
+    mapping = TemporalAsidMapping(
+        [
+            AsidAssignment("121212121212", "A12345", None, _utc(2019, 12, 15)),
+            AsidAssignment("121212121212", "B56789", _utc(2019, 12, 15), None),
+        ]
+    )
+
+    assert mapping.lookup("121212121212", _utc(2019, 12, 14, 23, 59)) == "A12345"
+    assert mapping.lookup("121212121212", _utc(2019, 12, 15)) == "B56789"
+
+
+def test_resolves_nothing_between_assignments():
+    mapping = TemporalAsidMapping(
+        [
+            AsidAssignment("121212121212", "A12345", _utc(2019, 1, 1), _utc(2019, 6, 1)),
+            AsidAssignment("121212121212", "B56789", _utc(2019, 9, 1), _utc(2020, 1, 1)),
+        ]
+    )
+
+    assert mapping.lookup("121212121212", _utc(2018, 12, 31)) is None
+    assert mapping.lookup("121212121212", _utc(2019, 7, 1)) is None
+    assert mapping.lookup("121212121212", _utc(2020, 1, 1)) is None
+
+
+def test_falls_back_for_asids_without_assignments():
+    mapping = TemporalAsidMapping(
+        [AsidAssignment("121212121212", "A12345", None, None)],
+        fallback={"343434343434": "B56789", "121212121212": "C00000"},
+    )
+
+    assert mapping.lookup("343434343434", _utc(2019, 12, 1)) == "B56789"
+    assert mapping.lookup("121212121212", _utc(2019, 12, 1)) == "A12345"
+    assert mapping.lookup("999999999999", _utc(2019, 12, 1)) is None
+
+
+def test_looks_up_many_asids_and_times():
+    mapping = TemporalAsidMapping(
+        [
+            AsidAssignment("121212121212", "A12345", None, _utc(2019, 12, 15)),
+            AsidAssignment("121212121212", "B56789", _utc(2019, 12, 15), None),
+        ],
+        fallback={"343434343434": "C00000"},
+    )
+
+    actual = mapping.lookup_many(
+        ["121212121212", "343434343434", "121212121212"],
+        [_utc(2019, 12, 20), _utc(2019, 12, 1), _utc(2019, 12, 1)],
+    )
+
+    assert actual == ["B56789", "C00000", "A12345"]
+
+
+def test_rejects_overlapping_assignments():
+    with pytest.raises(ValueError):
+        TemporalAsidMapping(
+            [
+                AsidAssignment("121212121212", "A12345", None, _utc(2019, 12, 20)),
+                AsidAssignment("121212121212", "B56789", _utc(2019, 12, 15), None),
+            ]
+        )
@@ -1,5 +1,7 @@
 from datetime import datetime
 
+import pytest
+from dateutil.parser import isoparse
 from dateutil.tz import tzutc
 
 from prmdata.domain.spine.message import Message, construct_messages_from_splunk_items
@@ -101,3 +103,23 @@ def test_returns_correct_message_when_from_system_and_to_system_is_not_present()
     actual = construct_messages_from_splunk_items(items)
 
     assert list(actual) == expected
+
+
+@pytest.mark.parametrize(
+    "time",
+    [
+        "2019-12-31T23:37:55.334+0000",
+        "2019-12-31T23:37:55+0000",
+        "2019-12-31T23:37:55.334512Z",
+        "2019-12-31T23:37:55.3+00:00",
+        "2019-12-31T23:37:55.334+0100",
+        "2019-12-31 23:37:55.334+0000",
+    ],
+)
+def test_parses_message_time_as_isoparse_does(time):
+    items = [build_spine_item(time=time)]
+
+    actual = next(construct_messages_from_splunk_items(items))
+
+    assert actual.time == isoparse(time)
+    assert actual.time.utcoffset() == isoparse(time).utcoffset()
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pyarrow as pa
+from dateutil.tz import tzutc
+
+from prmdata.domain.spine.message import (
+    MESSAGE_TABLE_SCHEMA,
+    construct_messages_from_table,
+    convert_messages_to_table,
+)
+from tests.builders.spine import build_message
+
+
+def test_converts_messages_to_typed_table():
+    message = build_message(
+        time=datetime(2019, 12, 1, 8, 41, 48, 337000, tzinfo=tzutc()),
+        conversation_id="abc",
+        guid="def",
+        interaction_id="urn:nhs:names:services:gp2gp/RCMR_IN010000UK05",
+        from_party_asid="123456789123",
+        to_party_asid="003456789123",
+        message_ref="abc",
+        error_code=30,
+        from_system="EMIS",
+        to_system=None,
+    )
+
+    actual = convert_messages_to_table([message])
+
+    assert actual.schema == MESSAGE_TABLE_SCHEMA
+    assert actual.to_pydict() == {
+        "time": [datetime(2019, 12, 1, 8, 41, 48, 337000, tzinfo=tzutc())],
+        "conversation_id": ["abc"],
+        "guid": ["def"],
+        "interaction_id": ["urn:nhs:names:services:gp2gp/RCMR_IN010000UK05"],
+        "from_party_asid": ["123456789123"],
+        "to_party_asid": ["003456789123"],
+        "message_ref": ["abc"],
+        "error_code": [30],
+        "from_system": ["EMIS"],
+        "to_system": [None],
+    }
+
+
+def test_converted_table_round_trips_to_messages():
+    messages = [
+        build_message(time=datetime(2019, 12, 1, tzinfo=tzutc()), error_code=None),
+        build_message(time=datetime(2019, 12, 2, 18, 2, 29, 985000, tzinfo=tzutc())),
+    ]
+
+    actual = list(construct_messages_from_table(convert_messages_to_table(messages)))
+
+    assert actual == messages
+    assert actual[0].time.tzinfo == tzutc()
+
+
+def test_converts_empty_message_list():
+    actual = convert_messages_to_table([])
+
+    assert actual.num_rows == 0
+    assert actual.schema.field("time").type == pa.timestamp("us", tz="UTC")
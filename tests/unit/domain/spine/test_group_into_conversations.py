@@ -1,6 +1,10 @@
 from datetime import datetime
 
-from prmdata.domain.spine.conversation import Conversation, group_into_conversations
+from prmdata.domain.spine.conversation import (
+    Conversation,
+    ConversationGroupingCounters,
+    group_into_conversations,
+)
 from tests.builders.spine import build_message
 
 
@@ -38,3 +42,44 @@ def test_group_into_conversations_sorts_messages_within_conversations():
     actual = group_into_conversations(messages)
 
     assert list(actual) == expected
+
+
+def test_group_into_conversations_keeps_order_of_messages_with_the_same_time():
+    time = datetime(year=2020, month=6, day=5)
+    message_one = build_message(conversation_id="abc", time=datetime(year=2020, month=6, day=6))
+    message_two = build_message(conversation_id="abc", time=time)
+    message_three = build_message(conversation_id="abc", time=time)
+    messages = [message_one, message_two, message_three]
+
+    expected = [Conversation("abc", [message_two, message_three, message_one])]
+
+    actual = group_into_conversations(messages)
+
+    assert list(actual) == expected
+
+
+def test_group_into_conversations_counts_conversations_that_needed_sorting():
+    messages = [
+        build_message(conversation_id="abc", time=datetime(year=2020, month=6, day=5)),
+        build_message(conversation_id="xyz", time=datetime(year=2020, month=6, day=7)),
+        build_message(conversation_id="abc", time=datetime(year=2020, month=6, day=6)),
+        build_message(conversation_id="xyz", time=datetime(year=2020, month=6, day=6)),
+    ]
+    counters = ConversationGroupingCounters()
+
+    list(group_into_conversations(messages, counters))
+
+    assert counters == ConversationGroupingCounters(
+        conversation_count=2, sorted_conversation_count=1, peak_open_conversation_count=2
+    )
+
+
+def test_group_into_conversations_does_not_sort_messages_when_asked_not_to():
+    message_one = build_message(conversation_id="abc", time=datetime(year=2020, month=6, day=6))
+    message_two = build_message(conversation_id="abc", time=datetime(year=2020, month=6, day=5))
+    counters = ConversationGroupingCounters()
+
+    actual = group_into_conversations([message_one, message_two], counters, sort_messages=False)
+
+    assert list(actual) == [Conversation("abc", [message_one, message_two])]
+    assert counters.sorted_conversation_count == 0
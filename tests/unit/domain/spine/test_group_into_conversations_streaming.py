@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta
+
+from prmdata.domain.spine.conversation import Conversation, ConversationGroupingCounters
+from prmdata.domain.spine.streaming_conversation import (
+    ConversationWatermark,
+    group_into_conversations_streaming,
+)
+from tests.builders.spine import build_message
+
+EHR_REQUEST_COMPLETED = "urn:nhs:names:services:gp2gp/RCMR_IN030000UK06"
+APPLICATION_ACK = "urn:nhs:names:services:gp2gp/MCCI_IN010000UK13"
+
+A_LATENESS = ConversationWatermark(lateness=timedelta(hours=1))
+
+
+def _build_finished_conversation_messages(conversation_id, start):
+    request_completed = build_message(
+        conversation_id=conversation_id,
+        time=start,
+        interaction_id=EHR_REQUEST_COMPLETED,
+        guid=f"{conversation_id}-completed",
+    )
+    request_completed_ack = build_message(
+        conversation_id=conversation_id,
+        time=start + timedelta(minutes=5),
+        interaction_id=APPLICATION_ACK,
+        message_ref=f"{conversation_id}-completed",
+    )
+    return [request_completed, request_completed_ack]
+
+
+def test_group_into_conversations_streaming_produces_correct_conversations():
+    message_one = build_message(conversation_id="abc", time=datetime(2020, 6, 5))
+    message_two = build_message(conversation_id="xyz", time=datetime(2020, 6, 5, 1))
+    message_three = build_message(conversation_id="abc", time=datetime(2020, 6, 5, 2))
+
+    expected = [
+        Conversation("abc", [message_one, message_three]),
+        Conversation("xyz", [message_two]),
+    ]
+
+    actual = group_into_conversations_streaming(
+        [message_one, message_two, message_three], A_LATENESS
+    )
+
+    assert list(actual) == expected
+
+
+def test_group_into_conversations_streaming_emits_finished_conversation_after_lateness():
+    finished = _build_finished_conversation_messages("abc", datetime(2020, 6, 5))
+    within_lateness = build_message(conversation_id="xyz", time=datetime(2020, 6, 5, 1))
+    after_lateness = build_message(conversation_id="xyz", time=datetime(2020, 6, 5, 1, 5))
+    messages = iter(finished + [within_lateness, after_lateness])
+
+    conversations = group_into_conversations_streaming(messages, A_LATENESS)
+
+    assert next(conversations) == Conversation("abc", finished)
+    assert next(messages, None) is None
+
+
+def test_group_into_conversations_streaming_emits_conversation_acknowledged_before_completion():
+    request_completed, request_completed_ack = _build_finished_conversation_messages(
+        "abc", datetime(2020, 6, 5)
+    )
+    after_lateness = build_message(conversation_id="xyz", time=datetime(2020, 6, 5, 1, 10))
+    unread = build_message(conversation_id="xyz", time=datetime(2020, 6, 5, 1, 15))
+    messages = iter([request_completed_ack, request_completed, after_lateness, unread])
+
+    conversations = group_into_conversations_streaming(messages, A_LATENESS)
+
+    assert next(conversations) == Conversation("abc", [request_completed, request_completed_ack])
+    assert next(messages) == unread
+
+
+def test_group_into_conversations_streaming_keeps_unfinished_conversations_open():
+    request_completed = build_message(
+        conversation_id="abc",
+        time=datetime(2020, 6, 5),
+        interaction_id=EHR_REQUEST_COMPLETED,
+        guid="completed",
+    )
+    other_ack = build_message(
+        conversation_id="abc",
+        time=datetime(2020, 6, 5, 0, 5),
+        interaction_id=APPLICATION_ACK,
+        message_ref="something-else",
+    )
+    later_message = build_message(conversation_id="abc", time=datetime(2020, 6, 8))
+    messages = [request_completed, other_ack, later_message]
+    counters = ConversationGroupingCounters()
+
+    actual = group_into_conversations_streaming(messages, A_LATENESS, counters)
+
+    assert list(actual) == [Conversation("abc", messages)]
+    assert counters.finished_emitted_count == 0
+
+
+def test_group_into_conversations_streaming_sorts_late_messages_within_lateness():
+    request_completed, request_completed_ack = _build_finished_conversation_messages(
+        "abc", datetime(2020, 6, 5)
+    )
+    late_message = build_message(conversation_id="abc", time=datetime(2020, 6, 4, 23, 30))
+    messages = [request_completed, request_completed_ack, late_message]
+
+    expected = [Conversation("abc", [late_message, request_completed, request_completed_ack])]
+
+    actual = group_into_conversations_streaming(messages, A_LATENESS)
+
+    assert list(actual) == expected
+
+
+def test_group_into_conversations_streaming_drops_messages_of_emitted_conversations():
+    finished = _build_finished_conversation_messages("abc", datetime(2020, 6, 5))
+    other = build_message(conversation_id="xyz", time=datetime(2020, 6, 5, 2))
+    too_late = build_message(conversation_id="abc", time=datetime(2020, 6, 5, 0, 10))
+    counters = ConversationGroupingCounters()
+
+    actual = group_into_conversations_streaming(finished + [other, too_late], A_LATENESS, counters)
+
+    assert list(actual) == [Conversation("abc", finished), Conversation("xyz", [other])]
+    assert counters.late_message_count == 1
+
+
+def test_group_into_conversations_streaming_forgets_conversations_emitted_a_lateness_ago():
+    finished = [
+        message
+        for number in range(100)
+        for message in _build_finished_conversation_messages(
+            f"conversation-{number}", datetime(2020, 6, 5) + timedelta(hours=number)
+        )
+    ]
+    forgotten = build_message(conversation_id="conversation-0", time=datetime(2020, 6, 5, 0, 10))
+    remembered = build_message(conversation_id="conversation-97", time=datetime(2020, 6, 9, 1, 10))
+    counters = ConversationGroupingCounters()
+
+    actual = list(
+        group_into_conversations_streaming(finished + [forgotten, remembered], A_LATENESS, counters)
+    )
+
+    assert Conversation("conversation-0", [forgotten]) in actual
+    assert counters.conversation_count == 101
+    assert counters.late_message_count == 1
+
+
+def test_group_into_conversations_streaming_emits_idle_conversations():
+    idle = build_message(conversation_id="abc", time=datetime(2020, 6, 5))
+    active = build_message(conversation_id="xyz", time=datetime(2020, 6, 5, 12))
+    wakes_up = build_message(conversation_id="xyz", time=datetime(2020, 6, 7, 2))
+    messages = iter([idle, active, wakes_up])
+    watermark = ConversationWatermark(lateness=timedelta(hours=1), idle_timeout=timedelta(days=1))
+
+    conversations = group_into_conversations_streaming(messages, watermark)
+
+    assert next(conversations) == Conversation("abc", [idle])
+    assert next(messages, None) is None
+    assert list(conversations) == [Conversation("xyz", [active, wakes_up])]
+
+
+def test_group_into_conversations_streaming_counts_emitted_conversations():
+    messages = (
+        _build_finished_conversation_messages("abc", datetime(2020, 6, 5))
+        + [build_message(conversation_id="xyz", time=datetime(2020, 6, 6))]
+        + _build_finished_conversation_messages("def", datetime(2020, 6, 8))
+        + [build_message(conversation_id="ghi", time=datetime(2020, 6, 8, 0, 10))]
+    )
+    watermark = ConversationWatermark(lateness=timedelta(hours=1), idle_timeout=timedelta(days=1))
+    counters = ConversationGroupingCounters()
+
+    list(group_into_conversations_streaming(messages, watermark, counters))
+
+    assert counters == ConversationGroupingCounters(
+        conversation_count=4,
+        peak_open_conversation_count=2,
+        finished_emitted_count=1,
+        idle_emitted_count=1,
+    )
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from prmdata.domain.spine.message import merge_messages_by_time
+from tests.builders.spine import build_message
+
+
+def test_merge_messages_by_time_interleaves_sorted_streams():
+    first = build_message(time=datetime(2019, 12, 1))
+    second = build_message(time=datetime(2019, 12, 2))
+    third = build_message(time=datetime(2019, 12, 3))
+    fourth = build_message(time=datetime(2019, 12, 4))
+
+    actual = merge_messages_by_time([[first, third], [second, fourth]])
+
+    assert list(actual) == [first, second, third, fourth]
+
+
+def test_merge_messages_by_time_keeps_stream_order_of_messages_with_the_same_time():
+    time = datetime(2019, 12, 1)
+    first = build_message(time=time)
+    second = build_message(time=time)
+    third = build_message(time=time)
+
+    actual = merge_messages_by_time([[first, second], [third]])
+
+    assert list(actual) == [first, second, third]
+
+
+def test_merge_messages_by_time_reads_streams_lazily():
+    first = build_message(time=datetime(2019, 12, 1))
+    second = build_message(time=datetime(2019, 12, 2))
+    later_stream = iter([build_message(time=datetime(2019, 12, 3))])
+    consumed = iter([first, second])
+
+    merged = merge_messages_by_time([consumed, later_stream])
+
+    assert next(merged) == first
+    assert next(consumed) == second
+
+
+def test_merge_messages_by_time_handles_empty_streams():
+    message = build_message(time=datetime(2019, 12, 1))
+
+    actual = merge_messages_by_time([[], [message], []])
+
+    assert list(actual) == [message]
@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pyarrow.parquet as pq
+from dateutil.tz import tzutc
+
+from prmdata.domain.spine.dataset import read_message_dataset, write_message_dataset
+from prmdata.utils.date.range import DateTimeRange
+from prmdata.utils.io.parquet import resolve_filesystem
+from tests.builders.spine import build_message
+
+
+def _write(messages, directory):
+    filesystem, root_path = resolve_filesystem(str(directory))
+    write_message_dataset(messages, filesystem, root_path)
+    return filesystem, root_path
+
+
+def test_writes_one_partition_per_date_sorted_by_conversation_and_time(tmp_path):
+    messages = [
+        build_message(conversation_id="b", time=datetime(2019, 12, 1, 9, tzinfo=tzutc())),
+        build_message(conversation_id="a", time=datetime(2019, 12, 1, 10, tzinfo=tzutc())),
+        build_message(conversation_id="a", time=datetime(2019, 12, 1, 8, tzinfo=tzutc())),
+        build_message(conversation_id="a", time=datetime(2019, 12, 2, 1, tzinfo=tzutc())),
+    ]
+
+    _write(messages, tmp_path)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["date=2019-12-01", "date=2019-12-02"]
+    first_day = pq.read_table(tmp_path / "date=2019-12-01" / "part-0.parquet")
+    assert first_day.column("conversation_id").to_pylist() == ["a", "a", "b"]
+    assert [t.hour for t in first_day.column("time").to_pylist()] == [8, 10, 9]
+
+
+def test_dictionary_encodes_low_cardinality_columns(tmp_path):
+    _write([build_message(time=datetime(2019, 12, 1, tzinfo=tzutc()))], tmp_path)
+
+    metadata = pq.ParquetFile(tmp_path / "date=2019-12-01" / "part-0.parquet").metadata
+    row_group = metadata.row_group(0)
+    encoded_columns = {
+        row_group.column(i).path_in_schema
+        for i in range(row_group.num_columns)
+        if row_group.column(i).has_dictionary_page
+    }
+
+    assert encoded_columns == {
+        "interaction_id",
+        "from_party_asid",
+        "to_party_asid",
+        "from_system",
+        "to_system",
+    }
+
+
+def test_reads_only_messages_within_time_range(tmp_path):
+    in_range = build_message(time=datetime(2019, 12, 31, 23, tzinfo=tzutc()))
+    messages = [
+        build_message(time=datetime(2019, 11, 30, 23, tzinfo=tzutc())),
+        in_range,
+        build_message(time=datetime(2020, 1, 1, tzinfo=tzutc())),
+    ]
+    filesystem, root_path = _write(messages, tmp_path)
+    time_range = DateTimeRange(
+        datetime(2019, 12, 1, tzinfo=tzutc()), datetime(2020, 1, 1, tzinfo=tzutc())
+    )
+
+    actual = read_message_dataset(filesystem, root_path, time_range)
+
+    assert list(actual) == [in_range]
+
+
+def test_writing_a_date_again_merges_with_its_partition(tmp_path):
+    time = datetime(2019, 12, 1, tzinfo=tzutc())
+    first_input = [build_message(time=time), build_message(time=time)]
+    _write(first_input, tmp_path)
+    second_input = [build_message(time=time)]
+    filesystem, root_path = _write(second_input, tmp_path)
+    time_range = DateTimeRange(time, datetime(2019, 12, 2, tzinfo=tzutc()))
+
+    actual = read_message_dataset(filesystem, root_path, time_range)
+
+    assert sorted(m.guid for m in actual) == sorted(m.guid for m in first_input + second_input)
+
+
+def test_writing_a_date_again_drops_messages_already_in_its_partition(tmp_path):
+    time = datetime(2019, 12, 1, tzinfo=tzutc())
+    message = build_message(time=time)
+    _write([message], tmp_path)
+    filesystem, root_path = _write([message, message], tmp_path)
+    time_range = DateTimeRange(time, datetime(2019, 12, 2, tzinfo=tzutc()))
+
+    actual = read_message_dataset(filesystem, root_path, time_range)
+
+    assert list(actual) == [message]
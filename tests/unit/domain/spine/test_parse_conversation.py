@@ -37,7 +37,8 @@ def test_parses_a_complete_conversation():
         request_started=request_started_message,
         request_started_ack=request_started_ack_message,
         request_completed=request_completed_message,
-        intermediate_messages=[],
+        intermediate_error_codes=[],
+        intermediate_message_count=0,
         request_completed_ack=request_completed_ack_message,
     )
     actual = parse_conversation(conversation)
@@ -73,7 +74,8 @@ def test_parses_incomplete_conversation():
         request_started=request_started_message,
         request_completed=request_completed_message,
         request_started_ack=request_started_ack_message,
-        intermediate_messages=[],
+        intermediate_error_codes=[],
+        intermediate_message_count=0,
         request_completed_ack=None,
     )
     actual = parse_conversation(conversation)
@@ -108,10 +110,8 @@ def test_parses_conversation_with_large_messages():
         request_started=request_started_message,
         request_completed=request_completed_message,
         request_started_ack=request_started_ack_message,
-        intermediate_messages=[
-            common_p2p_message,
-            common_p2p_ack_message,
-        ],
+        intermediate_error_codes=[],
+        intermediate_message_count=2,
         request_completed_ack=request_completed_ack_message,
     )
     actual = parse_conversation(conversation)
@@ -136,7 +136,8 @@ def test_parses_conversation_without_request_completed():
         request_started=request_started_message,
         request_started_ack=request_started_ack_message,
         request_completed=None,
-        intermediate_messages=[],
+        intermediate_error_codes=[],
+        intermediate_message_count=0,
         request_completed_ack=None,
     )
     actual = parse_conversation(conversation)
@@ -174,9 +175,41 @@ def test_saves_the_last_message_when_multiple_request_completed_messages_or_fina
         request_started=request_started_message,
         request_started_ack=request_started_ack_message,
         request_completed=request_completed_message_3,
-        intermediate_messages=[],
+        intermediate_error_codes=[],
+        intermediate_message_count=0,
         request_completed_ack=request_completed_ack_message_2,
     )
     actual = parse_conversation(conversation)
 
     assert actual == expected
+
+
+def test_keeps_error_codes_and_count_of_intermediate_messages():
+    request_started_message = build_message(guid="efg", interaction_id=EHR_REQUEST_STARTED)
+    common_p2p_message = build_message(guid="efg-1", interaction_id=COMMON_POINT_TO_POINT)
+    failed_ack_message = build_message(
+        interaction_id=APPLICATION_ACK, message_ref="efg-1", error_code=29
+    )
+    unexpected_message = build_message(error_code=99)
+
+    messages = [
+        request_started_message,
+        common_p2p_message,
+        failed_ack_message,
+        unexpected_message,
+    ]
+
+    conversation = Conversation("efg", messages)
+
+    expected = ParsedConversation(
+        id="efg",
+        request_started=request_started_message,
+        request_started_ack=None,
+        request_completed=None,
+        intermediate_error_codes=[29, 99],
+        intermediate_message_count=3,
+        request_completed_ack=None,
+    )
+    actual = parse_conversation(conversation)
+
+    assert actual == expected
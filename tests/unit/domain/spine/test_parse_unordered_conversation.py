@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from prmdata.domain.spine.conversation import Conversation
+from prmdata.domain.spine.parsed_conversation import (
+    APPLICATION_ACK,
+    COMMON_POINT_TO_POINT,
+    EHR_REQUEST_COMPLETED,
+    EHR_REQUEST_STARTED,
+    ConversationMissingStart,
+    ParsedConversation,
+    parse_conversation,
+    parse_unordered_conversation,
+)
+from tests.builders.spine import build_message
+
+A_TIME = datetime(2019, 12, 1)
+
+
+def _at(minutes):
+    return A_TIME + timedelta(minutes=minutes)
+
+
+def test_parses_a_complete_conversation_in_any_order():
+    request_started = build_message(time=_at(0), guid="abc", interaction_id=EHR_REQUEST_STARTED)
+    request_started_ack = build_message(
+        time=_at(1), interaction_id=APPLICATION_ACK, message_ref="abc"
+    )
+    request_completed = build_message(
+        time=_at(2), guid="abc-1", interaction_id=EHR_REQUEST_COMPLETED
+    )
+    request_completed_ack = build_message(
+        time=_at(3), interaction_id=APPLICATION_ACK, message_ref="abc-1"
+    )
+    messages = [request_completed_ack, request_started_ack, request_completed, request_started]
+
+    expected = ParsedConversation(
+        id="abc",
+        request_started=request_started,
+        request_started_ack=request_started_ack,
+        request_completed=request_completed,
+        intermediate_error_codes=[],
+        intermediate_message_count=0,
+        request_completed_ack=request_completed_ack,
+    )
+
+    actual = parse_unordered_conversation(Conversation("abc", messages))
+
+    assert actual == expected
+
+
+def test_matches_acknowledgement_timestamped_before_the_message_it_acknowledges():
+    request_started = build_message(time=_at(0), guid="abc", interaction_id=EHR_REQUEST_STARTED)
+    request_completed_ack = build_message(
+        time=_at(4), interaction_id=APPLICATION_ACK, message_ref="abc-1", error_code=None
+    )
+    request_completed = build_message(
+        time=_at(5), guid="abc-1", interaction_id=EHR_REQUEST_COMPLETED
+    )
+    messages = [request_started, request_completed_ack, request_completed]
+
+    actual = parse_unordered_conversation(Conversation("abc", messages))
+
+    assert actual.request_completed_ack == request_completed_ack
+    assert actual.intermediate_message_count == 0
+
+
+def test_keeps_intermediate_error_codes_in_time_order():
+    request_started = build_message(time=_at(0), guid="abc", interaction_id=EHR_REQUEST_STARTED)
+    later_error = build_message(time=_at(9), interaction_id=COMMON_POINT_TO_POINT, error_code=30)
+    earlier_error = build_message(time=_at(3), interaction_id=APPLICATION_ACK, error_code=11)
+    without_error = build_message(time=_at(5), interaction_id=COMMON_POINT_TO_POINT)
+    messages = [later_error, request_started, without_error, earlier_error]
+
+    actual = parse_unordered_conversation(Conversation("abc", messages))
+
+    assert actual.intermediate_error_codes == [11, 30]
+    assert actual.intermediate_message_count == 3
+
+
+def test_saves_the_latest_request_completed_message_and_its_latest_acknowledgement():
+    request_started = build_message(time=_at(0), guid="cde", interaction_id=EHR_REQUEST_STARTED)
+    request_completed_1 = build_message(
+        time=_at(1), guid="cde-1", interaction_id=EHR_REQUEST_COMPLETED
+    )
+    request_completed_2 = build_message(
+        time=_at(2), guid="cde-2", interaction_id=EHR_REQUEST_COMPLETED
+    )
+    request_completed_ack_1 = build_message(
+        time=_at(3), interaction_id=APPLICATION_ACK, message_ref="cde-2", error_code=12
+    )
+    request_completed_ack_2 = build_message(
+        time=_at(4), interaction_id=APPLICATION_ACK, message_ref="cde-2", error_code=None
+    )
+    messages = [
+        request_completed_ack_2,
+        request_completed_2,
+        request_started,
+        request_completed_ack_1,
+        request_completed_1,
+    ]
+
+    actual = parse_unordered_conversation(Conversation("cde", messages))
+
+    assert actual.request_completed == request_completed_2
+    assert actual.request_completed_ack == request_completed_ack_2
+
+
+def test_agrees_with_parse_conversation_on_time_ordered_messages():
+    request_started = build_message(time=_at(0), guid="abc", interaction_id=EHR_REQUEST_STARTED)
+    request_started_ack = build_message(
+        time=_at(1), interaction_id=APPLICATION_ACK, message_ref="abc"
+    )
+    fragment = build_message(time=_at(2), guid="abc-2", interaction_id=COMMON_POINT_TO_POINT)
+    fragment_ack = build_message(
+        time=_at(3), interaction_id=APPLICATION_ACK, message_ref="abc-2", error_code=29
+    )
+    request_completed = build_message(
+        time=_at(4), guid="abc-1", interaction_id=EHR_REQUEST_COMPLETED
+    )
+    request_completed_ack = build_message(
+        time=_at(5), interaction_id=APPLICATION_ACK, message_ref="abc-1"
+    )
+    conversation = Conversation(
+        "abc",
+        [
+            request_started,
+            request_started_ack,
+            fragment,
+            fragment_ack,
+            request_completed,
+            request_completed_ack,
+        ],
+    )
+
+    assert parse_unordered_conversation(conversation) == parse_conversation(conversation)
+
+
+def _build_resent_request_completed_messages(acknowledged_after_resend):
+    request_started = build_message(time=_at(0), guid="abc", interaction_id=EHR_REQUEST_STARTED)
+    request_started_ack = build_message(
+        time=_at(1), interaction_id=APPLICATION_ACK, message_ref="abc"
+    )
+    request_completed_1 = build_message(
+        time=_at(2), guid="abc-1", interaction_id=EHR_REQUEST_COMPLETED
+    )
+    request_completed_2 = build_message(
+        time=_at(4), guid="abc-2", interaction_id=EHR_REQUEST_COMPLETED
+    )
+    request_completed_ack_1 = build_message(
+        time=_at(5 if acknowledged_after_resend else 3),
+        interaction_id=APPLICATION_ACK,
+        message_ref="abc-1",
+    )
+    return sorted(
+        [
+            request_started,
+            request_started_ack,
+            request_completed_1,
+            request_completed_ack_1,
+            request_completed_2,
+        ],
+        key=lambda message: message.time,
+    )
+
+
+@pytest.mark.parametrize("acknowledged_after_resend", [False, True])
+def test_agrees_with_parse_conversation_on_resent_request_completed(acknowledged_after_resend):
+    messages = _build_resent_request_completed_messages(acknowledged_after_resend)
+    conversation = Conversation("abc", messages)
+
+    actual = parse_unordered_conversation(Conversation("abc", list(reversed(messages))))
+
+    assert actual == parse_conversation(conversation)
+
+
+def test_matches_acknowledgement_of_request_completed_that_was_resent():
+    messages = _build_resent_request_completed_messages(acknowledged_after_resend=False)
+
+    actual = parse_unordered_conversation(Conversation("abc", messages))
+
+    assert actual.request_completed == messages[4]
+    assert actual.request_completed_ack == messages[3]
+    assert actual.intermediate_message_count == 0
+
+
+def test_throws_conversation_missing_start_without_request_started_message():
+    request_completed = build_message(guid="abc-1", interaction_id=EHR_REQUEST_COMPLETED)
+    messages = [request_completed]
+
+    with pytest.raises(ConversationMissingStart):
+        parse_unordered_conversation(Conversation("abc", messages))
@@ -0,0 +1,56 @@
+from argparse import Namespace
+
+from prmdata.domain.ods_portal.sources import ODS_PORTAL_SEARCH_URL
+from prmdata.pipeline.ods_downloader.args import parse_ods_portal_pipeline_arguments
+
+
+def test_parse_arguments_with_local_file():
+    args = [
+        "--mapping-file",
+        "data/asid-lookup.csv.gz",
+        "--output-file",
+        "data/organisation-list.json",
+    ]
+
+    expected = Namespace(
+        mapping_file="data/asid-lookup.csv.gz",
+        search_url=ODS_PORTAL_SEARCH_URL,
+        s3_endpoint_url=None,
+        max_connections=4,
+        requests_per_second=5,
+        max_retries=5,
+        page_size=1000,
+        cache_directory=None,
+        cache_ttl_hours=24,
+        cache_max_age_days=90,
+        output_key="organisation-list.json",
+        output_bucket=None,
+        output_file="data/organisation-list.json",
+    )
+
+    actual = parse_ods_portal_pipeline_arguments(args)
+
+    assert actual == expected
+
+
+def test_parse_arguments_with_s3_upload_and_connection_settings():
+    args = [
+        "--mapping-file",
+        "data/asid-lookup.csv.gz",
+        "--output-bucket",
+        "test_bucket",
+        "--output-key",
+        "ods/organisation-list.json",
+        "--max-connections",
+        "8",
+        "--requests-per-second",
+        "10",
+    ]
+
+    actual = parse_ods_portal_pipeline_arguments(args)
+
+    assert actual.output_bucket == "test_bucket"
+    assert actual.output_key == "ods/organisation-list.json"
+    assert actual.output_file is None
+    assert actual.max_connections == 8
+    assert actual.requests_per_second == 10
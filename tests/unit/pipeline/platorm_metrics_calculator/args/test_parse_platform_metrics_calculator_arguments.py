@@ -1,3 +1,5 @@
+import pytest
+
 from prmdata.pipeline.platform_metrics_calculator.args import (
     parse_platform_metrics_calculator_pipeline_arguments,
 )
@@ -23,10 +25,27 @@ def test_parse_arguments_with_local_files():
         month=6,
         year=2019,
         organisation_list_file="data/organisation-list.json",
+        asid_history_file=None,
         input_files=["data/jun.csv", "data/july.csv"],
+        input_dataset=None,
+        input_transfers_file=None,
+        input_asid_counts_file=None,
         output_bucket=None,
         output_directory="data",
         s3_endpoint_url=None,
+        decompression_workers=None,
+        time_ordered_input=False,
+        conversation_lateness_minutes=None,
+        conversation_idle_days=None,
+        skip_conversation_sorting=False,
+        deduplicate_messages=False,
+        profile=None,
+        sla_scenarios_file=None,
+        output_transfers_dataset=None,
+        partition_transfers_by_status=False,
+        parquet_compression=None,
+        parquet_row_group_size=None,
+        parquet_page_index=False,
     )
 
     actual = parse_platform_metrics_calculator_pipeline_arguments(args)
@@ -54,12 +73,255 @@ def test_parse_arguments_with_s3_upload():
         month=6,
         year=2019,
         organisation_list_file="data/organisation-list.json",
+        asid_history_file=None,
         input_files=["data/jun.csv", "data/july.csv"],
+        input_dataset=None,
+        input_transfers_file=None,
+        input_asid_counts_file=None,
         output_bucket="test-bucket",
         output_directory=None,
         s3_endpoint_url="https://localhost:6789",
+        decompression_workers=None,
+        time_ordered_input=False,
+        conversation_lateness_minutes=None,
+        conversation_idle_days=None,
+        skip_conversation_sorting=False,
+        deduplicate_messages=False,
+        profile=None,
+        sla_scenarios_file=None,
+        output_transfers_dataset=None,
+        partition_transfers_by_status=False,
+        parquet_compression=None,
+        parquet_row_group_size=None,
+        parquet_page_index=False,
     )
 
     actual = parse_platform_metrics_calculator_pipeline_arguments(args)
 
     assert actual == expected
+
+
+def test_parse_arguments_with_profiling_of_whole_run():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-files",
+        "data/jun.csv",
+        "--output-directory",
+        "data",
+        "--profile",
+    ]
+
+    actual = parse_platform_metrics_calculator_pipeline_arguments(args)
+
+    assert actual.profile == ["main"]
+
+
+def test_parse_arguments_with_profiling_of_chosen_stages():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-files",
+        "data/jun.csv",
+        "--output-directory",
+        "data",
+        "--profile",
+        "transfers,metrics",
+    ]
+
+    actual = parse_platform_metrics_calculator_pipeline_arguments(args)
+
+    assert actual.profile == ["transfers", "metrics"]
+
+
+def test_parse_arguments_with_decompression_workers():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-files",
+        "data/jun.csv",
+        "--output-directory",
+        "data",
+        "--decompression-workers",
+        "4",
+    ]
+
+    actual = parse_platform_metrics_calculator_pipeline_arguments(args)
+
+    assert actual.decompression_workers == 4
+
+
+def test_parse_arguments_with_input_dataset():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-dataset",
+        "s3://test-bucket/spine",
+        "--output-directory",
+        "data",
+    ]
+
+    actual = parse_platform_metrics_calculator_pipeline_arguments(args)
+
+    assert actual.input_dataset == "s3://test-bucket/spine"
+    assert actual.input_files is None
+
+
+def test_parse_arguments_rejects_input_files_with_input_dataset():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-files",
+        "data/jun.csv",
+        "--input-dataset",
+        "data/spine",
+        "--output-directory",
+        "data",
+    ]
+
+    with pytest.raises(SystemExit):
+        parse_platform_metrics_calculator_pipeline_arguments(args)
+
+
+def test_parse_arguments_with_transfers_dataset_partitioned_by_status():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-files",
+        "data/jun.csv",
+        "--output-directory",
+        "data",
+        "--output-transfers-dataset",
+        "s3://test-bucket/transfers",
+        "--partition-transfers-by-status",
+    ]
+
+    actual = parse_platform_metrics_calculator_pipeline_arguments(args)
+
+    assert actual.output_transfers_dataset == "s3://test-bucket/transfers"
+    assert actual.partition_transfers_by_status
+
+
+def test_parse_arguments_with_input_transfers_file():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-transfers-file",
+        "data/6-2019-transfers.parquet",
+        "--output-directory",
+        "data",
+    ]
+
+    actual = parse_platform_metrics_calculator_pipeline_arguments(args)
+
+    assert actual.input_transfers_file == "data/6-2019-transfers.parquet"
+    assert actual.input_files is None
+
+
+def test_parse_arguments_rejects_sla_scenarios_with_input_asid_counts_file():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-asid-counts-file",
+        "data/6-2019-asidTransferCounts.parquet",
+        "--output-directory",
+        "data",
+        "--sla-scenarios-file",
+        "data/sla-scenarios.json",
+    ]
+
+    with pytest.raises(SystemExit):
+        parse_platform_metrics_calculator_pipeline_arguments(args)
+
+
+def test_parse_arguments_rejects_time_ordered_input_with_decompression_workers():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-files",
+        "data/jun.csv.gz,data/july.csv.gz",
+        "--output-directory",
+        "data",
+        "--time-ordered-input",
+        "--decompression-workers",
+        "4",
+    ]
+
+    with pytest.raises(SystemExit):
+        parse_platform_metrics_calculator_pipeline_arguments(args)
+
+
+def test_parse_arguments_rejects_unknown_profile_stage():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-files",
+        "data/jun.csv",
+        "--output-directory",
+        "data",
+        "--profile",
+        "transfers,parse",
+    ]
+
+    with pytest.raises(SystemExit):
+        parse_platform_metrics_calculator_pipeline_arguments(args)
+
+
+def test_parse_arguments_rejects_conversation_lateness_with_input_dataset():
+    args = [
+        "--month",
+        "6",
+        "--year",
+        "2019",
+        "--organisation-list-file",
+        "data/organisation-list.json",
+        "--input-dataset",
+        "s3://example-bucket/spine-messages",
+        "--output-directory",
+        "data",
+        "--conversation-lateness-minutes",
+        "60",
+    ]
+
+    with pytest.raises(SystemExit):
+        parse_platform_metrics_calculator_pipeline_arguments(args)
@@ -0,0 +1,24 @@
+from argparse import Namespace
+
+from prmdata.pipeline.spine_compaction.args import parse_spine_compaction_pipeline_arguments
+
+
+def test_parse_arguments():
+    args = [
+        "--input-files",
+        "data/jun.csv.gz,data/july.csv.gz",
+        "--output-dataset",
+        "s3://test-bucket/spine",
+        "--s3-endpoint-url",
+        "https://localhost:9000",
+    ]
+
+    expected = Namespace(
+        input_files=["data/jun.csv.gz", "data/july.csv.gz"],
+        output_dataset="s3://test-bucket/spine",
+        s3_endpoint_url="https://localhost:9000",
+    )
+
+    actual = parse_spine_compaction_pipeline_arguments(args)
+
+    assert actual == expected
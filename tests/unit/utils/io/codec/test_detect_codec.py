@@ -0,0 +1,29 @@
+from prmdata.utils.io.codec import GZIP, UNCOMPRESSED, ZSTD, detect_codec
+from tests.builders.file import build_csv, build_gzip_csv, build_zstd_csv
+
+HEADER = ["id", "message"]
+ROWS = [["A", "A message"]]
+
+
+def test_detects_codec_from_extension(fs):
+    fs.create_file("input.csv.gz", contents=build_gzip_csv(HEADER, ROWS))
+    fs.create_file("input.csv.zst", contents=build_zstd_csv(HEADER, ROWS))
+
+    assert detect_codec("input.csv.gz") == GZIP
+    assert detect_codec("input.csv.zst") == ZSTD
+
+
+def test_detects_codec_from_magic_bytes_given_unknown_extension(fs):
+    fs.create_file("input.gz.part", contents=build_gzip_csv(HEADER, ROWS))
+    fs.create_file("input.zst.part", contents=build_zstd_csv(HEADER, ROWS))
+    fs.create_file("input.csv", contents=build_csv(HEADER, ROWS))
+
+    assert detect_codec("input.gz.part") == GZIP
+    assert detect_codec("input.zst.part") == ZSTD
+    assert detect_codec("input.csv") == UNCOMPRESSED
+
+
+def test_detects_empty_file_as_uncompressed(fs):
+    fs.create_file("input.csv", contents=b"")
+
+    assert detect_codec("input.csv") == UNCOMPRESSED
@@ -0,0 +1,81 @@
+from prmdata.utils.io.csv import read_csv_files
+from tests.builders.file import build_csv, build_gzip_csv, build_zstd_csv
+
+HEADER = ["id", "message"]
+
+
+def test_loads_files_of_every_codec(tmp_path):
+    (tmp_path / "input1.csv.gz").write_bytes(build_gzip_csv(HEADER, [["A", "A message"]]))
+    (tmp_path / "input2.csv.zst").write_bytes(build_zstd_csv(HEADER, [["B", "B message"]]))
+    (tmp_path / "input3.csv").write_bytes(build_csv(HEADER, [["C", "C message"]]))
+
+    expected = [
+        {"id": "A", "message": "A message"},
+        {"id": "B", "message": "B message"},
+        {"id": "C", "message": "C message"},
+    ]
+
+    actual = read_csv_files(
+        [str(tmp_path / name) for name in ["input1.csv.gz", "input2.csv.zst", "input3.csv"]]
+    )
+
+    assert list(actual) == expected
+
+
+def test_loads_zstd_file_without_extension(tmp_path):
+    file_path = tmp_path / "input"
+    file_path.write_bytes(build_zstd_csv(HEADER, [["A", "A message"], ["B", "B message"]]))
+
+    expected = [{"id": "A", "message": "A message"}, {"id": "B", "message": "B message"}]
+
+    actual = read_csv_files([str(file_path)])
+
+    assert list(actual) == expected
+
+
+def test_projects_columns_of_every_codec(tmp_path):
+    header = ["id", "unused", "message"]
+    (tmp_path / "input1.csv.gz").write_bytes(build_gzip_csv(header, [["A", "x", "A message"]]))
+    (tmp_path / "input2.csv.zst").write_bytes(build_zstd_csv(header, [["B", "y", "B message"]]))
+    (tmp_path / "input3.csv").write_bytes(build_csv(header, [["C", "z", "C message"]]))
+
+    expected = [
+        {"id": "A", "message": "A message"},
+        {"id": "B", "message": "B message"},
+        {"id": "C", "message": "C message"},
+    ]
+
+    actual = read_csv_files(
+        [str(tmp_path / name) for name in ["input1.csv.gz", "input2.csv.zst", "input3.csv"]],
+        columns=["id", "message"],
+    )
+
+    assert list(actual) == expected
+
+
+def test_projects_columns_of_irregular_rows(tmp_path):
+    header = ["id", "unused", "message"]
+    rows = [["A", "x", "A message"], ["B"], ["C", "z", "C message", "extra"]]
+    (tmp_path / "input1.csv.gz").write_bytes(build_gzip_csv(header, rows))
+    (tmp_path / "input2.csv").write_bytes(build_csv(header, rows))
+
+    expected = [
+        {"id": "A", "message": "A message"},
+        {"id": "B", "message": None},
+        {"id": "C", "message": "C message"},
+    ]
+
+    actual = read_csv_files(
+        [str(tmp_path / "input1.csv.gz"), str(tmp_path / "input2.csv")], columns=["id", "message"]
+    )
+
+    assert list(actual) == expected + expected
+
+
+def test_projects_columns_of_irregular_row_late_in_file(tmp_path):
+    rows = [[str(i), "x", f"message {i}"] for i in range(100000)] + [["irregular"]]
+    (tmp_path / "input.csv.zst").write_bytes(build_zstd_csv(["id", "unused", "message"], rows))
+
+    actual = list(read_csv_files([str(tmp_path / "input.csv.zst")], columns=["id", "message"]))
+
+    assert [row["id"] for row in actual] == [str(i) for i in range(100000)] + ["irregular"]
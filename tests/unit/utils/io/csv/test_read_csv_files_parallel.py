@@ -0,0 +1,89 @@
+import csv
+import gzip
+from io import StringIO
+
+from prmdata.utils.io.csv import read_gzip_csv_file, read_csv_files_parallel
+from prmdata.utils.io.gzip_index import read_gzip_index
+from tests.builders.file import build_gzip_csv
+
+
+def _build_csv_gz_with_quoted_newlines(row_count):
+    contents = StringIO()
+    writer = csv.writer(contents)
+    writer.writerow(["id", "message"])
+    for i in range(row_count):
+        writer.writerow([str(i), f'a "quoted"\nmessage {i}' if i % 7 == 0 else f"message {i}"])
+    return gzip.compress(contents.getvalue().encode("utf-8"))
+
+
+def test_loads_two_files(tmp_path):
+    file_path_one = tmp_path / "input1.csv.gz"
+    file_path_two = tmp_path / "input2.csv.gz"
+    file_path_one.write_bytes(
+        build_gzip_csv(header=["id", "message"], rows=[["A", "A message"], ["B", "B message"]])
+    )
+    file_path_two.write_bytes(build_gzip_csv(header=["message", "id"], rows=[["C msg", "C"]]))
+
+    expected = [
+        {"id": "A", "message": "A message"},
+        {"id": "B", "message": "B message"},
+        {"message": "C msg", "id": "C"},
+    ]
+
+    actual = read_csv_files_parallel([str(file_path_one), str(file_path_two)], workers=2)
+
+    assert list(actual) == expected
+
+
+def test_matches_sequential_read_across_many_chunks(tmp_path):
+    file_path = tmp_path / "input.csv.gz"
+    file_path.write_bytes(_build_csv_gz_with_quoted_newlines(20000))
+
+    expected = list(read_gzip_csv_file(str(file_path)))
+
+    actual = read_csv_files_parallel([str(file_path)], workers=4, span=16 * 1024)
+
+    assert list(actual) == expected
+    assert len(read_gzip_index(f"{file_path}.gzidx").access_points) > 4
+
+
+def test_projects_columns_across_many_chunks(tmp_path):
+    file_path = tmp_path / "input.csv.gz"
+    file_path.write_bytes(_build_csv_gz_with_quoted_newlines(20000))
+
+    expected = [{"message": row["message"]} for row in read_gzip_csv_file(str(file_path))]
+
+    actual = read_csv_files_parallel(
+        [str(file_path)], workers=4, columns=["message"], span=16 * 1024
+    )
+
+    assert list(actual) == expected
+
+
+def test_matches_sequential_read_of_file_written_with_gzip_open(tmp_path):
+    file_path = tmp_path / "input.csv.gz"
+    with gzip.open(file_path, "wb") as f:
+        f.write(gzip.decompress(_build_csv_gz_with_quoted_newlines(20000)))
+
+    expected = list(read_gzip_csv_file(str(file_path)))
+
+    actual = read_csv_files_parallel([str(file_path)], workers=4, span=64 * 1024)
+
+    assert list(actual) == expected
+
+
+def test_projects_columns_of_irregular_rows(tmp_path):
+    header = ["id", "unused", "message"]
+    rows = [["A", "x", "A message"], ["B"], ["C", "z", "C message", "extra"]]
+    file_path = tmp_path / "input.csv.gz"
+    file_path.write_bytes(build_gzip_csv(header, rows))
+
+    expected = [
+        {"id": "A", "message": "A message"},
+        {"id": "B", "message": None},
+        {"id": "C", "message": "C message"},
+    ]
+
+    actual = read_csv_files_parallel([str(file_path)], workers=2, columns=["id", "message"])
+
+    assert list(actual) == expected
@@ -0,0 +1,53 @@
+import pyarrow as pa
+
+from prmdata.utils.io.csv import read_projected_csv
+
+
+def test_keeps_only_projected_columns_in_projection_order():
+    source = pa.py_buffer(b"id,unused,message\nA,x,A message\nB,y,B message\n")
+
+    expected = [{"message": "A message", "id": "A"}, {"message": "B message", "id": "B"}]
+
+    actual = read_projected_csv(source, ["message", "id"])
+
+    assert list(actual) == expected
+
+
+def test_keeps_values_as_strings():
+    source = pa.py_buffer(b"id,code,message\n0012,,NONE\n")
+
+    expected = [{"id": "0012", "code": "", "message": "NONE"}]
+
+    actual = read_projected_csv(source, ["id", "code", "message"])
+
+    assert list(actual) == expected
+
+
+def test_returns_none_for_missing_columns():
+    source = pa.py_buffer(b"id\nA\n")
+
+    expected = [{"id": "A", "toSystem": None}]
+
+    actual = read_projected_csv(source, ["id", "toSystem"])
+
+    assert list(actual) == expected
+
+
+def test_reads_quoted_newlines():
+    source = pa.py_buffer(b'id,message\nA,"multi\nline"\n')
+
+    expected = [{"id": "A", "message": "multi\nline"}]
+
+    actual = read_projected_csv(source, ["id", "message"])
+
+    assert list(actual) == expected
+
+
+def test_reads_headerless_source_given_column_names():
+    source = pa.py_buffer(b"A,x,A message\n")
+
+    expected = [{"id": "A", "message": "A message"}]
+
+    actual = read_projected_csv(source, ["id", "message"], ["id", "unused", "message"])
+
+    assert list(actual) == expected
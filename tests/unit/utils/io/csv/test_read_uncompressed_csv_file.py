@@ -0,0 +1,41 @@
+from prmdata.utils.io import csv as csv_io
+from prmdata.utils.io.csv import read_uncompressed_csv_file
+from tests.builders.file import build_csv
+
+
+def test_loads_rows(tmp_path):
+    file_path = tmp_path / "input.csv"
+    file_path.write_bytes(build_csv(["id", "message"], [["A", "A message"], ["B", "B message"]]))
+
+    expected = [{"id": "A", "message": "A message"}, {"id": "B", "message": "B message"}]
+
+    actual = read_uncompressed_csv_file(str(file_path))
+
+    assert list(actual) == expected
+
+
+def test_loads_quoted_values_spanning_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_io, "UNCOMPRESSED_BLOCK_SIZE", 8)
+    file_path = tmp_path / "input.csv"
+    file_path.write_bytes(
+        b'id,message\r\nA,"a ""quoted""\r\nmessage"\r\nB,B message\r\nC,\xc3\xa9t\xc3\xa9\r\n'
+    )
+
+    expected = [
+        {"id": "A", "message": 'a "quoted"\r\nmessage'},
+        {"id": "B", "message": "B message"},
+        {"id": "C", "message": "été"},
+    ]
+
+    actual = read_uncompressed_csv_file(str(file_path))
+
+    assert list(actual) == expected
+
+
+def test_loads_nothing_from_empty_file(tmp_path):
+    file_path = tmp_path / "input.csv"
+    file_path.write_bytes(b"")
+
+    actual = read_uncompressed_csv_file(str(file_path))
+
+    assert list(actual) == []
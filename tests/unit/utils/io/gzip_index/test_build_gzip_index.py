@@ -0,0 +1,50 @@
+import gzip
+
+import pytest
+
+from prmdata.utils.io.gzip_index import GzipIndexError, build_gzip_index
+from tests.builders.file import build_compressible_lines
+
+
+def test_records_access_points_at_least_a_span_apart(tmp_path):
+    contents = build_compressible_lines(20000)
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(contents))
+
+    actual = build_gzip_index(str(file_path), span=64 * 1024)
+
+    output_offsets = [point.output_offset for point in actual.access_points]
+    assert output_offsets[0] == 0
+    assert len(output_offsets) > 1
+    assert all(b - a > 64 * 1024 for a, b in zip(output_offsets, output_offsets[1:]))
+    assert actual.uncompressed_size == len(contents)
+    assert actual.file_size == len(file_path.read_bytes())
+
+
+def test_stores_window_preceding_each_access_point(tmp_path):
+    contents = build_compressible_lines(20000)
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(contents))
+
+    actual = build_gzip_index(str(file_path), span=64 * 1024)
+
+    for point in actual.access_points:
+        window_end = point.output_offset
+        window_start = max(0, window_end - 32 * 1024)
+        assert point.window == contents[window_start:window_end]
+
+
+def test_throws_gzip_index_error_given_multi_member_gzip(tmp_path):
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(b"a,b\n") + gzip.compress(b"c,d\n"))
+
+    with pytest.raises(GzipIndexError):
+        build_gzip_index(str(file_path))
+
+
+def test_throws_gzip_index_error_given_truncated_gzip(tmp_path):
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(build_compressible_lines(1000))[:-100])
+
+    with pytest.raises(GzipIndexError):
+        build_gzip_index(str(file_path))
@@ -0,0 +1,37 @@
+import gzip
+import os
+
+from prmdata.utils.io.gzip_index import build_gzip_index, load_or_build_gzip_index
+from tests.builders.file import build_compressible_lines
+
+
+def test_caches_index_next_to_the_file(tmp_path):
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(build_compressible_lines(20000)))
+
+    actual = load_or_build_gzip_index(str(file_path), span=64 * 1024)
+
+    assert (tmp_path / "input.gz.gzidx").exists()
+    assert actual == build_gzip_index(str(file_path), span=64 * 1024)
+
+
+def test_reuses_cached_index(tmp_path):
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(build_compressible_lines(20000)))
+    expected = load_or_build_gzip_index(str(file_path), span=64 * 1024)
+
+    actual = load_or_build_gzip_index(str(file_path), span=1024 * 1024)
+
+    assert actual == expected
+
+
+def test_rebuilds_index_when_file_has_changed(tmp_path):
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(build_compressible_lines(20000)))
+    load_or_build_gzip_index(str(file_path), span=64 * 1024)
+    file_path.write_bytes(gzip.compress(build_compressible_lines(100)))
+    os.utime(file_path, ns=(0, 0))
+
+    actual = load_or_build_gzip_index(str(file_path), span=64 * 1024)
+
+    assert actual == build_gzip_index(str(file_path), span=64 * 1024)
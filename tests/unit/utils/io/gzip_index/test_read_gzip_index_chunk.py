@@ -0,0 +1,81 @@
+import gzip
+
+import pytest
+
+from prmdata.utils.io.gzip_index import build_gzip_index, read_gzip_index_chunk
+from tests.builders.file import build_compressible_lines, gzip_with_sync_flushes
+
+
+def _read_all_chunks(file_path, index):
+    return [
+        read_gzip_index_chunk(str(file_path), index, chunk_number)
+        for chunk_number in range(len(index.access_points))
+    ]
+
+
+def test_chunks_reassemble_the_uncompressed_contents(tmp_path):
+    contents = build_compressible_lines(20000)
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(contents))
+    index = build_gzip_index(str(file_path), span=64 * 1024)
+
+    chunks = [
+        read_gzip_index_chunk(str(file_path), index, chunk_number)
+        for chunk_number in range(len(index.access_points))
+    ]
+
+    assert b"".join(chunks) == contents
+
+
+def test_reads_chunk_independently_of_the_preceding_chunks(tmp_path):
+    contents = build_compressible_lines(20000)
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip.compress(contents))
+    index = build_gzip_index(str(file_path), span=64 * 1024)
+    start = index.access_points[2].output_offset
+    end = index.access_points[3].output_offset
+
+    actual = read_gzip_index_chunk(str(file_path), index, 2)
+
+    assert actual == contents[start:end]
+
+
+@pytest.mark.parametrize("span", [16 * 1024, 64 * 1024, 1024 * 1024])
+def test_chunks_reassemble_file_written_with_gzip_open(tmp_path, span):
+    contents = build_compressible_lines(50000)
+    file_path = tmp_path / "input.gz"
+    with gzip.open(file_path, "wt") as f:
+        f.write(contents.decode("utf-8"))
+    index = build_gzip_index(str(file_path), span=span)
+
+    assert b"".join(_read_all_chunks(file_path, index)) == contents
+
+
+@pytest.mark.parametrize("span", [16 * 1024, 64 * 1024])
+def test_chunks_reassemble_contents_with_sync_flushed_stored_blocks(tmp_path, span):
+    contents = build_compressible_lines(20000)
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip_with_sync_flushes(contents, piece_size=5000))
+    index = build_gzip_index(str(file_path), span=span)
+
+    assert any(point.bits for point in index.access_points)
+    assert b"".join(_read_all_chunks(file_path, index)) == contents
+
+
+def test_chunks_reassemble_uncompressed_stored_blocks(tmp_path):
+    contents = build_compressible_lines(20000)
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip_with_sync_flushes(contents, piece_size=7000, level=0))
+    index = build_gzip_index(str(file_path), span=16 * 1024)
+
+    assert b"".join(_read_all_chunks(file_path, index)) == contents
+
+
+def test_reads_empty_chunk_given_access_point_at_end_of_contents(tmp_path):
+    contents = build_compressible_lines(20000)
+    file_path = tmp_path / "input.gz"
+    file_path.write_bytes(gzip_with_sync_flushes(contents, piece_size=len(contents)))
+    index = build_gzip_index(str(file_path), span=16 * 1024)
+
+    assert index.access_points[-1].output_offset == len(contents)
+    assert _read_all_chunks(file_path, index)[-1] == b""
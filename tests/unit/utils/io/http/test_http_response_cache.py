@@ -0,0 +1,173 @@
+from datetime import timedelta
+
+from prmdata.utils.io.http import HttpResponseCache
+from tests.builders.ods_portal import build_mock_response
+
+URL = "https://ods.example.com/organisations?Offset=0"
+A_DAY = 24 * 60 * 60
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1600000000.0
+
+    def time(self):
+        return self.now
+
+
+class FakeFetch:
+    def __init__(self, *responses):
+        self._responses = list(responses)
+        self.requested_headers = []
+
+    def __call__(self, headers):
+        self.requested_headers.append(headers)
+        return self._responses.pop(0)
+
+
+def _build_response(content, status_code=200, headers=None):
+    response = build_mock_response(content=content, status_code=status_code)
+    response.headers = headers or {}
+    return response
+
+
+def _build_cache(directory, clock, ttl_days=1, max_age_days=30):
+    return HttpResponseCache(
+        str(directory),
+        ttl=timedelta(days=ttl_days),
+        max_age=timedelta(days=max_age_days),
+        clock=clock.time,
+    )
+
+
+def test_fetches_and_stores_response_on_miss(tmp_path):
+    clock = FakeClock()
+    fetch = FakeFetch(_build_response(b"page", headers={"ETag": '"v1"'}))
+
+    actual = _build_cache(tmp_path, clock).get(URL, fetch)
+
+    assert actual.content == b"page"
+    assert actual.headers["etag"] == '"v1"'
+    assert fetch.requested_headers == [{}]
+
+
+def test_serves_fresh_response_without_fetching(tmp_path):
+    clock = FakeClock()
+    _build_cache(tmp_path, clock).get(URL, FakeFetch(_build_response(b"page")))
+    clock.now += A_DAY / 2
+    fetch = FakeFetch()
+
+    actual = _build_cache(tmp_path, clock).get(URL, fetch)
+
+    assert actual.content == b"page"
+    assert fetch.requested_headers == []
+
+
+def test_revalidates_stale_response_and_reuses_it_when_not_modified(tmp_path):
+    clock = FakeClock()
+    validators = {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2020 00:00:00 GMT"}
+    cache = _build_cache(tmp_path, clock)
+    cache.get(URL, FakeFetch(_build_response(b"page", headers=validators)))
+    clock.now += 2 * A_DAY
+    fetch = FakeFetch(_build_response(None, status_code=304))
+
+    actual = cache.get(URL, fetch)
+
+    assert actual.content == b"page"
+    assert fetch.requested_headers == [
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Wed, 01 Jan 2020 00:00:00 GMT"}
+    ]
+
+
+def test_not_modified_response_restarts_ttl(tmp_path):
+    clock = FakeClock()
+    cache = _build_cache(tmp_path, clock)
+    cache.get(URL, FakeFetch(_build_response(b"page", headers={"ETag": '"v1"'})))
+    clock.now += 2 * A_DAY
+    cache.get(URL, FakeFetch(_build_response(None, status_code=304)))
+    clock.now += A_DAY / 2
+    fetch = FakeFetch()
+
+    cache.get(URL, fetch)
+
+    assert fetch.requested_headers == []
+
+
+def test_not_modified_response_updates_stored_headers(tmp_path):
+    clock = FakeClock()
+    cache = _build_cache(tmp_path, clock)
+    cache.get(
+        URL, FakeFetch(_build_response(b"page", headers={"ETag": '"v1"', "X-Total-Count": "3"}))
+    )
+    clock.now += 2 * A_DAY
+    cache.get(
+        URL, FakeFetch(_build_response(None, status_code=304, headers={"X-Total-Count": "4"}))
+    )
+
+    actual = cache.get(URL, FakeFetch())
+
+    assert actual.content == b"page"
+    assert actual.headers["etag"] == '"v1"'
+    assert actual.headers["x-total-count"] == "4"
+
+
+def test_revalidates_fresh_response_fetched_before_not_before(tmp_path):
+    clock = FakeClock()
+    cache = _build_cache(tmp_path, clock)
+    cache.get(URL, FakeFetch(_build_response(b"page", headers={"ETag": '"v1"'})))
+    clock.now += A_DAY / 2
+    fetch = FakeFetch(_build_response(None, status_code=304))
+
+    actual = cache.get(URL, fetch, not_before=clock.now)
+
+    assert actual.content == b"page"
+    assert fetch.requested_headers == [{"If-None-Match": '"v1"'}]
+
+
+def test_replaces_stale_response_when_modified(tmp_path):
+    clock = FakeClock()
+    cache = _build_cache(tmp_path, clock)
+    cache.get(URL, FakeFetch(_build_response(b"old page", headers={"ETag": '"v1"'})))
+    clock.now += 2 * A_DAY
+    cache.get(URL, FakeFetch(_build_response(b"new page", headers={"ETag": '"v2"'})))
+
+    actual = cache.get(URL, FakeFetch())
+
+    assert actual.content == b"new page"
+
+
+def test_does_not_store_unsuccessful_response(tmp_path):
+    clock = FakeClock()
+    cache = _build_cache(tmp_path, clock)
+
+    actual = cache.get(URL, FakeFetch(_build_response(b"error", status_code=500)))
+
+    assert actual.status_code == 500
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_fetches_without_validators_once_entry_is_older_than_max_age(tmp_path):
+    clock = FakeClock()
+    cache = _build_cache(tmp_path, clock)
+    cache.get(URL, FakeFetch(_build_response(b"page", headers={"ETag": '"v1"'})))
+    clock.now += 31 * A_DAY
+    fetch = FakeFetch(_build_response(b"new page"))
+
+    actual = cache.get(URL, fetch)
+
+    assert actual.content == b"new page"
+    assert fetch.requested_headers == [{}]
+
+
+def test_evict_expired_removes_only_entries_older_than_max_age(tmp_path):
+    clock = FakeClock()
+    cache = _build_cache(tmp_path, clock, ttl_days=30, max_age_days=30)
+    cache.get(URL, FakeFetch(_build_response(b"old page")))
+    clock.now += 20 * A_DAY
+    cache.get(URL + "1", FakeFetch(_build_response(b"new page")))
+    clock.now += 11 * A_DAY
+
+    cache.evict_expired()
+
+    assert len(list(tmp_path.iterdir())) == 2
+    assert cache.get(URL + "1", FakeFetch()).content == b"new page"
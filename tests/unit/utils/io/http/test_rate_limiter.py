@@ -0,0 +1,45 @@
+from prmdata.utils.io.http import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_first_request_does_not_wait():
+    clock = FakeClock()
+    rate_limiter = RateLimiter(requests_per_second=2, clock=clock.time, sleep=clock.sleep)
+
+    rate_limiter.wait()
+
+    assert clock.sleeps == []
+
+
+def test_spaces_out_consecutive_requests():
+    clock = FakeClock()
+    rate_limiter = RateLimiter(requests_per_second=2, clock=clock.time, sleep=clock.sleep)
+
+    rate_limiter.wait()
+    rate_limiter.wait()
+    rate_limiter.wait()
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_does_not_wait_when_requests_are_already_slower_than_limit():
+    clock = FakeClock()
+    rate_limiter = RateLimiter(requests_per_second=2, clock=clock.time, sleep=clock.sleep)
+
+    rate_limiter.wait()
+    clock.now += 1
+    rate_limiter.wait()
+
+    assert clock.sleeps == []
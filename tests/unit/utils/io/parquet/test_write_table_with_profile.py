@@ -0,0 +1,56 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from prmdata.utils.io.parquet import ParquetWriterProfile, write_table_with_profile
+
+
+def _dictionary_encoded_columns(metadata):
+    row_group = metadata.row_group(0)
+    return {
+        row_group.column(i).path_in_schema
+        for i in range(row_group.num_columns)
+        if row_group.column(i).has_dictionary_page
+    }
+
+
+def test_sorts_rows_by_sort_keys(tmp_path):
+    table = pa.table({"key": [3, 1, 2], "value": ["c", "a", "b"]})
+    file_path = str(tmp_path / "sorted.parquet")
+
+    write_table_with_profile(
+        table, file_path, ParquetWriterProfile(sort_keys=(("key", "ascending"),))
+    )
+
+    assert pq.read_table(file_path).to_pydict() == {"key": [1, 2, 3], "value": ["a", "b", "c"]}
+
+
+def test_dictionary_encodes_only_dictionary_columns(tmp_path):
+    table = pa.table({"status": ["A", "A", "B"], "id": ["1", "2", "3"]})
+    file_path = str(tmp_path / "dictionary.parquet")
+
+    write_table_with_profile(table, file_path, ParquetWriterProfile(dictionary_columns=["status"]))
+
+    assert _dictionary_encoded_columns(pq.ParquetFile(file_path).metadata) == {"status"}
+
+
+def test_splits_rows_into_row_groups_with_statistics(tmp_path):
+    table = pa.table({"key": list(range(10))})
+    file_path = str(tmp_path / "row_groups.parquet")
+
+    write_table_with_profile(table, file_path, ParquetWriterProfile(row_group_size=4))
+
+    metadata = pq.ParquetFile(file_path).metadata
+    statistics = [
+        metadata.row_group(i).column(0).statistics for i in range(metadata.num_row_groups)
+    ]
+    assert [(s.min, s.max) for s in statistics] == [(0, 3), (4, 7), (8, 9)]
+
+
+def test_uses_compression_codec(tmp_path):
+    table = pa.table({"key": list(range(10))})
+    file_path = str(tmp_path / "compressed.parquet")
+
+    write_table_with_profile(table, file_path, ParquetWriterProfile(compression="zstd"))
+
+    metadata = pq.ParquetFile(file_path).metadata
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
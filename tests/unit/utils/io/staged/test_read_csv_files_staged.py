@@ -0,0 +1,150 @@
+import pytest
+
+from prmdata.utils.io.staged import StagedReadMetrics, read_csv_files_staged
+from tests.builders.file import build_csv, build_gzip_csv, build_zstd_csv
+
+
+def _create_csv_gz(fs, file_path, rows):
+    fs.create_file(file_path, contents=build_gzip_csv(header=["id", "message"], rows=rows))
+
+
+def test_loads_one_file(fs):
+    _create_csv_gz(fs, "input.csv.gz", [["A", "A message"], ["B", "B message"]])
+
+    expected = [{"id": "A", "message": "A message"}, {"id": "B", "message": "B message"}]
+
+    actual = read_csv_files_staged(["input.csv.gz"])
+
+    assert list(actual) == expected
+
+
+def test_loads_two_files_with_their_own_headers(fs):
+    _create_csv_gz(fs, "input1.csv.gz", [["A", "A message"], ["B", "B message"]])
+    fs.create_file(
+        "input2.csv.gz", contents=build_gzip_csv(header=["message", "id"], rows=[["C msg", "C"]])
+    )
+
+    expected = [
+        {"id": "A", "message": "A message"},
+        {"id": "B", "message": "B message"},
+        {"message": "C msg", "id": "C"},
+    ]
+
+    actual = read_csv_files_staged(["input1.csv.gz", "input2.csv.gz"])
+
+    assert list(actual) == expected
+
+
+def test_rows_split_across_chunks_are_reassembled(fs):
+    rows = [[str(i), f"message, number {i}"] for i in range(100)]
+    fs.create_file(
+        "input.csv.gz",
+        contents=build_gzip_csv(
+            header=["id", "message"], rows=[[i, f'"{message}"'] for i, message in rows]
+        ),
+    )
+
+    expected = [{"id": i, "message": message} for i, message in rows]
+
+    actual = read_csv_files_staged(["input.csv.gz"], queue_size=1, chunk_size=7)
+
+    assert list(actual) == expected
+
+
+def test_records_metrics_for_each_stage(fs):
+    contents = build_gzip_csv(header=["id", "message"], rows=[["A", "A message"], ["B", "B"]])
+    fs.create_file("input.csv.gz", contents=contents)
+    metrics = StagedReadMetrics()
+
+    list(read_csv_files_staged(["input.csv.gz"], metrics))
+
+    assert metrics.decompress.item_count == len("id,message\nA,A message\nB,B")
+    assert metrics.parse.item_count == 2
+    assert metrics.decompress.busy_seconds > 0
+    assert metrics.parse.busy_seconds > 0
+
+
+def test_raises_error_from_decompression_stage(fs):
+    _create_csv_gz(fs, "input1.csv.gz", [["A", "A message"]])
+
+    with pytest.raises(FileNotFoundError):
+        list(read_csv_files_staged(["input1.csv.gz", "missing.csv.gz"]))
+
+
+def test_stops_decompressing_when_reading_stops_early(fs):
+    _create_csv_gz(fs, "input.csv.gz", [[str(i), "message"] for i in range(1000)])
+    metrics = StagedReadMetrics()
+
+    rows = read_csv_files_staged(["input.csv.gz"], metrics, queue_size=1, chunk_size=16)
+    next(rows)
+    rows.close()
+
+    assert metrics.decompress.item_count < 1000 * len("0,message\n")
+
+
+def test_loads_files_of_every_codec(tmp_path):
+    (tmp_path / "input1.csv.gz").write_bytes(build_gzip_csv(["id"], [["A"]]))
+    (tmp_path / "input2.csv").write_bytes(build_csv(["id"], [["B"]]))
+    (tmp_path / "input3.csv.zst").write_bytes(build_zstd_csv(["id"], [["C"]]))
+    metrics = StagedReadMetrics()
+
+    actual = read_csv_files_staged(
+        [str(tmp_path / name) for name in ["input1.csv.gz", "input2.csv", "input3.csv.zst"]],
+        metrics,
+    )
+
+    assert list(actual) == [{"id": "A"}, {"id": "B"}, {"id": "C"}]
+    assert metrics.parse.item_count == 3
+
+
+def test_projects_columns(tmp_path):
+    header = ["id", "unused", "message"]
+    (tmp_path / "input1.csv.gz").write_bytes(build_gzip_csv(header, [["A", "x", "A message"]]))
+    (tmp_path / "input2.csv").write_bytes(build_csv(header, [["B", "y", "B message"]]))
+    metrics = StagedReadMetrics()
+
+    actual = read_csv_files_staged(
+        [str(tmp_path / "input1.csv.gz"), str(tmp_path / "input2.csv")],
+        metrics,
+        columns=["id", "message"],
+        chunk_size=4,
+    )
+
+    assert list(actual) == [
+        {"id": "A", "message": "A message"},
+        {"id": "B", "message": "B message"},
+    ]
+    assert metrics.parse.item_count == 2
+
+
+def test_projects_columns_of_irregular_rows(tmp_path):
+    header = ["id", "unused", "message"]
+    rows = [["A", "x", "A message"], ["B"], ["C", "z", "C message", "extra"]]
+    (tmp_path / "input.csv.gz").write_bytes(build_gzip_csv(header, rows))
+
+    expected = [
+        {"id": "A", "message": "A message"},
+        {"id": "B", "message": None},
+        {"id": "C", "message": "C message"},
+    ]
+
+    actual = read_csv_files_staged([str(tmp_path / "input.csv.gz")], columns=["id", "message"])
+
+    assert list(actual) == expected
+
+
+def test_reads_following_file_after_irregular_row_late_in_file(tmp_path):
+    rows = [[str(i), "x", f"message {i}"] for i in range(100000)] + [["irregular"]]
+    header = ["id", "unused", "message"]
+    (tmp_path / "input1.csv.gz").write_bytes(build_gzip_csv(header, rows))
+    (tmp_path / "input2.csv.gz").write_bytes(build_gzip_csv(header, [["A", "y", "A message"]]))
+
+    actual = list(
+        read_csv_files_staged(
+            [str(tmp_path / "input1.csv.gz"), str(tmp_path / "input2.csv.gz")],
+            columns=["id", "message"],
+        )
+    )
+
+    assert [row["id"] for row in actual] == [str(i) for i in range(100000)] + ["irregular", "A"]
+    assert actual[-2] == {"id": "irregular", "message": None}
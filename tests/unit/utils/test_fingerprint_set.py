@@ -0,0 +1,54 @@
+from prmdata.utils.fingerprint_set import FingerprintSet
+
+
+def test_add_returns_true_for_a_new_key():
+    fingerprints = FingerprintSet()
+
+    assert fingerprints.add("abc")
+
+
+def test_add_returns_false_for_a_key_seen_before():
+    fingerprints = FingerprintSet()
+    fingerprints.add("abc")
+
+    assert not fingerprints.add("abc")
+
+
+def test_counts_distinct_keys():
+    fingerprints = FingerprintSet()
+
+    for key in ["abc", "def", "abc", "ghi", "def"]:
+        fingerprints.add(key)
+
+    assert len(fingerprints) == 3
+
+
+def test_grows_beyond_its_initial_capacity():
+    fingerprints = FingerprintSet(capacity=4)
+    keys = [f"guid-{number}" for number in range(1000)]
+
+    added = [fingerprints.add(key) for key in keys]
+    added_again = [fingerprints.add(key) for key in keys]
+
+    assert all(added)
+    assert not any(added_again)
+    assert len(fingerprints) == 1000
+
+
+def test_contains_keys_that_were_added():
+    fingerprints = FingerprintSet()
+    fingerprints.add("abc")
+
+    assert "abc" in fingerprints
+    assert "def" not in fingerprints
+
+
+def test_contains_keys_added_before_growing():
+    fingerprints = FingerprintSet(capacity=4)
+    keys = [f"guid-{number}" for number in range(1000)]
+
+    for key in keys:
+        fingerprints.add(key)
+
+    assert all(key in fingerprints for key in keys)
+    assert "guid-1000" not in fingerprints
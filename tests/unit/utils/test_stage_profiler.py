@@ -0,0 +1,66 @@
+import marshal
+from unittest.mock import MagicMock
+
+from prmdata.utils.profiling import StageProfiler
+
+
+def _profiled_function():
+    return sum(range(10))
+
+
+def _unprofiled_function():
+    return sum(range(10))
+
+
+def _profiled_function_names(profiler):
+    stats = marshal.loads(profiler.to_bytes())
+    return {function_name for (_, _, function_name) in stats.keys()}
+
+
+def test_is_disabled_given_no_stages():
+    profiler = StageProfiler(None)
+
+    assert not profiler.enabled
+
+
+def test_profiles_chosen_stage():
+    profiler = StageProfiler(["transfers"])
+
+    with profiler.stage("transfers"):
+        _profiled_function()
+
+    assert "_profiled_function" in _profiled_function_names(profiler)
+
+
+def test_does_not_profile_other_stages():
+    profiler = StageProfiler(["transfers"])
+
+    with profiler.stage("metrics"):
+        _unprofiled_function()
+
+    assert "_unprofiled_function" not in _profiled_function_names(profiler)
+
+
+def test_keeps_profiling_outer_stage_after_nested_stage_finishes():
+    profiler = StageProfiler(["main", "transfers"])
+
+    with profiler.stage("main"):
+        with profiler.stage("transfers"):
+            pass
+        _profiled_function()
+
+    assert "_profiled_function" in _profiled_function_names(profiler)
+
+
+def test_uploads_profile():
+    mock_s3_object = MagicMock()
+    profiler = StageProfiler(["main"])
+
+    with profiler.stage("main"):
+        _profiled_function()
+
+    profiler.upload(mock_s3_object)
+
+    mock_s3_object.put.assert_called_once_with(
+        Body=profiler.to_bytes(), ContentType="application/octet-stream"
+    )